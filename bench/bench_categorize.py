@@ -0,0 +1,91 @@
+'''Esegui il microbenchmark della classificazione dei titoli da console (dalla cartella principale):
+python -m bench.bench_categorize --titles 20000 --legacy_titles 500 --json in/tipologia.json
+
+Genera titoli casuali a partire dalle parole chiave del JSON delle categorie
+e misura i titoli/secondo classificati dal confronto parola per parola
+originale e dal matcher compilato di categorize_title. La versione originale
+allunga le liste di parole chiave a ogni chiamata, quindi rallenta man mano:
+viene misurata sia così (sui primi --legacy_titles titoli) sia con liste fisse.
+'''
+import argparse
+import copy
+import random
+import re
+import time
+
+import utils.parse_markdown_column as pmc
+
+
+def legacy_categorize_title(cleaned_title, categories):
+    """
+    Versione originale di categorize_title: una re.search per parola chiave,
+    con il nome della categoria aggiunto alla lista a ogni chiamata.
+    """
+    for category_name, category_data in categories.items():
+        keywords = category_data["keywords"]
+        keywords.append(category_name)
+        for keyword in keywords:
+            if re.search(re.escape(keyword.lower()), cleaned_title.lower()):
+                return category_name
+    return None
+
+
+def fixed_categorize_title(cleaned_title, categories):
+    """
+    Confronto parola per parola originale, senza modificare le liste di parole chiave.
+    """
+    for category_name, category_data in categories.items():
+        for keyword in category_data["keywords"] + [category_name]:
+            if re.search(re.escape(keyword.lower()), cleaned_title.lower()):
+                return category_name
+    return None
+
+
+def make_titles(categories, num_titles, seed=0):
+    """
+    Genera titoli casuali con parole chiave reali e parole che non classificano.
+
+    Ritorna:
+    - list[str]: Titoli già puliti.
+    """
+    rng = random.Random(seed)
+    words = [keyword for data in categories.values() for keyword in data["keywords"]]
+    filler = ["project", "the", "quick", "start", "with", "and", "for", "more", "our", "tool"]
+    return [" ".join(rng.choice(words if rng.random() < 0.3 else filler) for _ in range(rng.randint(1, 5)))
+            for _ in range(num_titles)]
+
+
+def measure(categorize, titles, categories):
+    """
+    Ritorna:
+    - tuple: (titoli/secondo, categorie assegnate).
+    """
+    start = time.perf_counter()
+    result = [categorize(title, categories) for title in titles]
+    return len(titles) / (time.perf_counter() - start), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark della classificazione dei titoli.")
+    parser.add_argument('--titles', type=int, default=20000, help="Numero di titoli da classificare")
+    parser.add_argument('--legacy_titles', type=int, default=500,
+                        help="Titoli classificati dalla versione originale con liste che crescono")
+    parser.add_argument('--json', type=str, default="in/tipologia.json", help="File JSON con le categorie")
+    args = parser.parse_args()
+
+    categories = pmc.load_categories_from_json(args.json)
+    titles = make_titles(categories, args.titles)
+
+    legacy, _ = measure(legacy_categorize_title, titles[:args.legacy_titles], copy.deepcopy(categories))
+    before, expected = measure(fixed_categorize_title, titles, categories)
+    after, result = measure(pmc.categorize_title, titles, categories)
+
+    print(f".. {args.titles} titoli, {len(categories)} categorie da {args.json} ..")
+    print(f"{'prima, liste che crescono':<32} {legacy:10.0f} titoli/s  (primi {args.legacy_titles} titoli)")
+    print(f"{'prima, liste fisse':<32} {before:10.0f} titoli/s")
+    print(f"{'dopo (matcher compilato)':<32} {after:10.0f} titoli/s  (x{after / before:.1f})")
+    print(f".. Stesse categorie assegnate: {'sì' if result == expected else 'NO'} ..")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+'''Esegui il benchmark di clean_text da console (dalla cartella principale):
+python -m bench.bench_clean_text --size 200000 --repeat 20
+
+Genera un README grande (sezioni con link, HTML, URL, emoji e codice) e
+misura i MB/secondo puliti dalla versione originale a cinque re.sub e da
+clean_text, più i titoli/secondo sui titoli del README, dove conta il
+costo fisso di ogni chiamata.
+'''
+import argparse
+import random
+import re
+import time
+
+import utils.parse_markdown_column as pmc
+
+
+def legacy_clean_text(md_text):
+    """
+    Versione originale di clean_text: cinque passate di re.sub.
+    """
+    md_text = re.sub(r'\[.*?\]\(.*?\)', '', md_text)
+    md_text = re.sub(r'<.*?>', '', md_text)
+    md_text = re.sub(r'http[s]?://\S+', '', md_text)
+    md_text = re.sub(r'[^\x00-\x7F]+', '', md_text)
+    md_text = re.sub(r'[^a-zA-Z\s]', '', md_text)
+    return md_text.strip()
+
+
+def make_readme(size, seed=0):
+    """
+    Ritorna:
+    - tuple: (testo del README di circa `size` caratteri, lista dei titoli).
+    """
+    rng = random.Random(seed)
+    lines = ["Install the package with `pip install tool` and run it.",
+             "See the [documentation](https://example.com/docs) for details 🚀.",
+             "<p align=\"center\"><img src=\"logo.png\" width=\"200\"></p>",
+             "Visit https://example.com/a/very/long/path?query=1 or http://mirror.example.org.",
+             "- Step 1: configure `~/.toolrc` (version 2.0, café edition)",
+             "Plain descriptive text about features, options and usage of the project."]
+    titles = ["Installation", "Usage 🚀", "Configuration & Options", "[API](docs/api.md)", "License (MIT)"]
+    parts, length, found = [], 0, []
+    while length < size:
+        title = rng.choice(titles)
+        found.append(title)
+        block = f"## {title}\n" + "\n".join(rng.choice(lines) for _ in range(rng.randint(3, 12))) + "\n\n"
+        parts.append(block)
+        length += len(block)
+    return "".join(parts), found
+
+
+def measure(clean, texts, repeat):
+    """
+    Ritorna:
+    - float: Secondi totali per `repeat` passate su tutti i testi.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for md_text in texts:
+            clean(md_text)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark della pulizia del testo dei README.")
+    parser.add_argument('--size', type=int, default=200000, help="Dimensione del README generato (caratteri)")
+    parser.add_argument('--repeat', type=int, default=20, help="Passate su ciascun insieme di testi")
+    args = parser.parse_args()
+
+    readme, titles = make_readme(args.size)
+    sections = readme.split("## ")
+    size_mb = len(readme.encode("utf-8")) * args.repeat / 1e6
+    if any(pmc.clean_text(text) != legacy_clean_text(text) for text in [readme] + sections + titles):
+        print(".. ATTENZIONE: output diverso dalla versione originale ..")
+
+    print(f".. README di {len(readme)} caratteri, {len(sections)} sezioni, {len(titles)} titoli ..")
+    for label, clean in (("originale (5 re.sub)", legacy_clean_text), ("clean_text", pmc.clean_text)):
+        whole = size_mb / measure(clean, [readme], args.repeat)
+        per_section = size_mb / measure(clean, sections, args.repeat)
+        per_title = len(titles) * args.repeat / measure(clean, titles, args.repeat)
+        print(f"{label:<22} intero {whole:7.1f} MB/s   per sezione {per_section:7.1f} MB/s   "
+              f"titoli {per_title:10.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+'''Esegui il benchmark del download da console (dalla cartella principale):
+python -m bench.bench_download --files 200 --latency 0.02 --workers 1 2 4 8 16 32
+
+Avvia un server HTTP locale che simula raw.githubusercontent.com (con una
+latenza artificiale per richiesta) e misura i file/secondo scaricati da
+download_md_files al variare del numero di worker, confrontandoli con il
+download seriale di download_md_file.
+'''
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import utils.download_from_url as dfu
+
+
+def make_handler(body, latency):
+    """
+    Crea l'handler HTTP del server locale.
+
+    Parametri:
+    - body (bytes): Contenuto restituito per ogni README.
+    - latency (float): Secondi di attesa simulati per ogni richiesta.
+
+    Ritorna:
+    - type: Classe handler per ThreadingHTTPServer.
+    """
+    class ReadmeHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Necessario per il keep-alive
+        disable_nagle_algorithm = True  # Evita i ritardi di ACK fra header e corpo
+
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Silenzia il log delle richieste
+
+    return ReadmeHandler
+
+
+def start_server(body, latency):
+    """
+    Avvia il server locale su una porta libera in un thread separato.
+
+    Ritorna:
+    - ThreadingHTTPServer: Server in esecuzione (da chiudere con shutdown()).
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(body, latency))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_benchmark(num_files, latency, workers_list, size):
+    """
+    Misura il throughput del download seriale e di quello concorrente.
+
+    Parametri:
+    - num_files (int): Numero di README da scaricare per ogni misura.
+    - latency (float): Latenza simulata per richiesta (secondi).
+    - workers_list (list[int]): Livelli di concorrenza da misurare.
+    - size (int): Dimensione in byte di ciascun README.
+
+    Ritorna:
+    - list[tuple]: Coppie (etichetta, file/secondo).
+    """
+    body = (b"# Title\nSome text.\n" * (size // 19 + 1))[:size]
+    server = start_server(body, latency)
+    host, port = server.server_address
+    link_list = [f"http://{host}:{port}/owner{i}/repo{i}/master/README.md" for i in range(num_files)]
+    out_dir = tempfile.mkdtemp(prefix="bench_download_") + os.sep
+
+    results = []
+    try:
+        start = time.perf_counter()
+        dfu.download_md_file(link_list, out_dir)
+        results.append(("seriale (download_md_file)", num_files / (time.perf_counter() - start)))
+
+        for workers in workers_list:
+            start = time.perf_counter()
+            dfu.download_md_files(link_list, out_dir, workers)
+            results.append((f"concorrente, {workers} worker", num_files / (time.perf_counter() - start)))
+    finally:
+        server.shutdown()
+        shutil.rmtree(out_dir, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del download dei README su un server HTTP locale.")
+    parser.add_argument('--files', type=int, default=200, help="Numero di README da scaricare")
+    parser.add_argument('--latency', type=float, default=0.02, help="Latenza simulata per richiesta (secondi)")
+    parser.add_argument('--size', type=int, default=8000, help="Dimensione di ogni README (byte)")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32],
+                        help="Livelli di concorrenza da misurare")
+    args = parser.parse_args()
+
+    print(f".. {args.files} file, latenza {args.latency * 1000:.0f} ms, {args.size} byte ciascuno ..")
+    for label, files_per_second in run_benchmark(args.files, args.latency, args.workers, args.size):
+        print(f"{label:<28} {files_per_second:8.1f} file/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+'''Esegui il benchmark della memoria della tabella dati da console (dalla cartella principale):
+python -m bench.bench_memory --files 3000
+
+Genera un corpus sintetico di README e misura con tracemalloc la memoria
+di picco e quella occupata dalla tabella finale, costruendo la tabella con
+la vecchia struttura (un dizionario di nove liste parallele per file, con
+una lista di tuple (categoria, numero, url) per sezione) e con i record
+compatti FileRecord / Section usati da get_data_table2.
+'''
+import argparse
+import gc
+import os
+import shutil
+import tempfile
+import tracemalloc
+
+import utils.parse_markdown_column as pmc
+from bench.synthetic_corpus import write_corpus
+
+
+def legacy_get_data_table2(num_file_md, path_md_file, categories):
+    """
+    Costruisce la tabella con la struttura dati a liste parallele usata in precedenza.
+
+    Ritorna:
+    - list[dict]: Un dizionario di liste per file.
+    """
+    analysis_cache = {}
+    data_table = []
+    for i in range(num_file_md):
+        file_data = {"file_name": f"{i}.md", "level": [], "h1_titles": [], "category": [], "char_counts": [],
+                     "num_links": [], "current_links": [], "num_images": [], "num_videos": [],
+                     "num_code_blocks": []}
+        md_text = pmc.download_md_text(os.path.join(path_md_file, file_data["file_name"]))
+        key = pmc.text_hash(md_text)
+        sections = analysis_cache.get(key)
+        if sections is None:
+            # Le tuple della vecchia analyze_md_text
+            sections = analysis_cache[key] = [tuple(section) for section in pmc.analyze_md_text(md_text, categories)]
+        for title, level, category, char_count, nlinks, cur_links, images, videos, code_blocks in sections:
+            file_data["h1_titles"].append(title)
+            file_data["char_counts"].append(char_count)
+            file_data["category"].append(category)
+            file_data["num_links"].append(nlinks)
+            file_data["current_links"].append(cur_links)
+            file_data["num_images"].append(images)
+            file_data["num_videos"].append(videos)
+            file_data["num_code_blocks"].append(code_blocks)
+            file_data["level"].append(level)
+        data_table.append(file_data)
+    return data_table
+
+
+def measure(build):
+    """
+    Ritorna:
+    - tuple: (picco in byte, byte occupati dalla tabella finale, tabella).
+    """
+    gc.collect()
+    tracemalloc.start()
+    table = build()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, current, table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark della memoria della tabella dati.")
+    parser.add_argument('--files', type=int, default=3000, help="Numero di README del corpus sintetico")
+    parser.add_argument('--json', type=str, default="in/tipologia.json", help="File JSON con le categorie")
+    args = parser.parse_args()
+
+    categories = pmc.load_categories_from_json(args.json)
+    corpus = tempfile.mkdtemp(prefix="bench_memory_") + os.sep
+    try:
+        size = write_corpus(corpus, args.files)
+        pmc.categorize_title("", categories)  # Matcher compilato fuori dalla misura
+
+        before_peak, before_table, table = measure(lambda: legacy_get_data_table2(args.files, corpus, categories))
+        num_sections = sum(len(file_data["h1_titles"]) for file_data in table)
+        del table
+        after_peak, after_table, table = measure(
+            lambda: pmc.get_data_table2(args.files, corpus, categories, pmc.ChildCrawler(max_depth=0)))
+        del table
+    finally:
+        shutil.rmtree(corpus, ignore_errors=True)
+
+    print(f".. {args.files} README sintetici ({size / 1e6:.1f} MB), {num_sections} sezioni ..")
+    for label, peak, retained in (("prima (dict di liste)", before_peak, before_table),
+                                  ("dopo (FileRecord/Section)", after_peak, after_table)):
+        print(f"{label:<28} picco {peak / 1e6:7.1f} MB   tabella {retained / 1e6:7.1f} MB "
+              f"({retained / max(1, num_sections):5.0f} byte/sezione)")
+
+
+if __name__ == "__main__":
+    main()
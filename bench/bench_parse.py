@@ -0,0 +1,62 @@
+'''Esegui il benchmark del parsing Markdown da console (dalla cartella principale):
+python -m bench.bench_parse --md_path test/test_md_files/ --repeat 2000
+
+Legge i README di una cartella (di default quelli dei test) e misura i
+file/secondo e i MB/secondo di extract_md_tokens con un MarkdownIt() creato
+a ogni chiamata (versione originale), con un MarkdownIt() completo condiviso
+e con il parser condiviso configurato per l'analisi.
+'''
+import argparse
+import os
+import time
+
+from markdown_it import MarkdownIt
+
+import utils.parse_markdown_column as pmc
+
+
+def load_corpus(md_path):
+    """
+    Ritorna:
+    - list[str]: Contenuto dei file .md della cartella (ordinati per nome).
+    """
+    names = sorted(name for name in os.listdir(md_path) if name.endswith(".md"))
+    return [pmc.download_md_text(os.path.join(md_path, name)) for name in names]
+
+
+def measure(parse, corpus, repeat):
+    """
+    Ritorna:
+    - tuple: (file/secondo, MB/secondo).
+    """
+    size = sum(len(md_text.encode("utf-8")) for md_text in corpus) * repeat
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for md_text in corpus:
+            parse(md_text)
+    elapsed = time.perf_counter() - start
+    return len(corpus) * repeat / elapsed, size / elapsed / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del parsing dei README con markdown-it.")
+    parser.add_argument('--md_path', type=str, default="test/test_md_files/", help="Cartella con i file Markdown")
+    parser.add_argument('--repeat', type=int, default=2000, help="Passate sull'intera cartella")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.md_path)
+    shared = MarkdownIt()
+    variants = [
+        ("MarkdownIt() a ogni file", lambda md_text: MarkdownIt().parse(md_text)),
+        ("MarkdownIt() condiviso", shared.parse),
+        ("parser dell'analisi", pmc.extract_md_tokens),
+    ]
+
+    print(f".. {len(corpus)} file da {args.md_path}, {args.repeat} passate ..")
+    for label, parse in variants:
+        files_per_second, mb_per_second = measure(parse, corpus, args.repeat)
+        print(f"{label:<28} {files_per_second:10.0f} file/s {mb_per_second:8.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+'''Esegui la suite di benchmark da console (dalla cartella principale):
+python -m bench.bench_suite --out bench/results.json
+python -m bench.bench_suite --out bench/results.json --baseline bench/baseline.json --threshold 0.15
+python -m bench.bench_suite --corpora mixed link_heavy --benchmarks find_titles_md clean_text --scale 0.25
+
+Genera i corpus sintetici di synthetic_corpus.CORPUS_PRESETS (riproducibili
+con --seed) e misura su ciascuno find_titles_md, scan_titles_md, clean_text,
+categorize_title, calculate_section_length, generate_summary e la scrittura
+dei CSV. Ogni misura è ripetuta --repeat volte (si tengono minimo e mediana).
+I risultati vengono salvati in JSON; con --baseline il minimo di ogni misura
+è confrontato con quello di un'esecuzione precedente e le misure più lente
+oltre la soglia sono segnalate come regressioni (codice di uscita 1).
+'''
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from importlib.metadata import version
+
+import utils.in_out_csv as ioc
+import utils.parse_markdown_column as pmc
+from bench.synthetic_corpus import CORPUS_PRESETS, write_corpus
+
+# Benchmark della suite, nell'ordine di esecuzione
+BENCHMARKS = ("find_titles_md", "scan_titles_md", "clean_text", "categorize_title", "calculate_section_length",
+              "generate_summary", "csv_writers")
+
+# Rallentamento oltre il quale una misura è una regressione (0.15 = 15% più lenta della baseline)
+DEFAULT_THRESHOLD = 0.15
+
+
+def load_generate_summary():
+    """
+    Importa generate_summary da generate_summary_csv.py.
+
+    Ritorna:
+    - callable | None: La funzione, oppure None se config.py non trova le
+      cartelle del progetto (e interrompe l'importazione).
+    """
+    try:
+        from generate_summary_csv import generate_summary
+    except SystemExit:
+        return None
+    return generate_summary
+
+
+class Corpus:
+    """
+    Corpus sintetico scritto su disco, con i dati già pronti per ogni benchmark.
+    """
+
+    def __init__(self, name, path, categories, seed=0, scale=1.0):
+        """
+        Parametri:
+        - name (str): Nome del preset in CORPUS_PRESETS.
+        - path (str): Cartella in cui scrivere i README e i CSV.
+        - categories (dict): Categorie per classificare i titoli.
+        - seed (int): Seme del generatore.
+        - scale (float): Fattore sul numero di file del preset.
+        """
+        params = dict(CORPUS_PRESETS[name])
+        params["num_files"] = max(1, int(params["num_files"] * scale))
+        self.name = name
+        self.path = path
+        self.categories = categories
+        self.bytes = write_corpus(path, seed=seed, **params)
+        self.num_files = params["num_files"]
+        self.texts = [pmc.download_md_text(os.path.join(path, f"{i}.md")) for i in range(self.num_files)]
+        self.table = pmc.get_data_table2(self.num_files, path, categories, pmc.ChildCrawler(max_depth=0))
+        self.titles = [section.title for file_data in self.table for section in file_data.sections]
+        # Coppie (titolo, titolo successivo) del testo originale, come le usa calculate_section_length
+        self.heading_pairs = []
+        for md_text in self.texts:
+            tokens = pmc.extract_md_tokens(md_text)
+            headings = [tokens[i + 1].content for i, token in enumerate(tokens) if token.type == "heading_open"]
+            self.heading_pairs.append((md_text, list(zip(headings, headings[1:] + [None]))))
+        self.sections_csv = os.path.join(path, "sections.csv")
+        ioc.get_csv_tab2(self.table, self.sections_csv)
+
+
+def bench_cases(corpus, generate_summary):
+    """
+    Funzioni da misurare su un corpus.
+
+    Ritorna:
+    - dict: Nome del benchmark -> (funzione senza argomenti, elementi elaborati, unità).
+    """
+    categories = corpus.categories
+    out_csv = os.path.join(corpus.path, "out.csv")
+    out_url_csv = os.path.join(corpus.path, "out_url.csv")
+
+    def find_titles():
+        for md_text in corpus.texts:
+            pmc.find_titles_md(md_text, categories)
+
+    def scan_titles():
+        for md_text in corpus.texts:
+            pmc.scan_titles_md(md_text, categories)
+
+    def clean():
+        for md_text in corpus.texts:
+            pmc.clean_text(md_text)
+
+    def categorize():
+        for title in corpus.titles:
+            pmc.categorize_title(title, categories)
+
+    def section_lengths():
+        for md_text, pairs in corpus.heading_pairs:
+            for title, next_title in pairs:
+                pmc.calculate_section_length(md_text, title, next_title)
+
+    def write_csv():
+        ioc.get_csv_tabs(([file_data] for file_data in corpus.table), out_csv, out_url_csv, with_link=False)
+
+    num_headings = sum(len(pairs) for _, pairs in corpus.heading_pairs)
+    num_rows = sum(max(1, len(file_data.sections)) for file_data in corpus.table)
+    cases = {
+        "find_titles_md": (find_titles, corpus.num_files, "file"),
+        "scan_titles_md": (scan_titles, corpus.num_files, "file"),
+        "clean_text": (clean, corpus.num_files, "file"),
+        "categorize_title": (categorize, len(corpus.titles), "titoli"),
+        "calculate_section_length": (section_lengths, num_headings, "sezioni"),
+        "csv_writers": (write_csv, num_rows, "righe"),
+    }
+    if generate_summary is not None:
+        cases["generate_summary"] = (lambda: generate_summary(corpus.sections_csv, out_csv), num_rows, "righe")
+    return cases
+
+
+def measure(function, repeat):
+    """
+    Esegue la funzione repeat volte.
+
+    Ritorna:
+    - tuple: (secondi minimi, secondi mediani).
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times), statistics.median(times)
+
+
+def run_suite(corpora, benchmarks, categories, repeat=5, seed=0, scale=1.0, log=print):
+    """
+    Esegue i benchmark scelti sui corpus scelti.
+
+    Parametri:
+    - corpora (list): Nomi dei preset di CORPUS_PRESETS.
+    - benchmarks (list): Nomi dei benchmark (vedi BENCHMARKS).
+    - categories (dict): Categorie per classificare i titoli.
+    - repeat (int): Ripetizioni di ogni misura.
+    - seed (int): Seme dei corpus.
+    - scale (float): Fattore sul numero di file dei preset.
+    - log (callable): Funzione per i messaggi di avanzamento.
+
+    Ritorna:
+    - dict: "meta" (ambiente e parametri) e "results" (corpus -> benchmark -> misura).
+    """
+    generate_summary = load_generate_summary() if "generate_summary" in benchmarks else None
+    if "generate_summary" in benchmarks and generate_summary is None:
+        log(".. generate_summary saltato: config.py non trova le cartelle del progetto ..")
+    pmc.categorize_title("", categories)  # Matcher compilato fuori dalla misura
+    results = {"meta": {"date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                        "python": platform.python_version(), "platform": platform.platform(),
+                        "markdown_it": version("markdown-it-py"), "seed": seed, "scale": scale, "repeat": repeat},
+               "results": {}}
+    for name in corpora:
+        path = tempfile.mkdtemp(prefix=f"bench_{name}_") + os.sep
+        try:
+            corpus = Corpus(name, path, categories, seed, scale)
+            log(f".. Corpus {name}: {corpus.num_files} README ({corpus.bytes / 1e6:.1f} MB) ..")
+            corpus_results = results["results"][name] = {"files": corpus.num_files, "bytes": corpus.bytes}
+            cases = bench_cases(corpus, generate_summary)
+            for bench in BENCHMARKS:
+                if bench not in benchmarks or bench not in cases:
+                    continue
+                function, items, unit = cases[bench]
+                min_seconds, median_seconds = measure(function, repeat)
+                corpus_results[bench] = {"min_seconds": round(min_seconds, 6),
+                                         "median_seconds": round(median_seconds, 6),
+                                         "items": items, "unit": unit,
+                                         "per_second": round(items / min_seconds, 1) if min_seconds else None}
+                log(f"   {bench:<26} {min_seconds * 1000:9.1f} ms  ({items / max(min_seconds, 1e-9):,.0f} {unit}/s)")
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+    return results
+
+
+def compare_results(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Confronta due esecuzioni della suite sulle misure presenti in entrambe.
+
+    Parametri:
+    - current (dict): Risultati di run_suite.
+    - baseline (dict): Risultati di un'esecuzione precedente.
+    - threshold (float): Rallentamento relativo oltre il quale c'è una regressione.
+
+    Ritorna:
+    - list: Tuple (corpus, benchmark, secondi baseline, secondi attuali, rapporto,
+      regressione) per ogni misura confrontabile.
+    """
+    comparison = []
+    for name, corpus_results in current["results"].items():
+        baseline_corpus = baseline.get("results", {}).get(name, {})
+        if baseline_corpus.get("files") != corpus_results.get("files"):
+            continue  # Corpus di dimensione diversa: misure non confrontabili
+        for bench in BENCHMARKS:
+            if bench not in corpus_results or bench not in baseline_corpus:
+                continue
+            before = baseline_corpus[bench]["min_seconds"]
+            after = corpus_results[bench]["min_seconds"]
+            ratio = after / before if before else float("inf")
+            comparison.append((name, bench, before, after, ratio, ratio > 1 + threshold))
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite di benchmark su corpus sintetici di README.")
+    parser.add_argument('--out', type=str, default=None, help="File JSON in cui salvare i risultati")
+    parser.add_argument('--baseline', type=str, default=None, help="Risultati JSON con cui confrontarsi")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Rallentamento che conta come regressione (0.15 = 15%%)")
+    parser.add_argument('--corpora', nargs='+', default=list(CORPUS_PRESETS), choices=list(CORPUS_PRESETS),
+                        help="Corpus da generare")
+    parser.add_argument('--benchmarks', nargs='+', default=list(BENCHMARKS), choices=list(BENCHMARKS),
+                        help="Benchmark da eseguire")
+    parser.add_argument('--repeat', type=int, default=5, help="Ripetizioni di ogni misura")
+    parser.add_argument('--seed', type=int, default=0, help="Seme dei corpus")
+    parser.add_argument('--scale', type=float, default=1.0, help="Fattore sul numero di file dei corpus")
+    parser.add_argument('--json', type=str, default="in/tipologia.json", help="File JSON con le categorie")
+    args = parser.parse_args()
+
+    categories = pmc.load_categories_from_json(args.json)
+    results = run_suite(args.corpora, args.benchmarks, categories, args.repeat, args.seed, args.scale)
+    if args.out is not None:
+        with open(args.out, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+        print(f".. Risultati salvati in {args.out} ..")
+
+    if args.baseline is not None:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        comparison = compare_results(results, baseline, args.threshold)
+        regressions = [row for row in comparison if row[5]]
+        for name, bench, before, after, ratio, regression in comparison:
+            flag = "  REGRESSIONE" if regression else ""
+            print(f"   {name}/{bench:<26} {before * 1000:9.1f} -> {after * 1000:9.1f} ms ({ratio:.2f}x){flag}")
+        print(f".. {len(comparison)} misure confrontate con {args.baseline}, {len(regressions)} regressioni "
+              f"(soglia {args.threshold:.0%}) ..")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
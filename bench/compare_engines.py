@@ -0,0 +1,116 @@
+'''Confronta i due motori di analisi da console (dalla cartella principale):
+python -m bench.compare_engines --md_path test/test_md_files/
+python -m bench.compare_engines --files 2000
+
+Analizza ogni README con markdown-it (find_titles_md) e con lo scanner a
+righe (scan_titles_md) e stampa ogni differenza fra le sezioni ottenute,
+quanti file lo scanner lascia a markdown-it e i tempi dei due motori.
+Senza --md_path usa un corpus sintetico. Esce con codice 1 se trova differenze.
+'''
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import utils.parse_markdown_column as pmc
+from bench.synthetic_corpus import write_corpus
+
+
+def section_differences(expected, actual):
+    """
+    Differenze fra le sezioni dei due motori.
+
+    Parametri:
+    - expected (list[Section]): Sezioni di find_titles_md.
+    - actual (list[Section]): Sezioni di scan_titles_md.
+
+    Ritorna:
+    - list[str]: Una descrizione per ogni campo diverso (vuota se coincidono).
+    """
+    differences = []
+    if len(expected) != len(actual):
+        differences.append(f"sezioni: {len(expected)} con markdown-it, {len(actual)} con lo scanner")
+    for i, (a, b) in enumerate(zip(expected, actual)):
+        for field in a.__slots__:
+            if getattr(a, field) != getattr(b, field):
+                differences.append(f"sezione {i} ({a.title!r}) {field}: {getattr(a, field)!r} != {getattr(b, field)!r}")
+    return differences
+
+
+def compare_texts(texts, categories):
+    """
+    Analizza i testi con entrambi i motori.
+
+    Parametri:
+    - texts (dict): Nome del file -> contenuto Markdown.
+    - categories (dict): Categorie per classificare i titoli.
+
+    Ritorna:
+    - dict: "differences" (nome -> differenze), "fallbacks" (file lasciati a
+      markdown-it dallo scanner) e "times" (secondi di ciascun motore).
+    """
+    report = {"differences": {}, "fallbacks": 0, "times": {}}
+    results = {}
+    for engine, analyze in (("markdown-it", pmc.find_titles_md), ("scanner", pmc.scan_titles_md)):
+        start = time.perf_counter()
+        results[engine] = {name: analyze(md_text, categories) for name, md_text in texts.items()}
+        report["times"][engine] = time.perf_counter() - start
+
+    for name, md_text in texts.items():
+        differences = section_differences(results["markdown-it"][name], results["scanner"][name])
+        if differences:
+            report["differences"][name] = differences
+        try:
+            pmc.scan_titles_md(md_text, categories, fallback=False)
+        except pmc.ScannerFallback:
+            report["fallbacks"] += 1
+    return report
+
+
+def load_texts(md_path):
+    """
+    Ritorna:
+    - dict: Nome -> contenuto di ogni file .md della cartella.
+    """
+    return {name: pmc.download_md_text(os.path.join(md_path, name))
+            for name in sorted(os.listdir(md_path)) if name.endswith(".md")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Confronto fra markdown-it e lo scanner a righe.")
+    parser.add_argument('--md_path', type=str, default=None, help="Cartella con i README (default: corpus sintetico)")
+    parser.add_argument('--files', type=int, default=1000, help="Numero di README del corpus sintetico")
+    parser.add_argument('--json', type=str, default="in/tipologia.json", help="File JSON con le categorie")
+    args = parser.parse_args()
+
+    categories = pmc.load_categories_from_json(args.json)
+    pmc.categorize_title("", categories)  # Matcher compilato fuori dalla misura
+    if args.md_path is not None:
+        texts = load_texts(args.md_path)
+    else:
+        corpus = tempfile.mkdtemp(prefix="compare_engines_") + os.sep
+        try:
+            write_corpus(corpus, args.files)
+            texts = load_texts(corpus)
+        finally:
+            shutil.rmtree(corpus, ignore_errors=True)
+
+    report = compare_texts(texts, categories)
+    for name, differences in report["differences"].items():
+        print(f"{name}:")
+        for difference in differences:
+            print(f"  {difference}")
+
+    size = sum(len(md_text) for md_text in texts.values())
+    times = report["times"]
+    print(f".. {len(texts)} README ({size / 1e6:.1f} MB), {len(report['differences'])} con differenze ..")
+    print(f".. Lasciati a markdown-it dallo scanner: {report['fallbacks']} ..")
+    print(f".. markdown-it {times['markdown-it']:.2f} s, scanner {times['scanner']:.2f} s "
+          f"({times['markdown-it'] / max(times['scanner'], 1e-9):.1f}x) ..")
+    sys.exit(1 if report["differences"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+'''Genera un corpus sintetico di README da console (dalla cartella principale):
+python -m bench.synthetic_corpus --out /tmp/corpus/ --files 2000 --seed 0
+
+python -m bench.synthetic_corpus --out /tmp/corpus/ --preset link_heavy
+
+I file (0.md, 1.md, ...) mescolano titoli ATX e setext di vari livelli,
+parole chiave delle categorie, link (anche a file .md), immagini, blocchi di
+codice, HTML ed emoji, con dimensioni molto variabili come nei README reali.
+Numero di sezioni, righe per sezione (densità dei titoli), link aggiunti e
+frequenza dei blocchi di codice si possono scegliere, anche con i preset.
+'''
+import argparse
+import os
+import random
+
+TITLES = ["Introduction", "Installation", "Usage", "Configuration", "Features", "License", "Contributing",
+          "FAQ", "Roadmap", "Credits", "Getting started", "API reference", "Examples", "Testing", "Support",
+          "Build from source", "Changelog", "Known issues", "Acknowledgements", "Project overview"]
+
+LINES = ["This project provides a small tool to manage your configuration files.",
+         "Install it with `pip install tool` or download a [release](https://example.com/releases).",
+         "See the [documentation](https://example.com/docs) and the [guide](http://example.com/guide.md).",
+         "![screenshot](https://example.com/screen.png) Screenshot of the main window 🚀",
+         "<p align=\"center\"><img src=\"logo.png\" width=\"200\"></p>",
+         "- Step 1: clone the repository",
+         "- Step 2: run `make install` (requires Python 3.8+)",
+         "> **Note**: the API is still *experimental* and may change.",
+         "Visit https://example.com for more information, or write to info@example.com.",
+         "| Option | Default |\n|---|---|\n| verbose | false |",
+         "Thanks to all the [contributors](https://github.com/example/tool/graphs/contributors)!",
+         "Plain text with accents: café, naïve, déjà vu."]
+
+# Destinazioni dei link aggiunti con links_per_section
+LINK_TARGETS = ["https://example.com/docs", "https://github.com/example/tool", "docs/USAGE.md",
+                "https://example.com/blog/post?id=42", "#installation", "mailto:info@example.com"]
+
+# Corpus predefiniti per i benchmark (parametri di write_corpus)
+CORPUS_PRESETS = {
+    "mixed": {"num_files": 400},
+    "dense_headings": {"num_files": 300, "max_sections": 120, "max_lines": 1},
+    "link_heavy": {"num_files": 300, "links_per_section": 12},
+    "code_heavy": {"num_files": 300, "code_ratio": 0.9},
+    "large_files": {"num_files": 20, "max_sections": 400, "max_lines": 20},
+}
+
+
+def make_readme(rng, num_sections, max_lines=8, links_per_section=0, code_ratio=0.3):
+    """
+    Genera il testo di un README sintetico.
+
+    Con i valori predefiniti il testo generato (per lo stesso rng) non cambia.
+
+    Parametri:
+    - rng (random.Random): Generatore casuale.
+    - num_sections (int): Numero di sezioni.
+    - max_lines (int): Righe di testo al massimo per sezione (meno righe = titoli più fitti).
+    - links_per_section (int): Link aggiunti in ogni sezione, oltre a quelli delle righe.
+    - code_ratio (float): Probabilità che una sezione contenga un blocco di codice.
+
+    Ritorna:
+    - str: Contenuto Markdown.
+    """
+    parts = [rng.choice(LINES)] if rng.random() < 0.5 else []
+    for _ in range(num_sections):
+        title = rng.choice(TITLES)
+        level = rng.choice([1, 2, 2, 3, 3, 4, 5])
+        if level <= 2 and rng.random() < 0.2:
+            parts.append(f"{title}\n{'=' if level == 1 else '-' * len(title)}")
+        else:
+            parts.append(f"{'#' * level} {title}")
+        for _ in range(rng.randint(0, max_lines)):
+            parts.append(rng.choice(LINES))
+        if links_per_section:
+            parts.append(" ".join(f"[{rng.choice(TITLES)}]({rng.choice(LINK_TARGETS)})"
+                                  for _ in range(links_per_section)))
+        if rng.random() < code_ratio:
+            parts.append("```bash\n# not a title\nmake && make install\n```")
+    return "\n\n".join(parts) + "\n"
+
+
+def iter_readmes(num_files, seed=0, max_sections=40, max_lines=8, links_per_section=0, code_ratio=0.3):
+    """
+    Genera i testi di un corpus di README sintetici, senza scriverli.
+
+    Parametri: come write_corpus.
+
+    Ritorna:
+    - generator: Contenuto Markdown di ogni file, nell'ordine 0.md, 1.md, ...
+    """
+    rng = random.Random(seed)
+    for _ in range(num_files):
+        # Dimensioni a coda lunga: molti README brevi, pochi molto lunghi
+        num_sections = min(max_sections * 10, int(rng.paretovariate(1.2) * max_sections / 8))
+        yield make_readme(rng, num_sections, max_lines, links_per_section, code_ratio)
+
+
+def write_corpus(path, num_files, seed=0, max_sections=40, max_lines=8, links_per_section=0, code_ratio=0.3):
+    """
+    Scrive un corpus di README sintetici (0.md, 1.md, ...) in una cartella.
+
+    Parametri:
+    - path (str): Cartella di destinazione (creata se non esiste).
+    - num_files (int): Numero di file.
+    - seed (int): Seme del generatore, per corpus riproducibili.
+    - max_sections (int): Numero massimo di sezioni per file.
+    - max_lines (int): Righe di testo al massimo per sezione.
+    - links_per_section (int): Link aggiunti in ogni sezione.
+    - code_ratio (float): Probabilità di un blocco di codice in ogni sezione.
+
+    Ritorna:
+    - int: Byte scritti in totale.
+    """
+    os.makedirs(path, exist_ok=True)
+    total = 0
+    readmes = iter_readmes(num_files, seed, max_sections, max_lines, links_per_section, code_ratio)
+    for i, md_text in enumerate(readmes):
+        content = md_text.encode("utf-8")
+        with open(os.path.join(path, f"{i}.md"), "wb") as file:
+            file.write(content)
+        total += len(content)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera un corpus sintetico di README.")
+    parser.add_argument('--out', type=str, required=True, help="Cartella di destinazione")
+    parser.add_argument('--preset', type=str, default=None, choices=sorted(CORPUS_PRESETS),
+                        help="Corpus predefinito (i parametri indicati esplicitamente hanno la precedenza)")
+    parser.add_argument('--files', type=int, default=None, help="Numero di README (default: 2000)")
+    parser.add_argument('--seed', type=int, default=0, help="Seme del generatore")
+    parser.add_argument('--max_sections', type=int, default=None, help="Sezioni al massimo per file (default: 40)")
+    parser.add_argument('--max_lines', type=int, default=None, help="Righe al massimo per sezione (default: 8)")
+    parser.add_argument('--links', type=int, default=None, help="Link aggiunti in ogni sezione (default: 0)")
+    parser.add_argument('--code_ratio', type=float, default=None,
+                        help="Probabilità di un blocco di codice per sezione (default: 0.3)")
+    args = parser.parse_args()
+
+    params = {"num_files": 2000}
+    params.update(CORPUS_PRESETS.get(args.preset, {}))
+    explicit = {"num_files": args.files, "max_sections": args.max_sections, "max_lines": args.max_lines,
+                "links_per_section": args.links, "code_ratio": args.code_ratio}
+    params.update({name: value for name, value in explicit.items() if value is not None})
+    total = write_corpus(args.out, seed=args.seed, **params)
+    print(f".. {params['num_files']} README ({total / 1e6:.1f} MB) scritti in {args.out} ..")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@ import sys
 NAME_FILE_CSV_IN = "./in/mini_apps.csv"
 NAME_FILE_CSV_OUT = "./out/output_section.csv"
 PATH_MD_FILE = "./md_file/"
+PATH_LINKED_MD_FILE = "./out/linked_md/"  # File Markdown linkati dai README, scaricati da process.py
+MD_INDEX_FILE = "./out/md_index.json"  # Indice dei README locali: ID numerico -> nome originale del file
 NAME_FILE_JSON_IN = "./in/tipologia.json"
 OUT_DIR = "./out/"
 IN_DIR= "./in/"
@@ -12,6 +14,54 @@ NAME_FILE_CSV_OUT_URL= "urls/output_urls.csv"
 GRAPH_OUT_DIR= "graphs/"
 TABLES_OUT_DIR= "tables/"
 TABLES_FILE_SUMMARY= "tables/readme_summary.csv"
+TABLES_FILE_RELEVANCE= "tables/readme_summary_relevance_score.csv"
+TABLES_FILE_SCORES= "tables/readme_scores.csv"
+GRAPH_FILES= (  # Grafici di data_analysis_graph.py
+    GRAPH_OUT_DIR + "grafico1_occorrenze_categorie.pdf",
+    GRAPH_OUT_DIR + "grafico2_distribuzione_categorie_readme.pdf",
+    GRAPH_OUT_DIR + "grafico3_lunghezza_readme.pdf",
+    GRAPH_OUT_DIR + "grafico4_distribuzione_lunghezza_readme_per_fasce.pdf",
+)
+
+# Parametri di download
+DOWNLOAD_WORKERS = 8  # Numero di download contemporanei
+DOWNLOAD_RATE = 10  # Richieste al secondo per host
+DOWNLOAD_TIMEOUT = 30  # Timeout di lettura (secondi)
+DOWNLOAD_RETRIES = 3  # Tentativi aggiuntivi per errori temporanei (5xx/429, rete)
+NAME_FILE_CSV_FAILURES = "./out/download_failures.csv"  # Report dei download falliti
+
+# Parametri del crawl dei file Markdown linkati dai README
+CRAWL_WORKERS = 8  # Download contemporanei dei file figli
+CRAWL_MAX_DEPTH = None  # Profondità massima dei figli (None = senza limite)
+CRAWL_MAX_CHILDREN = None  # Figli scaricati al massimo per ogni file (None = senza limite)
+
+# Processi per l'analisi dei README in process.py (1 = analisi seriale)
+ANALYSIS_PROCESSES = 1
+
+# Motore di analisi dei README: "markdown-it" o "scanner" (scanner a righe, stessi risultati e più veloce)
+ANALYSIS_ENGINE = "markdown-it"
+
+# Cache su disco delle analisi dei README (riusate se README e categorie non cambiano)
+PARSE_CACHE_FILE = "./out/parse_cache.sqlite"
+PARSE_CACHE_SIZE = 50000  # Analisi conservate al massimo (LRU)
+
+# Memo dei titoli già puliti e classificati, riusato fra le esecuzioni (scartato se cambiano le categorie)
+TITLE_MEMO_FILE = "./out/title_memo.json"
+TITLE_MEMO_SIZE = 20000  # Titoli memorizzati al massimo (LRU)
+
+# Limiti per README: oltre MAX_FILE_BYTES il file viene troncato ("truncate") o saltato ("skip"),
+# oltre MAX_PARSE_SECONDS l'analisi viene interrotta (None = senza limite)
+MAX_FILE_BYTES = None
+MAX_PARSE_SECONDS = None
+OVERSIZE_POLICY = "truncate"
+NAME_FILE_CSV_SKIPPED = "./out/skipped_files.csv"  # Report dei README saltati o troncati
+
+# Report dei tempi per stadio e per file (solo con --profile)
+PROFILE_JSON = "./out/run_profile.json"  # Totali, percentili, throughput e file più lenti
+PROFILE_CSV = "./out/run_profile_slowest.csv"  # File più lenti con il tempo di ogni stadio
+
+# Stato della build incrementale di main.py (impronte degli input di ogni passo)
+BUILD_STATE_FILE = "./out/build_state.json"
 
 # Funzione per controllare se un file esiste e non è vuoto
 def check_file(file_path, file_description):
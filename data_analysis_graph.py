@@ -4,6 +4,10 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import config
+import utils.in_out_csv as ioc
+
+# Se mostrare i grafici a schermo dopo averli salvati (main.py --steps li salva soltanto)
+mostra_grafici = True
 
 # ========== Utility Functions ==========
 
@@ -15,11 +19,15 @@ def carica_json(file_path):
 def salva_fig(percorso):
     if percorso:
         plt.savefig(percorso)
-    plt.show()
+    if mostra_grafici:
+        plt.show()
     plt.close()
 
 
 def carica_dataframe(csv_path):
+    # Accetta anche una tabella già in memoria (passata da main.py): se ne usa una copia
+    if isinstance(csv_path, pd.DataFrame):
+        return csv_path.copy()
     df = pd.read_csv(csv_path)
     return df
 
@@ -131,30 +139,52 @@ def aggiungi_rilevanza(percorso_csv, percorso_output=None):
 
 # ========== Main Execution ==========
 
-def main():
-    df = carica_dataframe(config.NAME_FILE_CSV_OUT)
+def run(sezioni=None, riepilogo=None, mostra=True, file_sezioni=config.NAME_FILE_CSV_OUT):
+    """
+    Crea i grafici e la tabella con la rilevanza.
+
+    Parametri:
+    - sezioni (list | None): Righe della tabella delle sezioni già in memoria
+      (None: si legge file_sezioni).
+    - riepilogo (list | None): Righe del riepilogo già in memoria
+      (None: si legge config.TABLES_FILE_SUMMARY).
+    - mostra (bool): Se mostrare i grafici a schermo oltre a salvarli.
+    - file_sezioni (str): CSV della tabella delle sezioni, letto se sezioni è None.
+    """
+    global mostra_grafici
+    mostra_grafici = mostra
+
+    if sezioni is None:
+        df = carica_dataframe(file_sezioni)
+    else:
+        df = pd.DataFrame.from_records(sezioni, columns=ioc.HEADER_TAB2)
     df.fillna("Unknown", inplace=True)
+    df_riepilogo = config.TABLES_FILE_SUMMARY if riepilogo is None else pd.DataFrame(riepilogo)
 
     categorie = carica_json(os.path.join('in', 'tipologia.json'))
     conteggi = conta_categorie(df, categorie)
 
-    grafico_occorrenze_categorie(conteggi, config.GRAPH_OUT_DIR + 'grafico1_occorrenze_categorie.pdf')
-    grafico_categorie_per_readme(df, config.GRAPH_OUT_DIR + 'grafico2_distribuzione_categorie_readme.pdf')
+    grafico_occorrenze_categorie(conteggi, config.GRAPH_FILES[0])
+    grafico_categorie_per_readme(df, config.GRAPH_FILES[1])
 
     grafico_lunghezza_readme(
-        config.TABLES_FILE_SUMMARY,
-        config.GRAPH_OUT_DIR + 'grafico3_lunghezza_readme.pdf'
+        df_riepilogo,
+        config.GRAPH_FILES[2]
     )
     grafico_lunghezza_readme_fasce(
-        config.TABLES_FILE_SUMMARY,
-        config.GRAPH_OUT_DIR + 'grafico4_distribuzione_lunghezza_readme_per_fasce.pdf'
+        df_riepilogo,
+        config.GRAPH_FILES[3]
     )
 
     aggiungi_rilevanza(
-        config.TABLES_FILE_SUMMARY,
-        config.TABLES_OUT_DIR + 'readme_summary_relevance_score.csv'
+        df_riepilogo,
+        config.TABLES_FILE_RELEVANCE
     )
 
 
+def main():
+    run()
+
+
 if __name__ == "__main__":
     main()
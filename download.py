@@ -6,10 +6,22 @@ import argparse
 import os
 import utils.in_out_csv as ioc
 import utils.download_from_url as dfu
+import utils.download_manifest as dm
+import utils.fetch_scheduler as fs
+import utils.parse_cache as pc
+import utils.readme_resolver as rr
+import utils.stream_pipeline as sp
 import utils.parse_markdown_column as pmc
+import utils.run_profiler as rp
 import config
 
-def main():
+def build_parser():
+    """
+    Parser degli argomenti da riga di comando (i default vengono da config.py).
+
+    Ritorna:
+    - argparse.ArgumentParser: Parser degli argomenti.
+    """
     parser = argparse.ArgumentParser(description="Scarica file README.md da una lista di repository GitHub.")
     parser.add_argument('--md_path', type=str, default=config.PATH_MD_FILE, help="Cartella contenente i file Markdown")
     parser.add_argument('--csv_in', type=str, default=config.NAME_FILE_CSV_IN, help="Percorso del file CSV con gli URL")
@@ -17,8 +29,71 @@ def main():
     parser.add_argument('--json', type=str, default=config.NAME_FILE_JSON_IN, help="File JSON con le categorie")
     parser.add_argument('--csv_out', type=str, default=config.NAME_FILE_CSV_OUT, help="Percorso per il file CSV di output")
     parser.add_argument('--csv_out_url', type=str, default=config.NAME_FILE_CSV_OUT_URL, help="Percorso per il file CSV url di output")
+    parser.add_argument('--workers', type=int, default=config.DOWNLOAD_WORKERS, help="Numero di download contemporanei")
+    parser.add_argument('--manifest', type=str, default=None,
+                        help="Manifest dei download (default: <md_path>/download_manifest.json)")
+    parser.add_argument('--full', action='store_true', help="Svuota la cartella e riscarica tutti i README")
+    parser.add_argument('--rate', type=float, default=config.DOWNLOAD_RATE, help="Richieste al secondo per host")
+    parser.add_argument('--timeout', type=float, default=config.DOWNLOAD_TIMEOUT, help="Timeout di lettura (secondi)")
+    parser.add_argument('--retries', type=int, default=config.DOWNLOAD_RETRIES,
+                        help="Tentativi aggiuntivi per errori temporanei")
+    parser.add_argument('--failures_out', type=str, default=config.NAME_FILE_CSV_FAILURES,
+                        help="Percorso per il report CSV dei download falliti")
+    parser.add_argument('--queue_size', type=int, default=sp.DEFAULT_QUEUE_SIZE,
+                        help="README scaricati in attesa di analisi prima di fermare i download")
+    parser.add_argument('--resolver_cache', type=str, default=None,
+                        help="Cache delle posizioni dei README (default: <md_path>/readme_locations.json)")
+    parser.add_argument('--max_depth', type=int, default=config.CRAWL_MAX_DEPTH,
+                        help="Profondità massima dei file Markdown linkati da scaricare (default: senza limite)")
+    parser.add_argument('--max_children', type=int, default=config.CRAWL_MAX_CHILDREN,
+                        help="File linkati scaricati al massimo per ogni file (default: senza limite)")
+    parser.add_argument('--crawl_workers', type=int, default=config.CRAWL_WORKERS,
+                        help="Download contemporanei dei file Markdown linkati")
+    parser.add_argument('--parse_cache', type=str, default=config.PARSE_CACHE_FILE,
+                        help="Cache su disco delle analisi dei README")
+    parser.add_argument('--parse_cache_size', type=int, default=config.PARSE_CACHE_SIZE,
+                        help="Analisi conservate al massimo nella cache")
+    parser.add_argument('--no_parse_cache', action='store_true', help="Analizza tutti i README senza cache")
+    parser.add_argument('--title_memo', type=str, default=config.TITLE_MEMO_FILE,
+                        help="Memo su disco dei titoli già classificati")
+    parser.add_argument('--no_title_memo', action='store_true', help="Non carica né salva il memo dei titoli")
+    parser.add_argument('--engine', type=str, default=config.ANALYSIS_ENGINE, choices=sorted(pmc.ANALYSIS_ENGINES),
+                        help="Motore di analisi dei README (scanner: più veloce, stessi risultati)")
+    parser.add_argument('--max_file_bytes', type=int, default=config.MAX_FILE_BYTES,
+                        help="Byte letti al massimo per README (default: senza limite)")
+    parser.add_argument('--max_parse_seconds', type=float, default=config.MAX_PARSE_SECONDS,
+                        help="Secondi di analisi al massimo per README (default: senza limite)")
+    parser.add_argument('--oversize', type=str, default=config.OVERSIZE_POLICY, choices=["truncate", "skip"],
+                        help="README oltre --max_file_bytes: troncati all'ultima riga entro il limite o saltati")
+    parser.add_argument('--skipped_out', type=str, default=config.NAME_FILE_CSV_SKIPPED,
+                        help="Percorso del report dei README saltati o troncati")
+    parser.add_argument('--profile', action='store_true',
+                        help="Misura i tempi di ogni stadio per file e scrive il report delle prestazioni")
+    parser.add_argument('--profile_json', type=str, default=config.PROFILE_JSON,
+                        help="Report JSON dei tempi (totali, percentili, throughput, file più lenti)")
+    parser.add_argument('--profile_csv', type=str, default=config.PROFILE_CSV,
+                        help="Report CSV dei file più lenti con il tempo di ogni stadio")
+    return parser
+
 
-    args = parser.parse_args()
+def run(args, on_group=None):
+    """
+    Esegue il passo con gli argomenti già letti (anche da main.py, nello stesso processo).
+
+    Parametri:
+    - args (argparse.Namespace): Argomenti di build_parser().
+    - on_group (callable | None): Chiamata con ogni gruppo [README, figli...] scritto
+      nei CSV, per passare la tabella in memoria ai passi successivi.
+
+    Ritorna:
+    - tuple: (righe scaricate, numero di README analizzati).
+    """
+    pmc.set_analysis_engine(args.engine)
+    pmc.set_parse_budget(args.max_file_bytes, args.max_parse_seconds, args.oversize)
+    pmc.reset_read_report()  # Il report riguarda solo questa esecuzione
+    profiler = rp.enable() if args.profile else None
+    if profiler is None:
+        rp.disable()  # Un passo precedente nello stesso processo può averlo attivato
 
     # Crea la cartella di destinazione se non esiste
     os.makedirs(args.md_path, exist_ok=True)
@@ -34,30 +109,78 @@ def main():
     #print (site_list)
 
 
+    # Normalizza gli URL, così i repository duplicati vengono scaricati una volta sola
+    site_list = [dfu.normalize_repo_url(site) for site in site_list]
+
     # Converte gli URL in formato raw per il download
     link_list = dfu.rename_urls(site_list)
     print(".. URL convertiti ..")
     #print(link_list)
 
-    # Scarica i file Markdown
-    num_file_md = dfu.download_md_file(link_list, args.md_path)
-    print(f".. {num_file_md} file Markdown sono stati scaricati in {args.md_path} ..")
+    # Carica il manifest dei download precedenti (salvo download completo)
+    manifest = None
+    if not args.full:
+        manifest = dm.DownloadManifest.load(args.manifest or os.path.join(args.md_path, dm.MANIFEST_FILE_NAME))
 
-    # Analizza i file Markdown e crea una tabella
-    data_table = pmc.get_data_table(num_file_md, link_list, args.md_path, categories)
-    print(".. Tabella dei dati creata ..")
+    # Carica la cache dei branch / nomi di file già risolti e dei 404
+    resolver = rr.ReadmeResolver.load(args.resolver_cache or os.path.join(args.md_path, rr.RESOLVER_FILE_NAME))
 
-    # Esporta la tabella in CSV
-    ioc.get_csv_tab(data_table, args.csv_out)
-    print(f".. Tabella esportata in {args.csv_out} ..")
+    # Scheduler delle richieste: rate limit per host, timeout e retry con backoff
+    session = dfu.create_session(args.workers)
+    scheduler = fs.FetchScheduler(session, rate=args.rate, timeout=(fs.DEFAULT_TIMEOUT[0], args.timeout),
+                                  retries=args.retries)
 
-    # Analizza i file Markdown e crea una tabella
-    data_table = pmc.get_data_table_url(num_file_md, link_list, args.md_path, categories)
-    print(".. Tabella degli url creata ..")
+    # Memo dei titoli: i titoli già visti in altri README non vengono ripuliti né riclassificati
+    title_memo = None
+    if not args.no_title_memo:
+        title_memo = pmc.load_title_memo(args.title_memo, categories, config.TITLE_MEMO_SIZE)
+
+    # Cache delle analisi: i README invariati (con le stesse categorie) non vengono rianalizzati
+    parse_cache = None
+    if not args.no_parse_cache:
+        parse_cache = pc.ParseCache(args.parse_cache, categories, pmc.analyzer_version(), args.parse_cache_size)
+
+    # Scarica, analizza ed esporta in streaming: ogni README viene analizzato appena arriva.
+    # Il file i.md corrisponde sempre a link_list[i]; le righe non scaricate non producono righe nel CSV
+    downloaded, num_exported = sp.run_download_pipeline(
+        link_list, args.md_path, categories, args.csv_out, args.csv_out_url,
+        args.workers, manifest, resolver, scheduler, args.queue_size,
+        pmc.ChildCrawler(args.max_depth, args.max_children, args.crawl_workers, scheduler), parse_cache, on_group)
+    session.close()
+    if parse_cache is not None:
+        parse_cache.close()
+        print(f".. Cache delle analisi: {parse_cache.summary()} ..")
+    if title_memo is not None:
+        title_memo.save()
+    print(f".. Memo dei titoli: {pmc.get_title_memo(categories).summary()} ..")
+    read_report = pmc.get_read_report()
+    print(f".. Letture dei README: {read_report.summary()} ..")
+    for md_file, status in read_report.skipped.items():
+        print(f"Saltato ({status}): {md_file}")
+    ioc.get_csv_skipped(read_report.rows(), args.skipped_out)
+    print(f".. Report dei README saltati o troncati in {args.skipped_out} ..")
+    if profiler is not None:
+        report = profiler.save_json(args.profile_json)
+        profiler.save_csv(args.profile_csv)
+        print(f".. Profilo: {profiler.summary(report)} ..")
+        print(f".. Report dei tempi in {args.profile_json} e {args.profile_csv} ..")
+    print(f".. {len(downloaded)} file Markdown disponibili in {args.md_path} ..")
+    if manifest is not None:
+        print(f".. Aggiornamento incrementale: {manifest.summary()} ..")
+    print(f".. {num_exported} README analizzati: tabella esportata in {args.csv_out}, "
+          f"tabella url esportata in {args.csv_out_url} ..")
+
+    # Report dei download falliti definitivamente
+    failures = scheduler.failure_report()
+    ioc.get_csv_failures(failures, args.failures_out)
+    print(f".. {len(failures)} download falliti ({scheduler.stats['retries']} retry), "
+          f"report in {args.failures_out} ..")
+    return downloaded, num_exported
+
+
+def main():
+    run(build_parser().parse_args())
 
-    # Esporta la tabella in CSV degli url
-    ioc.get_csv_tab_url(data_table, args.csv_out_url)
-    print(f".. Tabella url esportata in {args.csv_out_url} ..")
 
 if __name__ == "__main__":
     main()
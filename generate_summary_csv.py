@@ -9,14 +9,24 @@ category_list = [
     "contacts", "performance"
 ]
 
-def generate_summary(input_csv_path, output_csv_path):
+# Colonne del CSV di riepilogo
+fieldnames = [
+    "File_name", "Total_titles_recognized", "Char_counts",
+    "Num_images", "Num_videos", "Num_code_blocks", "Num_links"
+] + category_list  # Aggiunge le categorie come colonne
+
+
+def summarize_rows(rows):
     """
-    Funzione che legge un CSV contenente i dati analizzati dei README
-    e genera un riepilogo per ciascun file, esportando il tutto in un nuovo CSV.
+    Funzione che aggrega le righe della tabella delle sezioni (una per titolo)
+    in un riepilogo per ciascun file.
 
     Parametri:
-    - input_csv_path (str): Percorso del file CSV di input.
-    - output_csv_path (str): Percorso del file CSV di output con il riassunto.
+    - rows (iterable): Righe come dizionari con le colonne del CSV delle sezioni
+      (lette dal CSV o tenute in memoria da main.py).
+
+    Ritorna:
+    - list: Righe del riepilogo (dizionari con le colonne di fieldnames), una per file.
     """
 
     # Dizionario che contiene dati aggregati per ciascun file
@@ -41,56 +51,44 @@ def generate_summary(input_csv_path, output_csv_path):
         "total_titles_recognized": 0,
     }
 
-    # Legge il file CSV riga per riga
-    with open(input_csv_path, newline='', encoding='utf-8') as infile:
-        reader = csv.DictReader(infile)
-        for row in reader:
-            filename = row["File_name"]
-            category = row["Category"].strip().lower()  # Elimina spazi e converte in minuscolo
-
-            # Se c'è una categoria valida, aggiorna i conteggi
-            if category:
-                if category in category_list:
-                    summary_data[filename]["categories"][category] += 1
-                    summary_data[filename]["total_titles_recognized"] += 1
-                    total_summary["categories"][category] += 1
-                    total_summary["total_titles_recognized"] += 1
-
-            # Somma dei valori numerici (es. immagini, link, ecc.)
-            for field in ["Char_counts", "Num_images", "Num_videos", "Num_code_blocks", "Num_links"]:
-                value = int(row[field])  # Converte da stringa a intero
-                key = field.lower()  # Uniforma le chiavi in minuscolo
-                summary_data[filename][key] += value
-                total_summary[key] += value
-
-    # Scrive il file CSV di output con il riepilogo
-    with open(output_csv_path, "w", newline='', encoding='utf-8') as outfile:
-        # Definisce le intestazioni del file CSV finale
-        fieldnames = [
-            "File_name", "Total_titles_recognized", "Char_counts",
-            "Num_images", "Num_videos", "Num_code_blocks", "Num_links"
-        ] + category_list  # Aggiunge le categorie come colonne
-
-        writer = csv.DictWriter(outfile, fieldnames=fieldnames)
-        writer.writeheader()  # Scrive l’intestazione nel file
-
-        for file_name, data in summary_data.items():
-            # Riepilogo per ogni file
-            row = {
-                "File_name": file_name,
-                "Total_titles_recognized": data["total_titles_recognized"],
-                "Char_counts": data["char_counts"],
-                "Num_images": data["num_images"],
-                "Num_videos": data["num_videos"],
-                "Num_code_blocks": data["num_code_blocks"],
-                "Num_links": data["num_links"]
-            }
+    # Scorre le righe una per una
+    for row in rows:
+        filename = row["File_name"]
+        category = (row["Category"] or "").strip().lower()  # Elimina spazi e converte in minuscolo (None in memoria)
+
+        # Se c'è una categoria valida, aggiorna i conteggi
+        if category:
+            if category in category_list:
+                summary_data[filename]["categories"][category] += 1
+                summary_data[filename]["total_titles_recognized"] += 1
+                total_summary["categories"][category] += 1
+                total_summary["total_titles_recognized"] += 1
+
+        # Somma dei valori numerici (es. immagini, link, ecc.)
+        for field in ["Char_counts", "Num_images", "Num_videos", "Num_code_blocks", "Num_links"]:
+            value = int(row[field])  # Converte da stringa a intero
+            key = field.lower()  # Uniforma le chiavi in minuscolo
+            summary_data[filename][key] += value
+            total_summary[key] += value
+
+    summary_rows = []
+    for file_name, data in summary_data.items():
+        # Riepilogo per ogni file
+        row = {
+            "File_name": file_name,
+            "Total_titles_recognized": data["total_titles_recognized"],
+            "Char_counts": data["char_counts"],
+            "Num_images": data["num_images"],
+            "Num_videos": data["num_videos"],
+            "Num_code_blocks": data["num_code_blocks"],
+            "Num_links": data["num_links"]
+        }
 
-            # Inserisce '1' ripetuto per quante volte è presente una categoria (es. '1', '11', '111', ecc.)
-            for cat in category_list:
-                row[cat] = data["categories"].get(cat, 0)
+        # Numero di titoli del file per ciascuna categoria
+        for cat in category_list:
+            row[cat] = data["categories"].get(cat, 0)
 
-            writer.writerow(row)  # Scrive la riga nel CSV
+        summary_rows.append(row)
 
     # --- BLOCCO FACOLTATIVO PER SCRIVERE ANCHE IL RIEPILOGO TOTALE ---
     '''
@@ -116,11 +114,46 @@ def generate_summary(input_csv_path, output_csv_path):
     '''
     # Questo blocco commentato serve per scrivere un riepilogo globale
     # Può essere attivato se vuoi una riga "TOTAL" con i dati complessivi
+    return summary_rows
 
 
-# Esempio di utilizzo della funzione principale
-generate_summary(
-    input_csv_path=config.NAME_FILE_CSV_OUT,  # Percorso CSV di input (analisi)
-    output_csv_path=config.TABLES_OUT_DIR + "readme_summary.csv",  # CSV di output generato
-    # totals_csv_path="readme_totals.csv"  # (Facoltativo) CSV con i totali globali
-)
+def write_summary(summary_rows, output_csv_path):
+    """
+    Scrive il riepilogo in un file CSV.
+
+    Parametri:
+    - summary_rows (list): Righe di summarize_rows.
+    - output_csv_path (str): Percorso del file CSV di output con il riassunto.
+    """
+    with open(output_csv_path, "w", newline='', encoding='utf-8') as outfile:
+        writer = csv.DictWriter(outfile, fieldnames=fieldnames)
+        writer.writeheader()  # Scrive l’intestazione nel file
+        writer.writerows(summary_rows)
+
+
+def generate_summary(input_csv_path, output_csv_path):
+    """
+    Funzione che legge un CSV contenente i dati analizzati dei README
+    e genera un riepilogo per ciascun file, esportando il tutto in un nuovo CSV.
+
+    Parametri:
+    - input_csv_path (str): Percorso del file CSV di input.
+    - output_csv_path (str): Percorso del file CSV di output con il riassunto.
+
+    Ritorna:
+    - list: Righe del riepilogo scritte nel CSV.
+    """
+    # Legge il file CSV riga per riga
+    with open(input_csv_path, newline='', encoding='utf-8') as infile:
+        summary_rows = summarize_rows(csv.DictReader(infile))
+    write_summary(summary_rows, output_csv_path)
+    return summary_rows
+
+
+# Esempio di utilizzo della funzione principale (solo eseguendo lo script, non importandolo)
+if __name__ == "__main__":
+    generate_summary(
+        input_csv_path=config.NAME_FILE_CSV_OUT,  # Percorso CSV di input (analisi)
+        output_csv_path=config.TABLES_OUT_DIR + "readme_summary.csv",  # CSV di output generato
+        # totals_csv_path="readme_totals.csv"  # (Facoltativo) CSV con i totali globali
+    )
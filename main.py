@@ -1,45 +1,310 @@
 #!/usr/bin/env python3
-import subprocess
+'''Esegui la pipeline da console (dalla cartella principale):
+python main.py                                    (menu interattivo)
+python main.py --steps process summary graphs     (senza menu, per i job batch)
+python main.py --steps download summary score --download_args "--workers 16 --engine scanner"
+
+I passi vengono eseguiti tutti in questo processo: le tabelle prodotte da un
+passo (sezioni dei README, riepilogo) restano in memoria e vengono passate
+ai passi successivi, che non rileggono i CSV appena scritti. I CSV, le tabelle
+e i grafici vengono comunque salvati su disco come output. Un passo senza la
+tabella in memoria (es. summary senza process nella stessa esecuzione) la
+legge dal file prodotto da un'esecuzione precedente.
+
+La build è incrementale (come make): un passo i cui input non sono cambiati
+dall'ultima esecuzione (README, tipologia.json, CSV dei passi precedenti,
+codice del passo e parametri) viene saltato, così cambiare solo lo stile
+di un grafico non rianalizza i README. download dipende dalla rete e viene
+sempre eseguito. --force riesegue comunque tutti i passi scelti.
 
-'''
 1. controlla che i link siano in apps.csv presente nella cartella ../in
 2. controlla che i file markdown in locale siano nella cartella ../mdfile
 
 - rimuovi il contenuto di una cartella -> rm -rf /percorso/della/cartella/md_file/*
-- rinomina i file nella cartella per ottenere il formato numerico nn.md 
-- vai sulla cartella ->  rename 's/_readme//' (esempio: rimuove _readme dal nome del file cifra_readme.md ) 
-
 - copia tutti i file in un altra cartella-> cp -r ~/percorso/origine/readmes/* ~/percorso/destinazione/md_file
 '''
+import argparse
+import ast
+import os
+import shlex
+import time
 
-def main():
-    while True:  # Loop per tornare al menu se l'utente sceglie "m1"
+import utils.build_state as bs
+import utils.in_out_csv as ioc
+import config
+
+# Passi della pipeline, nell'ordine in cui vengono eseguiti
+STEPS = ("download", "process", "summary", "graphs", "score")
+
+# Voci del menu interattivo (Esci resta sul 5, le voci nuove prendono i numeri successivi)
+MENU = {
+    "1": ("download", "Carica i link da in/*.csv e analizza i READMEs (download.py)"),
+    "2": ("process", "Carica READMEs da /md_files/*.md e analizza (process.py)"),
+    "3": ("summary", "Stampa sommario su CSV nella cartella /tables (generate_summary_csv.py)"),
+    "4": ("graphs", "Stampa grafici nella cartella /graphs (data_analysis_graph.py)"),
+    "6": ("score", "Stampa il punteggio di ogni README (score.py)"),
+}
+EXIT_CHOICE = "5"
+
+# Script di ogni passo: se cambia il suo codice (o quello dei moduli che importa), il passo viene rieseguito
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STAGE_CODE = {
+    "process": "process.py",
+    "summary": "generate_summary_csv.py",
+    "graphs": "data_analysis_graph.py",
+    "score": "score.py",
+}
+
+
+def stage_code(script):
+    """
+    File sorgente di un passo: lo script e i moduli del progetto che importa, anche indirettamente.
+
+    Gli import vengono letti dal codice (senza eseguirlo), così un modulo
+    aggiunto alla catena di un passo entra nella sua impronta senza doverlo elencare.
+
+    Parametri:
+    - script (str): Script del passo, relativo alla cartella del progetto.
+
+    Ritorna:
+    - list: Percorsi assoluti dei file sorgente, in ordine di nome.
+    """
+    found = set()
+    pending = [script]
+    while pending:
+        path = pending.pop()
+        if path in found:
+            continue
+        found.add(path)
+        with open(os.path.join(ROOT, path), encoding="utf-8") as file:
+            tree = ast.parse(file.read(), path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                modules = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                modules = [node.module]
+            else:
+                continue
+            for module in modules:
+                module_path = module.replace(".", "/") + ".py"
+                if os.path.isfile(os.path.join(ROOT, module_path)):
+                    pending.append(module_path)
+    return [os.path.join(ROOT, path) for path in sorted(found)]
+
+
+class PipelineRunner:
+    """
+    Esegue i passi della pipeline nello stesso processo, passando le tabelle in memoria.
+
+    download e process tengono in self.sections le righe della tabella delle
+    sezioni mentre scrivono il CSV; summary ne ricava self.summary_rows; graphs e
+    score usano le due tabelle. I moduli dei passi vengono importati solo
+    quando servono (pandas e matplotlib solo per graphs) e una volta sola.
+    Con uno stato della build i passi con input invariati vengono saltati.
+    """
+
+    def __init__(self, download_args=(), process_args=(), show_graphs=True, build_state=None, force=False):
+        """
+        Parametri:
+        - download_args (list): Argomenti per download.py (default: quelli di config.py).
+        - process_args (list): Argomenti per process.py (default: quelli di config.py).
+        - show_graphs (bool): Se mostrare i grafici a schermo oltre a salvarli.
+        - build_state (BuildState | None): Stato della build incrementale (None: sempre eseguiti).
+        - force (bool): Se eseguire i passi anche con input invariati.
+        """
+        self.download_args = list(download_args)
+        self.process_args = list(process_args)
+        self.show_graphs = show_graphs
+        self.build_state = build_state
+        self.force = force
+        self.sections = None  # Righe della tabella delle sezioni (dizionari con le colonne di HEADER_TAB2)
+        self.sections_csv = None  # CSV delle sezioni scritto in questa esecuzione (da download o process)
+        self.summary_rows = None  # Righe del riepilogo, una per file
+
+    def collect(self, group):
+        """
+        Aggiunge alla tabella in memoria le righe di un README e dei suoi file figli.
+
+        Parametri:
+        - group (list): Record del README seguito dai record dei file figli.
+        """
+        for file_data in group:
+            for row in ioc.tab_rows(file_data, with_link=False):
+                self.sections.append(dict(zip(ioc.HEADER_TAB2, row)))
+
+    def download(self):
+        import download
+        args = download.build_parser().parse_args(self.download_args)
+        self.sections = []
+        self.sections_csv = args.csv_out
+        self.summary_rows = None
+        download.run(args, on_group=self.collect)
+
+    def process_options(self):
+        import process
+        return process.build_parser().parse_args(self.process_args)
+
+    def process(self):
+        import process
+        args = self.process_options()
+        self.sections = []
+        self.sections_csv = args.csv_out
+        self.summary_rows = None
+        process.run(args, on_group=self.collect)
+
+    def sections_file(self):
+        """
+        CSV della tabella delle sezioni usato da summary e graphs.
+
+        Ritorna:
+        - str: Il CSV scritto da download o process in questa esecuzione,
+          altrimenti il --csv_out degli argomenti di process.
+        """
+        if self.sections_csv is not None:
+            return self.sections_csv
+        return self.process_options().csv_out
+
+    def summary(self):
+        import generate_summary_csv as gsc
+        if self.sections is None:
+            sections_csv = self.sections_file()
+            print(f".. Tabella delle sezioni letta da {sections_csv} ..")
+            self.summary_rows = gsc.generate_summary(sections_csv, config.TABLES_FILE_SUMMARY)
+        else:
+            self.summary_rows = gsc.summarize_rows(self.sections)
+            gsc.write_summary(self.summary_rows, config.TABLES_FILE_SUMMARY)
+        print(f".. Riepilogo di {len(self.summary_rows)} file esportato in {config.TABLES_FILE_SUMMARY} ..")
+
+    def graphs(self):
+        import data_analysis_graph as dag
+        dag.run(self.sections, self.summary_rows, self.show_graphs, self.sections_file())
+        print(f".. Grafici salvati in {config.GRAPH_OUT_DIR} ..")
+
+    def score(self):
+        import score
+        if self.summary_rows is None:
+            score.main(config.TABLES_FILE_SCORES)
+        else:
+            score.print_scores(self.summary_rows, config.TABLES_FILE_SCORES)
+
+    def stage_inputs(self, step):
+        """
+        Input e output di un passo per la build incrementale.
+
+        Parametri:
+        - step (str): Nome del passo (vedi STEPS).
+
+        Ritorna:
+        - tuple | None: (argomenti di BuildState.fingerprint, file prodotti),
+          None per download (gli input sono in rete).
+        """
+        if step not in STAGE_CODE:
+            return None
+        code = stage_code(STAGE_CODE[step])
+        if step == "process":
+            import process
+            args = self.process_options()
+            params = {key: value for key, value in sorted(vars(args).items())
+                      if key not in process.OUTPUT_NEUTRAL_ARGS}
+            # L'indice decide gli ID dei file nei CSV: è un input (e un output) del passo;
+            # i file figli già scaricati vengono analizzati dal disco, quindi sono input anche loro
+            inputs = {"files": [args.json, args.md_index], "md_directories": [args.md_path, args.linked_md_path],
+                      "code": code, "params": params}
+            return inputs, [args.csv_out, args.csv_out_url]
+        if step == "summary":
+            return {"files": [self.sections_file()], "code": code}, [config.TABLES_FILE_SUMMARY]
+        if step == "graphs":
+            inputs = {"files": [self.sections_file(), config.TABLES_FILE_SUMMARY, config.NAME_FILE_JSON_IN],
+                      "code": code, "params": {"graphs": config.GRAPH_FILES}}
+            return inputs, list(config.GRAPH_FILES) + [config.TABLES_FILE_RELEVANCE]
+        if step == "score":
+            return {"files": [config.TABLES_FILE_SUMMARY], "code": code}, [config.TABLES_FILE_SCORES]
+
+    def run(self, step):
+        """
+        Esegue un passo della pipeline.
+
+        Parametri:
+        - step (str): Nome del passo (vedi STEPS).
+
+        Ritorna:
+        - bool: False se il passo è stato saltato perché aggiornato.
+        """
+        start = time.perf_counter()
+        stage = self.stage_inputs(step) if self.build_state is not None else None
+        if stage is not None and not self.force:
+            if self.build_state.is_fresh(step, self.build_state.fingerprint(**stage[0])):
+                print(f".. Passo {step}: input invariati, saltato (--force per rieseguirlo) ..")
+                return False
+        print(f".. Passo {step} ..")
+        getattr(self, step)()
+        if stage is not None:
+            # Impronta ricalcolata dopo il passo (es. l'indice dei README aggiornato da process)
+            self.build_state.record(step, self.build_state.fingerprint(**stage[0]), stage[1])
+            self.build_state.save()
+        print(f".. Passo {step} completato in {time.perf_counter() - start:.1f} s ..")
+        return True
+
+    def run_steps(self, steps):
+        """
+        Esegue i passi scelti nell'ordine della pipeline.
+
+        Parametri:
+        - steps (iterable): Nomi dei passi (vedi STEPS).
+
+        Ritorna:
+        - list: Passi eseguiti (senza quelli saltati).
+        """
+        executed = []
+        for step in STEPS:
+            if step in steps and self.run(step):
+                executed.append(step)
+        if self.build_state is not None:
+            print(f".. Build incrementale: {self.build_state.summary()} ..")
+        return executed
+
+
+def menu(runner):
+    while True:  # Loop per tornare al menu dopo ogni passo
         print("\nScegli un'opzione:")
-        print("1 - Carica i link da in/*.csv e analizza i READMEs (download.py)")
-        print("2 - Carica READMEs da /md_files/*.md e analizza (process.py)")
-        print("3 - Stampa sommario su CSV nella cartella /tables (generate_summary_csv.py)")
-        print("4 - Stampa grafici nella cartella /graphs (data_analysis_graph.py)")
-        print("5 - Esci")
+        for choice in sorted([*MENU, EXIT_CHOICE], key=int):
+            print(f"{choice} - {MENU[choice][1] if choice in MENU else 'Esci'}")
 
         scelta = input("Scegli: ").strip().lower()
 
-        if scelta == "1":
-            subprocess.run([".venv\\Scripts\\python.exe", "download.py"])
-            input("\nPremi 'invio' per tornare al menu principale: ")
-        elif scelta == "2":
-            subprocess.run([".venv\\Scripts\\python.exe", "process.py"])
-            input("\nPremi 'invio' per tornare al menu principale: ")
-        elif scelta == "3":
-            subprocess.run([".venv\\Scripts\\python.exe", "generate_summary_csv.py"])
+        if scelta in MENU:
+            runner.run(MENU[scelta][0])
             input("\nPremi 'invio' per tornare al menu principale: ")
-        elif scelta == "4":
-            subprocess.run([".venv\\Scripts\\python.exe", "data_analysis_graph.py"])
-            input("\nPremi 'invio' per tornare al menu principale: ")
-        elif scelta == "5":
+        elif scelta == EXIT_CHOICE:
             print("Uscita dal programma...")
             break
         else:
             print("Scelta non valida. Riprova.")
 
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline download -> process -> summary -> graphs -> score.")
+    parser.add_argument('--steps', nargs='+', choices=STEPS, default=None,
+                        help="Passi da eseguire senza menu (sempre nell'ordine della pipeline)")
+    parser.add_argument('--download_args', type=str, default="",
+                        help="Argomenti per il passo download (come per download.py)")
+    parser.add_argument('--process_args', type=str, default="",
+                        help="Argomenti per il passo process (come per process.py)")
+    parser.add_argument('--show_graphs', action='store_true',
+                        help="Con --steps mostra anche i grafici a schermo (default: solo salvati)")
+    parser.add_argument('--force', action='store_true', help="Esegue i passi anche se gli input non sono cambiati")
+    parser.add_argument('--build_state', type=str, default=config.BUILD_STATE_FILE,
+                        help="Stato della build incrementale (impronte degli input di ogni passo)")
+    args = parser.parse_args()
+
+    runner = PipelineRunner(shlex.split(args.download_args), shlex.split(args.process_args),
+                            show_graphs=args.show_graphs or args.steps is None,
+                            build_state=bs.BuildState.load(args.build_state), force=args.force)
+    if args.steps is None:
+        menu(runner)
+    else:
+        runner.run_steps(args.steps)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -5,36 +5,27 @@ python process.py python3 process.py --md_path "~/leonardo/Scr*/readmes/" --json
 
 '''
 import argparse
-import os
-import re
 
 import utils.in_out_csv as ioc
+import utils.md_index as mi
 import utils.parse_markdown_column as pmc
+import utils.run_profiler as rp
+import utils.parse_cache as pc
 import config
 
+# Argomenti che non cambiano i CSV prodotti: restano fuori dall'impronta del passo in main.py
+OUTPUT_NEUTRAL_ARGS = frozenset({"processes", "crawl_workers", "parse_cache", "parse_cache_size", "no_parse_cache",
+                                 "title_memo", "no_title_memo", "profile", "profile_json", "profile_csv",
+                                 "skipped_out"})
 
-def rename_md_files(directory):
-    """
-    Rinomina i file Markdown in formato sequenziale (0.md, 1.md, 2.md...)
-    solo se non hanno già un nome numerico.
-    """
-    md_files = sorted([f for f in os.listdir(directory) if f.endswith('.md')])
-
-    valid_pattern = re.compile(r'^\d+\.md$')  # Pattern per numeri.md
-    filtered_files = [f for f in md_files if not valid_pattern.match(f)]
-
-    counter = 0
-    for old_name in filtered_files:
-        while f"{counter}.md" in md_files:
-            counter += 1
-
-        new_name = f"{counter}.md"
-        os.rename(os.path.join(directory, old_name), os.path.join(directory, new_name))
-        print(f"Rinominato: {old_name} → {new_name}")
-        md_files.append(new_name)
 
+def build_parser():
+    """
+    Parser degli argomenti da riga di comando (i default vengono da config.py).
 
-def main():
+    Ritorna:
+    - argparse.ArgumentParser: Parser degli argomenti.
+    """
     parser = argparse.ArgumentParser(
         description="Elabora i file Markdown scaricati e genera un CSV con le informazioni.")
     parser.add_argument('--md_path', type=str, default=config.PATH_MD_FILE, help="Cartella contenente i file Markdown")
@@ -43,35 +34,120 @@ def main():
                         help="Percorso per il file CSV di output")
     parser.add_argument('--csv_out_url', type=str, default=config.NAME_FILE_CSV_OUT_URL,
                         help="Percorso per il file CSV url di output")
+    parser.add_argument('--max_depth', type=int, default=config.CRAWL_MAX_DEPTH,
+                        help="Profondità massima dei file Markdown linkati da scaricare (default: senza limite)")
+    parser.add_argument('--max_children', type=int, default=config.CRAWL_MAX_CHILDREN,
+                        help="File linkati scaricati al massimo per ogni file (default: senza limite)")
+    parser.add_argument('--crawl_workers', type=int, default=config.CRAWL_WORKERS,
+                        help="Download contemporanei dei file Markdown linkati")
+    parser.add_argument('--processes', type=int, default=config.ANALYSIS_PROCESSES,
+                        help="Processi per l'analisi parallela dei README (1 = seriale)")
+    parser.add_argument('--parse_cache', type=str, default=config.PARSE_CACHE_FILE,
+                        help="Cache su disco delle analisi dei README")
+    parser.add_argument('--parse_cache_size', type=int, default=config.PARSE_CACHE_SIZE,
+                        help="Analisi conservate al massimo nella cache")
+    parser.add_argument('--no_parse_cache', action='store_true', help="Analizza tutti i README senza cache")
+    parser.add_argument('--title_memo', type=str, default=config.TITLE_MEMO_FILE,
+                        help="Memo su disco dei titoli già classificati")
+    parser.add_argument('--no_title_memo', action='store_true', help="Non carica né salva il memo dei titoli")
+    parser.add_argument('--engine', type=str, default=config.ANALYSIS_ENGINE, choices=sorted(pmc.ANALYSIS_ENGINES),
+                        help="Motore di analisi dei README (scanner: più veloce, stessi risultati)")
+    parser.add_argument('--max_file_bytes', type=int, default=config.MAX_FILE_BYTES,
+                        help="Byte letti al massimo per README (default: senza limite)")
+    parser.add_argument('--max_parse_seconds', type=float, default=config.MAX_PARSE_SECONDS,
+                        help="Secondi di analisi al massimo per README (default: senza limite)")
+    parser.add_argument('--oversize', type=str, default=config.OVERSIZE_POLICY, choices=["truncate", "skip"],
+                        help="README oltre --max_file_bytes: troncati all'ultima riga entro il limite o saltati")
+    parser.add_argument('--skipped_out', type=str, default=config.NAME_FILE_CSV_SKIPPED,
+                        help="Percorso del report dei README saltati o troncati")
+    parser.add_argument('--md_index', type=str, default=config.MD_INDEX_FILE,
+                        help="Indice dei README (ID numerico -> nome originale del file)")
+    parser.add_argument('--linked_md_path', type=str, default=config.PATH_LINKED_MD_FILE,
+                        help="Cartella dei file Markdown linkati scaricati (la cartella dei README non viene modificata)")
+    parser.add_argument('--profile', action='store_true',
+                        help="Misura i tempi di ogni stadio per file e scrive il report delle prestazioni")
+    parser.add_argument('--profile_json', type=str, default=config.PROFILE_JSON,
+                        help="Report JSON dei tempi (totali, percentili, throughput, file più lenti)")
+    parser.add_argument('--profile_csv', type=str, default=config.PROFILE_CSV,
+                        help="Report CSV dei file più lenti con il tempo di ogni stadio")
+    return parser
+
+
+def run(args, on_group=None):
+    """
+    Esegue il passo con gli argomenti già letti (anche da main.py, nello stesso processo).
 
-    args = parser.parse_args()
+    Parametri:
+    - args (argparse.Namespace): Argomenti di build_parser().
+    - on_group (callable | None): Chiamata con ogni gruppo [README, figli...] scritto
+      nei CSV, per passare la tabella in memoria ai passi successivi.
 
-    # Rinomina i file se necessario
-    if os.path.isdir(args.md_path):
-        rename_md_files(args.md_path)
+    Ritorna:
+    - int: Numero di README analizzati.
+    """
+    pmc.set_analysis_engine(args.engine)
+    pmc.set_parse_budget(args.max_file_bytes, args.max_parse_seconds, args.oversize)
+    pmc.reset_read_report()  # Il report riguarda solo questa esecuzione
+    profiler = rp.enable() if args.profile else None
+    if profiler is None:
+        rp.disable()  # Un passo precedente nello stesso processo può averlo attivato
 
     # Carica il file JSON delle categorie
     categories = pmc.load_categories_from_json(args.json)
     print(".. Categorie caricate dal JSON ..")
 
-    # Recupera la lista di file nella cartella
-    num_file_md = len([file for file in os.listdir(args.md_path) if file.endswith('.md')])
-    print(f".. Presenti {num_file_md} README file dalla cartella {args.md_path} ..")
-
-    # Analizza i file Markdown e crea una tabella
-    data_table = pmc.get_data_table2(num_file_md, config.PATH_MD_FILE, categories)
-    print(".. Tabella dei dati creata ..")
-
-    # Esporta la tabella in CSV
-    ioc.get_csv_tab2(data_table, args.csv_out)
+    # Indicizza i README della cartella (ID stabile -> nome originale) senza rinominarli
+    md_index = mi.MdIndex.load(args.md_index, args.md_path)
+    entries = md_index.update()
+    md_index.save()
+    print(f".. Presenti {len(entries)} README file dalla cartella {args.md_path} ..")
+    print(f".. Indice dei README in {args.md_index}: {md_index.summary()} ..")
+
+    # Memo dei titoli: i titoli già visti in altri README non vengono ripuliti né riclassificati
+    title_memo = None
+    if not args.no_title_memo:
+        title_memo = pmc.load_title_memo(args.title_memo, categories, config.TITLE_MEMO_SIZE)
+
+    # Cache delle analisi: i README invariati (con le stesse categorie) non vengono rianalizzati
+    parse_cache = None
+    if not args.no_parse_cache:
+        parse_cache = pc.ParseCache(args.parse_cache, categories, pmc.analyzer_version(), args.parse_cache_size)
+
+    # Analizza i file Markdown una sola volta e scrive le righe di entrambi i CSV man mano
+    # (tabella delle sezioni e tabella degli url dallo stesso parsing, con memoria costante)
+    crawler = pmc.ChildCrawler(args.max_depth, args.max_children, args.crawl_workers)
+    file_groups = pmc.iter_indexed_groups(entries, args.md_path, categories, crawler, args.processes, parse_cache,
+                                          args.linked_md_path)
+    try:
+        num_written = ioc.get_csv_tabs(file_groups, args.csv_out, args.csv_out_url, with_link=False,
+                                       on_group=on_group)
+    finally:
+        if parse_cache is not None:
+            parse_cache.close()
+        if title_memo is not None:
+            title_memo.save()
+    print(f".. {num_written} README analizzati ..")
+    if parse_cache is not None:
+        print(f".. Cache delle analisi: {parse_cache.summary()} ..")
+    print(f".. Memo dei titoli: {pmc.get_title_memo(categories).summary()} ..")
+    read_report = pmc.get_read_report()
+    print(f".. Letture dei README: {read_report.summary()} ..")
+    for md_file, status in read_report.skipped.items():
+        print(f"Saltato ({status}): {md_file}")
+    ioc.get_csv_skipped(read_report.rows(), args.skipped_out)
+    print(f".. Report dei README saltati o troncati in {args.skipped_out} ..")
+    if profiler is not None:
+        report = profiler.save_json(args.profile_json)
+        profiler.save_csv(args.profile_csv)
+        print(f".. Profilo: {profiler.summary(report)} ..")
+        print(f".. Report dei tempi in {args.profile_json} e {args.profile_csv} ..")
     print(f".. Tabella esportata in {args.csv_out} ..")
+    print(f".. Tabella url esportata in {args.csv_out_url} ..")
+    return num_written
 
-    # Analizza i file Markdown e crea una tabella
-    data_table = pmc.get_data_table_url_2(num_file_md, args.md_path, categories)
-    print(".. Tabella degli url creata ..")
 
-    ioc.get_csv_tab_url_2(data_table, args.csv_out_url)
-    print(f".. Tabella url esportata in {args.csv_out_url} ..")
+def main():
+    run(build_parser().parse_args())
 
 
 if __name__ == "__main__":
@@ -63,9 +63,28 @@ def evaluate_readme(row):
     total_score = (title_score + char_score + image_score + link_score + cat_score) / 5
     return round(total_score)
 
-# Read CSV and evaluate
-with open(config.TABLES_OUT_DIR+'readme_summary.csv', mode='r') as file:
-    reader = csv.DictReader(file)
-    for row in reader:
+def print_scores(rows, output_csv_path=None):
+    # Print the score of every README in the summary rows (read from CSV or kept in memory by main.py)
+    scores = []
+    for row in rows:
         score = evaluate_readme(row)
         print(f"File: {row['File_name']}, Score: {score}")
+        scores.append((row['File_name'], score))
+
+    # Optionally save the scores too (main.py uses the file to skip this step when nothing changed)
+    if output_csv_path is not None:
+        with open(output_csv_path, mode='w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(["File_name", "Score"])
+            writer.writerows(scores)
+    return scores
+
+
+def main(output_csv_path=None):
+    # Read CSV and evaluate
+    with open(config.TABLES_FILE_SUMMARY, mode='r') as file:
+        return print_scores(csv.DictReader(file), output_csv_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import unittest
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+from utils.fetch_scheduler import FetchScheduler, TokenBucket
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Server locale: /flaky fallisce due volte con 503, /limited risponde 429, /slow non risponde in tempo,
+    /truncated chiude la connessione a metà del corpo la prima volta."""
+    protocol_version = "HTTP/1.1"
+    hits = {}
+
+    def do_GET(self):
+        hits = self.hits[self.path] = self.hits.get(self.path, 0) + 1
+        if self.path == "/slow":
+            time.sleep(0.5)
+        if self.path == "/flaky" and hits <= 2:
+            self.reply(503, b"")
+        elif self.path == "/truncated" and hits == 1:
+            # Corpo chunked interrotto: il client solleva ChunkedEncodingError
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            self.wfile.write(b"10\r\n# OK")
+            self.close_connection = True
+        elif self.path == "/limited":
+            self.reply(429, b"", {"Retry-After": "0"})
+        elif self.path == "/missing":
+            self.reply(404, b"")
+        else:
+            self.reply(200, b"# OK\n")
+
+    def reply(self, status, body, headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestFetchScheduler(unittest.TestCase):
+
+    def setUp(self):
+        FlakyHandler.hits = {}
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host, port = self.server.server_address
+        self.base = f"http://{host}:{port}"
+        self.sleeps = []
+        self.scheduler = FetchScheduler(rate=1000, timeout=(1, 0.2), retries=3, sleep=self.sleeps.append)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_retry_su_errore_temporaneo(self):
+        """Un 503 temporaneo viene ritentato con backoff esponenziale"""
+        response = self.scheduler.get(f"{self.base}/flaky")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(FlakyHandler.hits["/flaky"], 3)
+        self.assertEqual(len(self.sleeps), 2)
+        self.assertLess(self.sleeps[0], self.sleeps[1])
+        self.assertEqual(self.scheduler.failure_report(), [])
+
+    def test_retry_su_corpo_interrotto(self):
+        """Una connessione chiusa a metà del corpo (ChunkedEncodingError) viene ritentata"""
+        response = self.scheduler.get(f"{self.base}/truncated")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.text, "# OK\n")
+        self.assertEqual(FlakyHandler.hits["/truncated"], 2)
+        self.assertEqual(len(self.sleeps), 1)
+        self.assertEqual(self.scheduler.failure_report(), [])
+
+    def test_tentativi_esauriti(self):
+        """Dopo l'ultimo tentativo l'URL finisce nel report, rispettando Retry-After"""
+        response = self.scheduler.get(f"{self.base}/limited")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(FlakyHandler.hits["/limited"], 4)
+        self.assertEqual(self.sleeps, [0.0, 0.0, 0.0])
+        self.assertEqual(self.scheduler.failure_report(), [(f"{self.base}/limited", 4, "HTTP 429")])
+
+    def test_nessun_retry_su_404(self):
+        """Gli errori definitivi non vengono ritentati"""
+        response = self.scheduler.get(f"{self.base}/missing")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(FlakyHandler.hits["/missing"], 1)
+
+    def test_timeout_di_lettura(self):
+        """Un server che non risponde non blocca il batch: timeout, retry e report"""
+        with self.assertRaises(requests.Timeout):
+            self.scheduler.get(f"{self.base}/slow")
+        url, attempts, _ = self.scheduler.failure_report()[0]
+        self.assertEqual((url, attempts), (f"{self.base}/slow", 4))
+
+    def test_backoff_limitato(self):
+        """L'attesa non supera mai max_backoff"""
+        scheduler = FetchScheduler(backoff=1, max_backoff=5)
+        self.assertLessEqual(scheduler.backoff_delay(10), 5)
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_limite_di_frequenza(self):
+        """Esaurito il picco, ogni richiesta attende 1/rate secondi"""
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0], sleep=sleep)
+        for _ in range(4):
+            bucket.acquire()
+
+        self.assertEqual(sleeps, [0.5, 0.5])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+import utils.in_out_csv as ioc
+import utils.md_reader as mr
+import utils.parse_markdown_column as pmc
+import utils.stream_pipeline as sp
+from utils.download_from_url import download_md_files
+from utils.stream_pipeline import run_download_pipeline
+
+
+class ReadmeHandler(BaseHTTPRequestHandler):
+    """Server locale con alcuni README; /missing restituisce 404."""
+    protocol_version = "HTTP/1.1"
+    files = {
+        "/a": "# Introduction\nabc [docs](http://example.com/docs)\n# Installation\nrun it\n",
+        "/b": "# Settings\nabcd\n## License\nMIT [license](http://example.com/l)\n",
+        "/c": "No titles here, only [a link](http://example.com/c)\n"
+    }
+
+    def do_GET(self):
+        content = self.files.get(self.path)
+        body = content.encode("utf-8") if content is not None else b""
+        self.send_response(200 if content is not None else 404)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SlowFirstHandler(BaseHTTPRequestHandler):
+    """Server locale in cui /slow risponde dopo gli altri README."""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/slow":
+            time.sleep(1)
+        body = f"# Install\n{self.path}\n".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RecordingCsvWriter(sp.OrderedCsvWriter):
+    """Writer che registra quanti file restano al massimo in attesa di riordino."""
+    max_buffered = 0
+
+    def add(self, row, tables):
+        RecordingCsvWriter.max_buffered = max(RecordingCsvWriter.max_buffered, len(self.buffer) + 1)
+        super().add(row, tables)
+
+
+class TestStreamPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), ReadmeHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host, port = self.server.server_address
+        base = f"http://{host}:{port}"
+        self.links = [f"{base}/a", f"{base}/missing", f"{base}/b", f"{base}/c", f"{base}/a"]
+        self.test_dir = tempfile.mkdtemp() + os.sep
+        self.categories = {
+            "title": {"keywords": ["Introduction"]},
+            "install": {"keywords": ["Install"]},
+            "configuration": {"keywords": ["Settings"]}
+        }
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def read(self, name):
+        with open(os.path.join(self.test_dir, name), encoding="utf-8") as f:
+            return f.read()
+
+    def test_stesso_output_del_flusso_a_fasi(self):
+        """La pipeline a stream produce gli stessi CSV di download + analisi + esportazione"""
+        md_dir = os.path.join(self.test_dir, "md_batch") + os.sep
+        download_md_files(self.links, md_dir, max_workers=2)
+        data_table = pmc.get_data_table(len(self.links), self.links, md_dir, self.categories)
+        ioc.get_csv_tab(data_table, os.path.join(self.test_dir, "batch.csv"))
+        url_table = pmc.get_data_table_url(len(self.links), self.links, md_dir, self.categories)
+        ioc.get_csv_tab_url(url_table, os.path.join(self.test_dir, "batch_url.csv"))
+
+        md_dir = os.path.join(self.test_dir, "md_stream") + os.sep
+        downloaded, exported = run_download_pipeline(
+            self.links, md_dir, self.categories,
+            os.path.join(self.test_dir, "stream.csv"), os.path.join(self.test_dir, "stream_url.csv"),
+            max_workers=2, queue_size=1)
+
+        self.assertEqual(downloaded, [0, 2, 3, 4])
+        self.assertEqual(exported, 4)
+        self.assertEqual(self.read("stream.csv"), self.read("batch.csv"))
+        self.assertEqual(self.read("stream_url.csv"), self.read("batch_url.csv"))
+        self.assertIn("4.md,Introduction", self.read("stream.csv"))
+
+    def test_buffer_di_riordino_limitato(self):
+        """Se la prima riga è lenta, i file in attesa di riordino non superano queue_size più i download in volo"""
+        server = ThreadingHTTPServer(("127.0.0.1", 0), SlowFirstHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = server.server_address
+        links = [f"http://{host}:{port}/slow"] + [f"http://{host}:{port}/f{i}" for i in range(40)]
+        writer_class, sp.OrderedCsvWriter = sp.OrderedCsvWriter, RecordingCsvWriter
+        RecordingCsvWriter.max_buffered = 0
+        try:
+            _, exported = run_download_pipeline(
+                links, os.path.join(self.test_dir, "md") + os.sep, self.categories,
+                os.path.join(self.test_dir, "s.csv"), os.path.join(self.test_dir, "u.csv"),
+                max_workers=2, queue_size=2, crawler=pmc.ChildCrawler(max_depth=0))
+        finally:
+            sp.OrderedCsvWriter = writer_class
+            server.shutdown()
+            server.server_close()
+        self.assertEqual(exported, 41)
+        self.assertLessEqual(RecordingCsvWriter.max_buffered, 2 + 1 + 2 * 2)
+
+    def test_tempo_massimo_di_analisi(self):
+        """L'analisi resta nel thread principale: il timer interrompe anche il parsing di markdown-it"""
+        def slow_tokens(md_text):
+            time.sleep(5)  # Parsing che non passa mai dai controlli cooperativi
+            return []
+
+        report = pmc.reset_read_report()
+        pmc.set_parse_budget(max_seconds=0.1)
+        start = time.monotonic()
+        try:
+            with patch.object(pmc, "extract_md_tokens", slow_tokens):
+                _, exported = run_download_pipeline(
+                    self.links[:1], os.path.join(self.test_dir, "md") + os.sep, self.categories,
+                    os.path.join(self.test_dir, "s.csv"), os.path.join(self.test_dir, "u.csv"), max_workers=1)
+        finally:
+            pmc.set_parse_budget()
+            pmc.reset_read_report()
+        self.assertLess(time.monotonic() - start, 3)
+        self.assertEqual(exported, 1)
+        self.assertEqual(list(report.skipped.values()), [mr.READ_TIMEOUT])
+
+    def test_errore_di_analisi(self):
+        """Un errore nello stadio di analisi viene propagato senza bloccare i download"""
+        with self.assertRaises(AttributeError):
+            run_download_pipeline(self.links, os.path.join(self.test_dir, "md") + os.sep, None,
+                                  os.path.join(self.test_dir, "s.csv"), os.path.join(self.test_dir, "u.csv"),
+                                  max_workers=2, queue_size=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
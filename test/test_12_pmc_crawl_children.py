@@ -0,0 +1,106 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import utils.fetch_scheduler as fs
+import utils.parse_markdown_column as pmc
+
+
+class LinkedHandler(BaseHTTPRequestHandler):
+    """Server locale con file Markdown che si linkano fra loro."""
+    protocol_version = "HTTP/1.1"
+    base = ""
+    requests = []
+    files = {
+        "/docs/A.md": "# Usage\nsee [c]({base}/x/C.md) and [b]({base}/docs/B.md)\n",
+        "/docs/B.md": "# License\nMIT\n",
+        "/x/C.md": "# Contributing\n[d]({base}/y/D.md)\n",
+        "/y/D.md": "# Support\nask\n"
+    }
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        content = self.files.get(self.path)
+        body = content.format(base=self.base).encode("utf-8") if content is not None else b""
+        self.send_response(200 if content is not None else 404)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestCrawlChildren(unittest.TestCase):
+
+    def setUp(self):
+        LinkedHandler.requests = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), LinkedHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host, port = self.server.server_address
+        LinkedHandler.base = f"http://{host}:{port}"
+        self.test_dir = tempfile.mkdtemp() + os.sep
+        with open(os.path.join(self.test_dir, "0.md"), "w", encoding="utf-8") as f:
+            f.write(f"# Introduction\n[a]({LinkedHandler.base}/docs/A.md) [b]({LinkedHandler.base}/docs/B.md) "
+                    f"[gone]({LinkedHandler.base}/docs/missing.md)\n")
+        self.categories = {"title": {"keywords": ["Introduction"]}, "usage": {"keywords": ["Usage"]}}
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def crawl(self, crawler):
+        result = pmc.get_data_table2(1, self.test_dir, self.categories, crawler)
+        return [file_data["file_name"] for file_data in result]
+
+    def test_ordine_e_nomi(self):
+        """Figli chiamati padre_figlio.md, ogni file seguito dai suoi figli, ogni URL scaricato una volta"""
+        names = self.crawl(pmc.ChildCrawler(max_workers=4))
+
+        self.assertEqual(names, ["0.md", "0_A.md", "0_A_C.md", "0_A_C_D.md", "0_B.md"])
+        self.assertEqual(sorted(LinkedHandler.requests),
+                         ["/docs/A.md", "/docs/B.md", "/docs/missing.md", "/x/C.md", "/y/D.md"])
+
+    def test_profondita_massima(self):
+        """Con max_depth=1 vengono scaricati solo i file linkati dal README"""
+        self.assertEqual(self.crawl(pmc.ChildCrawler(max_depth=1)), ["0.md", "0_A.md", "0_B.md"])
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, "0_A_C.md")))
+
+    def test_figli_per_file(self):
+        """Con max_children=1 si segue solo il primo link di ogni file"""
+        self.assertEqual(self.crawl(pmc.ChildCrawler(max_children=1)),
+                         ["0.md", "0_A.md", "0_A_C.md", "0_A_C_D.md"])
+
+    def test_scheduler_del_crawler(self):
+        """I figli passano dallo scheduler del crawler: i download falliti finiscono nel suo report"""
+        scheduler = fs.FetchScheduler(retries=0)
+        self.assertEqual(self.crawl(pmc.ChildCrawler(max_depth=1, scheduler=scheduler)), ["0.md", "0_A.md", "0_B.md"])
+        self.assertEqual(scheduler.stats["requests"], 3)
+        report = scheduler.failure_report()
+        self.assertEqual([(url, attempts) for url, attempts, _ in report],
+                         [(f"{LinkedHandler.base}/docs/missing.md", 1)])
+        self.assertIn("404", report[0][2])
+
+    def test_seconda_esecuzione(self):
+        """Rieseguendo il crawl i figli già scaricati vengono analizzati dal disco e restano nell'output"""
+        first = pmc.get_data_table2(1, self.test_dir, self.categories, pmc.ChildCrawler())
+        LinkedHandler.requests = []
+        second = pmc.get_data_table2(1, self.test_dir, self.categories, pmc.ChildCrawler())
+
+        self.assertEqual(second, first)
+        self.assertEqual([file_data["file_name"] for file_data in second],
+                         ["0.md", "0_A.md", "0_A_C.md", "0_A_C_D.md", "0_B.md"])
+        self.assertEqual(LinkedHandler.requests, ["/docs/missing.md"])  # Solo il figlio mai scaricato
+
+    def test_analisi_dei_figli(self):
+        """I file figli vengono analizzati come i README"""
+        result = pmc.get_data_table2(1, self.test_dir, self.categories, pmc.ChildCrawler(max_depth=1))
+        self.assertEqual(result[1]["h1_titles"], ["Usage"])
+        self.assertEqual(result[1]["category"], ["usage"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+from utils.parse_markdown_column import find_titles_md, line_offsets, analyze_md_text
+
+
+class TestSectionLengths(unittest.TestCase):
+
+    def setUp(self):
+        self.categories = {"install": {"keywords": ["Install"]}}
+
+    def char_counts(self, md_text):
+        return [section.char_count for section in find_titles_md(md_text, self.categories)]
+
+    def test_line_offsets(self):
+        """Le fine riga \\r\\n, \\r e \\n valgono una riga ciascuna, come in markdown-it"""
+        self.assertEqual(line_offsets("ab\r\ncd\re\nf"), [0, 4, 7, 9, 10])
+        self.assertEqual(line_offsets(""), [0, 0])
+
+    def test_titoli_ripetuti(self):
+        """Un titolo ripetuto non fa misurare la sezione sbagliata"""
+        self.assertEqual(self.char_counts("# Usage\nUsage is simple\n# Usage\nmore text here\n"), [15, 14])
+
+    def test_titolo_citato_prima(self):
+        """Il testo del titolo presente nel corpo prima del titolo non sposta l'inizio della sezione"""
+        self.assertEqual(self.char_counts("Intro mentions Install\n# Install\nabc\n"), [3])
+
+    def test_setext_e_crlf(self):
+        """Titoli setext e fine riga Windows: la sottolineatura non entra nella sezione precedente"""
+        self.assertEqual(self.char_counts("# Install\r\nabc\r\n\r\nSetup\r\n=====\r\ndefg\r\n"), [3, 4])
+
+    def test_titoli_minori_nel_corpo(self):
+        """I titoli h5/h6 non aprono una sezione e ne fanno parte"""
+        self.assertEqual(self.char_counts("# A\n##### small\nab\n## B\n"), [8, 0])
+
+    def test_analyze_md_text(self):
+        """Le lunghezze arrivano nelle tuple delle sezioni"""
+        sections = analyze_md_text("# Installation\nabc\n# Usage\nabcd\n", self.categories)
+        self.assertEqual([(title, chars) for title, _, _, chars, *_ in sections],
+                         [("Installation", 3), ("Usage", 4)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import copy
+import random
+import re
+from utils.parse_markdown_column import CategoryMatcher, categorize_title, load_categories_from_json
+
+
+def reference_categorize(cleaned_title, categories):
+    """Confronto parola per parola della versione originale (senza modificare il dizionario)."""
+    for category_name, category_data in categories.items():
+        for keyword in category_data["keywords"] + [category_name]:
+            if re.search(re.escape(keyword.lower()), cleaned_title.lower()):
+                return category_name
+    return None
+
+
+class TestCategoryMatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.categories = load_categories_from_json("in/tipologia.json")
+
+    def test_dizionario_non_modificato(self):
+        """Classificare molti titoli non allunga le liste di parole chiave"""
+        original = copy.deepcopy(self.categories)
+        for _ in range(3):
+            categorize_title("Installation guide", self.categories)
+        self.assertEqual(self.categories, original)
+
+    def test_prima_categoria_vince(self):
+        """Con parole chiave di più categorie vince la prima nell'ordine del JSON"""
+        categories = {"install": {"keywords": ["Setup"]}, "title": {"keywords": ["Overview"]}}
+        self.assertEqual(categorize_title("Overview and Setup", categories), "install")
+        self.assertEqual(categorize_title("Overview", categories), "title")
+        self.assertEqual(categorize_title("my title", categories), "title")  # Nome della categoria
+        self.assertIsNone(categorize_title("Nothing", categories))
+
+    def test_caratteri_speciali(self):
+        """Le parole chiave sono confrontate alla lettera"""
+        matcher = CategoryMatcher({"faq": {"keywords": ["F.A.Q", "c++"]}})
+        self.assertEqual(matcher.match("the c++ api"), "faq")
+        self.assertIsNone(matcher.match("FxAxQ"))
+        self.assertIsNone(CategoryMatcher({}).match("anything"))
+
+    def test_stesso_risultato_del_confronto_originale(self):
+        """Su titoli casuali costruiti dalle parole chiave reali il risultato non cambia"""
+        rng = random.Random(9)
+        words = [keyword for data in self.categories.values() for keyword in data["keywords"]]
+        words += list(self.categories) + ["project", "the", "and", "Quick", "notes\nmore"]
+        for _ in range(2000):
+            title = " ".join(rng.choice(words) for _ in range(rng.randint(0, 4)))
+            if rng.random() < 0.3:
+                title = title.upper()
+            self.assertEqual(categorize_title(title, self.categories),
+                             reference_categorize(title, self.categories), title)
+
+
+if __name__ == "__main__":
+    unittest.main()
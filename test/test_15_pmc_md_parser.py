@@ -0,0 +1,64 @@
+import unittest
+import random
+from concurrent.futures import ThreadPoolExecutor
+from markdown_it import MarkdownIt
+import utils.parse_markdown_column as pmc
+
+
+def random_markdown(rng):
+    """README casuale con titoli, link, immagini, codice ed enfasi mescolati."""
+    pieces = ["# Install", "## Usage *fast*", "Setup\n=====", "text", "**bold**", "*[a](http://x/a.md)*",
+              "[**b**](http://x/b)", "[*](http://x/c)", "[&#32;](http://x/d)", "![img](i.png)",
+              "<http://x/auto>", "`[no](link)`", "```\n# not a title\n```", "> # quoted", "- [e](f) _g_",
+              "__[h](i)__", "[j][k]\n\n[k]: http://x/k", "<span>[l](m)</span>", "\\*[n](o)\\*", "***",
+              "[p  \nq](http://x/p)", "line  \nbreak", "[ \n ](http://x/r)"]
+    return "\n".join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+
+
+class TestMdParser(unittest.TestCase):
+
+    def setUp(self):
+        self.categories = {"install": {"keywords": ["Install"]}, "usage": {"keywords": ["Usage"]}}
+
+    def test_regole_disattivate(self):
+        """Il parser condiviso non esegue enfasi e interruzioni di riga; configure_md_parser le riattiva"""
+        active = pmc.md_parser.get_active_rules()
+        self.assertNotIn("emphasis", active["inline"])
+        self.assertNotIn("newline", active["inline"])
+        self.assertEqual(active["inline2"], [])
+        try:
+            parser = pmc.configure_md_parser(enable=["emphasis"])
+            self.assertIs(pmc.md_parser, parser)
+            self.assertIn("em_open", [t.type for t in pmc.extract_md_tokens("*a*")[1].children])
+        finally:
+            pmc.configure_md_parser()
+
+    def test_stessa_analisi_del_parser_completo(self):
+        """Titoli, link, immagini e lunghezze non cambiano rispetto a MarkdownIt() completo"""
+        rng = random.Random(10)
+        full = MarkdownIt()
+        for _ in range(500):
+            md_text = random_markdown(rng)
+            tuned = pmc.analyze_md_text(md_text, self.categories)
+            original = pmc.md_parser
+            pmc.md_parser = full
+            try:
+                expected = pmc.analyze_md_text(md_text, self.categories)
+            finally:
+                pmc.md_parser = original
+            self.assertEqual(tuned, expected, md_text)
+
+    def test_uso_concorrente(self):
+        """Un parser appena creato può essere usato subito da più thread"""
+        rng = random.Random(11)
+        texts = [random_markdown(rng) for _ in range(200)]
+        expected = [[t.type for t in MarkdownIt().disable(list(pmc.DISABLED_MD_RULES)).parse(text)] for text in texts]
+
+        parser = pmc.build_md_parser()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            result = list(executor.map(lambda text: [t.type for t in parser.parse(text)], texts))
+        self.assertEqual(result, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+import utils.in_out_csv as ioc
+import utils.parse_markdown_column as pmc
+
+
+class TestDataTables(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp() + os.sep
+        texts = ["# Introduction\nsee [docs](http://example.com/docs)\n## Install\n[a](http://example.com/a)\n",
+                 "No titles, [x](http://example.com/x)\n",
+                 "# Settings\n![img](i.png) [b](https://example.com/b)\n"]
+        for i, md_text in enumerate(texts):
+            with open(os.path.join(self.test_dir, f"{i}.md"), "w", encoding="utf-8") as f:
+                f.write(md_text)
+        self.links = ["https://github.com/a/a", "https://github.com/b/b", "https://github.com/c/c", "missing"]
+        self.categories = {"title": {"keywords": ["Introduction"]}, "install": {"keywords": ["Install"]}}
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def export(self, data_table, url_table, name, with_link=True):
+        tab, tab_url = (ioc.get_csv_tab, ioc.get_csv_tab_url) if with_link else (ioc.get_csv_tab2, ioc.get_csv_tab_url_2)
+        tab(data_table, os.path.join(self.test_dir, f"{name}.csv"))
+        tab_url(url_table, os.path.join(self.test_dir, f"{name}_url.csv"))
+        result = []
+        for path in (f"{name}.csv", f"{name}_url.csv"):
+            with open(os.path.join(self.test_dir, path), encoding="utf-8") as f:
+                result.append(f.read())
+        return result
+
+    def test_stessi_csv_delle_due_passate(self):
+        """Le due tabelle da un solo parsing producono gli stessi CSV delle due analisi separate"""
+        for with_link in (True, False):
+            if with_link:
+                expected = self.export(pmc.get_data_table(4, self.links, self.test_dir, self.categories),
+                                       pmc.get_data_table_url(4, self.links, self.test_dir, self.categories),
+                                       "two_pass", with_link)
+                tables = pmc.get_data_tables(4, self.links, self.test_dir, self.categories)
+            else:
+                expected = self.export(pmc.get_data_table2(4, self.test_dir, self.categories),
+                                       pmc.get_data_table_url_2(4, self.test_dir, self.categories),
+                                       "two_pass", with_link)
+                tables = pmc.get_data_tables2(4, self.test_dir, self.categories)
+            self.assertEqual(self.export(*tables, "one_pass", with_link), expected)
+
+    def test_un_parsing_per_readme(self):
+        """Ogni README viene letto e analizzato una sola volta"""
+        with patch.object(pmc, "download_md_text", wraps=pmc.download_md_text) as read, \
+                patch.object(pmc, "extract_md_tokens", wraps=pmc.extract_md_tokens) as parse:
+            data_table, url_table = pmc.get_data_tables2(3, self.test_dir, self.categories)
+
+        self.assertEqual(read.call_count, 3)
+        self.assertEqual(parse.call_count, 3)
+        self.assertEqual([file_data["file_name"] for file_data in url_table], ["0.md", "1.md", "2.md"])
+        self.assertIs(url_table[0], data_table[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
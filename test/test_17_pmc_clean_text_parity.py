@@ -0,0 +1,39 @@
+import unittest
+import random
+import re
+from utils.parse_markdown_column import clean_text
+
+
+def reference_clean_text(md_text):
+    """Versione originale a cinque passate di re.sub."""
+    md_text = re.sub(r'\[.*?\]\(.*?\)', '', md_text)
+    md_text = re.sub(r'<.*?>', '', md_text)
+    md_text = re.sub(r'http[s]?://\S+', '', md_text)
+    md_text = re.sub(r'[^\x00-\x7F]+', '', md_text)
+    md_text = re.sub(r'[^a-zA-Z\s]', '', md_text)
+    return md_text.strip()
+
+
+# Frammenti che attivano ogni pattern, anche annidati o spezzati da fine riga e spazi Unicode
+FRAGMENTS = ["[", "]", "(", ")", "](", "<", ">", "http", "https://", "://", "http://x.y/z", "[a](b)", "<b>",
+             "a", "Z", "q", "1", "_", "#", "*", "!", " ", "\t", "\n", "\r", "\x0b", "\x0c", "\x1c", "\x1f",
+             "\x00", "\x7f", "\xa0", " ", "é", "ñ", "🐛", "\ud800", "été"]
+
+
+class TestCleanTextParity(unittest.TestCase):
+
+    def test_stesso_output_su_testi_casuali(self):
+        """Su migliaia di testi casuali l'output coincide con quello della versione originale"""
+        rng = random.Random(12)
+        for _ in range(20000):
+            md_text = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 30)))
+            self.assertEqual(clean_text(md_text), reference_clean_text(md_text), repr(md_text))
+
+    def test_casi_limite(self):
+        """Pattern annidati: ogni pulizia lavora sul risultato della precedente"""
+        for md_text in ["<[a](b)>", "[x](<y>)z", "h<a>ttp://x y", "[a]\n(b)", "http://[a](b)c d", "\x1c a \x1f"]:
+            self.assertEqual(clean_text(md_text), reference_clean_text(md_text), repr(md_text))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import os
+import shutil
+import tempfile
+import utils.parse_markdown_column as pmc
+from utils.parse_cache import ParseCache
+
+
+class TestParallelAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp() + os.sep
+        self.texts = ["# Introduction\nabc [docs](http://example.com/docs)\n",
+                      "# Installation\n" + "run it\n" * 2000 + "## License\nMIT\n",
+                      "No titles here",
+                      "# Settings\n![img](i.png)\n# Usage\n```\ncode\n```\n",
+                      "# Installation\nabc\n"]
+        for i, md_text in enumerate(self.texts):
+            with open(os.path.join(self.test_dir, f"{i}.md"), "w", encoding="utf-8") as f:
+                f.write(md_text)
+        self.categories = {"title": {"keywords": ["Introduction"]}, "install": {"keywords": ["Install"]},
+                           "configuration": {"keywords": ["Settings"]}}
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_stesso_risultato_della_versione_seriale(self):
+        """Con un pool di processi la tabella è identica, nello stesso ordine 0.md, 1.md, ..."""
+        n = len(self.texts) + 1  # L'ultimo file non esiste
+        serial = pmc.get_data_table2(n, self.test_dir, self.categories)
+        parallel = pmc.get_data_table2(n, self.test_dir, self.categories, processes=2)
+
+        self.assertEqual(parallel, serial)
+        self.assertEqual([file_data["file_name"] for file_data in parallel], [f"{i}.md" for i in range(n)])
+
+    def test_analyze_files_parallel(self):
+        """I risultati tornano nell'ordine di input anche se i file grandi partono per primi"""
+        paths = [os.path.join(self.test_dir, f"{i}.md") for i in range(len(self.texts))]
+        expected = [pmc.analyze_md_text(md_text, self.categories) for md_text in self.texts]
+        self.assertEqual(pmc.analyze_files_parallel(paths, self.categories, 3), expected)
+
+    def test_cache_controllata_nei_worker(self):
+        """I contenuti già in cache non vengono rianalizzati nel pool e ogni file viene letto una volta sola"""
+        paths = [os.path.join(self.test_dir, f"{i}.md") for i in range(len(self.texts))]
+        expected = [pmc.analyze_md_text(md_text, self.categories) for md_text in self.texts]
+        # Analisi diversa salvata sotto l'hash di 1.md: se il worker la rianalizzasse il risultato cambierebbe
+        marker = expected[0]
+        db = os.path.join(self.test_dir, "cache.sqlite")
+        for cache in ({pmc.text_hash(self.texts[1]): marker}, pmc.RecentAnalyses(),
+                      ParseCache(db, self.categories, pmc.ANALYZER_VERSION)):
+            cache[pmc.text_hash(self.texts[1])] = marker
+            report = pmc.reset_read_report()
+            self.assertEqual(pmc.analyze_files_parallel(paths, self.categories, 3, cache),
+                             [marker if i == 1 else sections for i, sections in enumerate(expected)])
+            self.assertEqual(sum(report.counts.values()), len(paths))
+            for md_text, sections in zip(self.texts, expected):
+                if md_text != self.texts[1]:
+                    self.assertEqual(cache.get(pmc.text_hash(md_text)), sections)
+            if isinstance(cache, ParseCache):
+                cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import itertools
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+import utils.parse_markdown_column as pmc
+from utils.data_records import Section
+from utils.parse_cache import ParseCache
+
+
+class TestParseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp() + os.sep
+        self.db = os.path.join(self.test_dir, "cache.sqlite")
+        for i, md_text in enumerate(["# Installation\n[a](http://example.com/a) [b](http://example.com/b)\n",
+                                     "# Introduction\nabc\n## Usage\n![i](i.png)\n", "no titles"]):
+            with open(os.path.join(self.test_dir, f"{i}.md"), "w", encoding="utf-8") as f:
+                f.write(md_text)
+        self.categories = {"install": {"keywords": ["Install"]}, "title": {"keywords": ["Introduction"]}}
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def run_analysis(self, categories=None, version=pmc.ANALYZER_VERSION):
+        cache = ParseCache(self.db, categories or self.categories, version)
+        with patch.object(pmc, "analyze_md_text", wraps=pmc.analyze_md_text) as analyze:
+            result = pmc.get_data_table2(3, self.test_dir, categories or self.categories, analysis_cache=cache)
+        cache.close()
+        return result, analyze.call_count, cache.stats
+
+    def test_seconda_esecuzione_dalla_cache(self):
+        """Rieseguendo l'analisi i README invariati vengono letti dalla cache, con gli stessi risultati"""
+        first, analyzed, stats = self.run_analysis()
+        self.assertEqual((analyzed, stats["hit"], stats["miss"]), (3, 0, 3))
+
+        second, analyzed, stats = self.run_analysis()
+        self.assertEqual((analyzed, stats["hit"], stats["miss"]), (0, 3, 0))
+        self.assertEqual(second, first)
+        self.assertIsInstance(second[0]["current_links"][0][0], tuple)
+
+    def test_invalidazione(self):
+        """Categorie o versione dell'analizzatore diverse non usano le analisi salvate"""
+        self.run_analysis()
+        _, analyzed, _ = self.run_analysis({"install": {"keywords": ["Setup"]}})
+        self.assertEqual(analyzed, 3)
+        _, analyzed, _ = self.run_analysis(version=pmc.ANALYZER_VERSION + 1)
+        self.assertEqual(analyzed, 3)
+
+    def test_limite_lru(self):
+        """Oltre il limite vengono eliminate le analisi usate meno di recente"""
+        clock = itertools.count()
+        cache = ParseCache(self.db, self.categories, 1, max_entries=2, clock=lambda: next(clock))
+        for key in ("a", "b", "c"):
+            cache[key] = [Section("T", 1, None, 0)]
+        cache.get("a")
+        cache.close()
+        self.assertEqual(cache.stats["evicted"], 1)
+
+        cache = ParseCache(self.db, self.categories, 1)
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertIn("2 hit, 1 miss", cache.summary())
+        cache.close()
+
+    def test_memoria_limitata(self):
+        """Le analisi uscite dalla memoria si rileggono da quelle da salvare o dal database"""
+        cache = ParseCache(self.db, self.categories, 1, memory_entries=1)
+        cache["a"] = [Section("A", 1, None, 0)]
+        cache["b"] = [Section("B", 1, None, 0)]
+        self.assertEqual(cache.get("a"), [Section("A", 1, None, 0)])
+        cache.flush()
+        self.assertEqual(cache.get("b"), [Section("B", 1, None, 0)])
+        self.assertEqual(cache.stats["hit"], 2)
+        cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import pickle
+import unittest
+from utils.data_records import FileRecord, Section
+
+
+class TestDataRecords(unittest.TestCase):
+
+    def setUp(self):
+        self.section = Section("Install", 1, "install", 12, ("http://a", "http://b"), 1, 0, 2)
+        self.file_data = FileRecord("0.md", sections=[self.section, Section("Usage", 2, None, 3)])
+
+    def test_tupla_sezione(self):
+        """Iterando una sezione si ottiene la vecchia tupla di analyze_md_text"""
+        self.assertEqual(tuple(self.section),
+                         ("Install", 1, "install", 12, 2,
+                          [("install", 1, "http://a"), ("install", 2, "http://b")], 1, 0, 2))
+
+    def test_colonne(self):
+        """L'accesso per chiave restituisce le colonne della vecchia struttura"""
+        self.assertEqual(self.file_data["file_name"], "0.md")
+        self.assertEqual(self.file_data["h1_titles"], ["Install", "Usage"])
+        self.assertEqual(self.file_data["category"], ["install", None])
+        self.assertEqual(self.file_data["num_links"], [2, 0])
+        self.assertEqual(self.file_data["current_links"][1], [])
+
+    def test_link(self):
+        """Senza repository la chiave "link" manca come nel vecchio dizionario"""
+        self.assertNotIn("link", self.file_data)
+        self.assertIsNone(self.file_data.get("link"))
+        with self.assertRaises(KeyError):
+            self.file_data["link"]
+        file_data = FileRecord("1.md", "https://github.com/a/b")
+        self.assertIn("link", file_data)
+        self.assertEqual(file_data["link"], "https://github.com/a/b")
+
+    def test_serializzazione(self):
+        """to_list/from_list e pickle (usato dai processi) conservano la sezione"""
+        self.assertEqual(Section.from_list(self.section.to_list()), self.section)
+        self.assertEqual(pickle.loads(pickle.dumps(self.section)), self.section)
+        self.assertEqual(pickle.loads(pickle.dumps(self.file_data)), self.file_data)
+
+    def test_slots(self):
+        """I record non hanno un __dict__ per istanza"""
+        self.assertFalse(hasattr(self.section, "__dict__"))
+        self.assertFalse(hasattr(self.file_data, "__dict__"))
+
+
+if __name__ == "__main__":
+    unittest.main()
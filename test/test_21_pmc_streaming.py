@@ -0,0 +1,136 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+import utils.in_out_csv as ioc
+import utils.parse_markdown_column as pmc
+
+
+class ChildHandler(BaseHTTPRequestHandler):
+    """Server locale con i file Markdown linkati dai README."""
+    protocol_version = "HTTP/1.1"
+    files = {"/A.md": "# Usage\nrun it\n", "/B.md": "# License\nMIT\n"}
+
+    def do_GET(self):
+        content = self.files.get(self.path)
+        body = content.encode("utf-8") if content is not None else b""
+        self.send_response(200 if content is not None else 404)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), ChildHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host, port = self.server.server_address
+        base = f"http://{host}:{port}"
+        self.test_dir = tempfile.mkdtemp() + os.sep
+        texts = [f"# Introduction\nsee [a]({base}/A.md)\n## Install\n[x](http://example.com/x)\n",
+                 "No titles, [x](http://example.com/x)\n",
+                 f"# Settings\n![img](i.png) [b]({base}/B.md) [a]({base}/A.md)\n",
+                 "# Introduction\nsee [docs](http://example.com/docs)\n"]
+        for i, md_text in enumerate(texts):
+            with open(os.path.join(self.test_dir, f"{i}.md"), "w", encoding="utf-8") as f:
+                f.write(md_text)
+        self.links = ["https://github.com/a/a", "https://github.com/b/b", "https://github.com/c/c",
+                      "https://github.com/d/d"]
+        self.categories = {"title": {"keywords": ["Introduction"]}, "install": {"keywords": ["Install"]}}
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def read(self, *names):
+        result = []
+        for name in names:
+            with open(os.path.join(self.test_dir, name), encoding="utf-8") as f:
+                result.append(f.read())
+        return result
+
+    def clean_children(self):
+        for name in os.listdir(self.test_dir):
+            if "_" in name:
+                os.remove(os.path.join(self.test_dir, name))
+
+    def test_stessi_csv_delle_tabelle(self):
+        """I CSV scritti dallo stream coincidono con quelli delle tabelle complete"""
+        for with_link in (True, False):
+            self.clean_children()
+            if with_link:
+                data_table, url_table = pmc.get_data_tables(4, self.links, self.test_dir, self.categories)
+                ioc.get_csv_tab(data_table, os.path.join(self.test_dir, "tab.csv"))
+                ioc.get_csv_tab_url(url_table, os.path.join(self.test_dir, "url.csv"))
+            else:
+                data_table, url_table = pmc.get_data_tables2(4, self.test_dir, self.categories)
+                ioc.get_csv_tab2(data_table, os.path.join(self.test_dir, "tab.csv"))
+                ioc.get_csv_tab_url_2(url_table, os.path.join(self.test_dir, "url.csv"))
+
+            self.clean_children()
+            if with_link:
+                groups = pmc.iter_data_groups(4, self.links, self.test_dir, self.categories)
+            else:
+                groups = pmc.iter_data_groups2(4, self.test_dir, self.categories)
+            count = ioc.get_csv_tabs(groups, os.path.join(self.test_dir, "stream.csv"),
+                                     os.path.join(self.test_dir, "stream_url.csv"), with_link)
+
+            self.assertEqual(count, 4)
+            self.assertEqual(self.read("stream.csv", "stream_url.csv"), self.read("tab.csv", "url.csv"))
+
+    def test_gruppi_per_blocco(self):
+        """Con blocchi di un solo README ogni gruppo contiene il README seguito dai suoi figli"""
+        data_table = (pmc.new_file_data(f"{i}.md") for i in range(4))
+        groups = pmc.iter_file_groups(data_table, self.test_dir, self.categories, chunk_size=1)
+        self.assertEqual([[file_data.file_name for file_data in group] for group in groups],
+                         [["0.md", "0_A.md"], ["1.md"], ["2.md", "2_B.md"], ["3.md"]])
+
+    def test_generatore_pigro(self):
+        """I README vengono letti dall'iterabile solo quando serve il blocco successivo"""
+        consumed = []
+
+        def records():
+            for i in range(4):
+                consumed.append(i)
+                yield pmc.new_file_data(f"{i}.md")
+
+        groups = pmc.iter_file_groups(records(), self.test_dir, self.categories, chunk_size=2)
+        self.assertEqual(next(groups)[0].file_name, "0.md")
+        self.assertEqual(consumed, [0, 1])
+
+    def test_un_solo_pool_di_processi(self):
+        """Con più processi il pool viene creato una volta per tutto lo stream, con gli stessi gruppi"""
+        def names(groups):
+            return [[(file_data.file_name, file_data["h1_titles"]) for file_data in group] for group in groups]
+
+        self.clean_children()
+        serial = names(pmc.iter_data_groups2(4, self.test_dir, self.categories))
+        self.clean_children()
+        with patch.object(pmc, "ProcessPoolExecutor", wraps=ProcessPoolExecutor) as pool_class:
+            data_table = (pmc.new_file_data(f"{i}.md") for i in range(4))
+            parallel = names(pmc.iter_file_groups(data_table, self.test_dir, self.categories, processes=2,
+                                                  chunk_size=1))
+        self.assertEqual(pool_class.call_count, 1)
+        self.assertEqual(parallel, serial)
+
+    def test_recent_analyses(self):
+        """Il memo limitato conserva solo le analisi usate più di recente"""
+        cache = pmc.RecentAnalyses(max_entries=2)
+        cache["a"], cache["b"] = [1], [2]
+        cache.get("a")
+        cache["c"] = [3]
+        self.assertEqual((cache.get("a"), cache.get("b"), cache.get("c")), ([1], None, [3]))
+        self.assertEqual(len(cache), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import random
+import utils.line_scanner as ls
+import utils.parse_markdown_column as pmc
+from bench.compare_engines import section_differences
+
+CATEGORIES = {"title": {"keywords": ["Introduction"]}, "install": {"keywords": ["Install"]}}
+
+# Inizio riga (contenitori e rientri) e contenuto delle righe dei documenti casuali
+PREFIXES = ["", "", "", " ", "  ", "   ", "    ", "> ", ">", "> > ", "- ", "  - ", "    - ", "* ", "1. ", "2. ",
+            "10. ", "   > ", "- > ", "> - ", "\t", "1) ", "+ "]
+LINES = ["# Install", "## Usage [x](http://u)", "### A ###", "#### B #", "##### c", "#nospace", "Introduction",
+         "===", "---", "- - -", "***", "```", "```js", "~~~", "````", "``` a`b", "<div>", "</div>", "<!-- c", "-->",
+         "<script>", "</script>", "<span>x</span>", "<a href='q'>", "text [l](http://a.b/c) more", "![img](i.png)",
+         "[![b](i)](http://l)", "[](http://e)", "[ ](http://s)", "[`c`](http://code)", "[<b></b>](http://tag)",
+         "see <http://auto.x> and <m@x.io>", "`[x](y)`", "``a`` [z](http://z)", "[a [b](http://in)](http://out)",
+         "[a](http://x \"t\")", "[a](<http://x y>)", "[a]( http://x )", "[a](javascript:alert)", "[x][y]",
+         "plain words", "", "", "", "[a", "b](http://multi)", "&amp; [&nbsp;](http://ent)", "[\\]](http://esc)",
+         "<img src=x>", "[a](http://p(q))", "![[a](http://inner)](http://o)", "1. x", "=== x"]
+
+# Frammenti dei testi inline casuali
+INLINE_FRAGMENTS = ["[", "]", "(", ")", "![", "](", "a", " ", "\n", "`", "``", "<", ">", "<a>", "</a>",
+                    "<http://x.y>", "<m@x.io>", "http://u", "<b c='[x]'>", "\"t\"", "&amp;", "&nbsp;", "&", "!",
+                    "<!-- [ -->", "javascript:q", "<u v>", "[a](b)", "![c](d)", "[](e)", "[ ](f)", "`]`", "é",
+                    "[[", "]]", "\\", "<![CDATA[ [ ]]>"]
+
+
+def random_readme(rng):
+    lines = [rng.choice(PREFIXES) + rng.choice(LINES) for _ in range(rng.randint(1, 25))]
+    return rng.choice(["# Start\n", "Intro\n===\n", ""]) + "\n".join(lines) + rng.choice(["\n", "", "\r\n"])
+
+
+class TestLineScanner(unittest.TestCase):
+
+    def assertSameSections(self, md_text):
+        expected = pmc.find_titles_md(md_text, CATEGORIES)
+        self.assertEqual(section_differences(expected, pmc.scan_titles_md(md_text, CATEGORIES)), [], repr(md_text))
+
+    def assertScanned(self, md_text):
+        """Il testo è analizzato dallo scanner (senza passare a markdown-it) con lo stesso risultato"""
+        sections = pmc.scan_titles_md(md_text, CATEGORIES, fallback=False)
+        self.assertEqual(section_differences(pmc.find_titles_md(md_text, CATEGORIES), sections), [], repr(md_text))
+
+    def test_titoli_e_codice(self):
+        """Titoli ATX e setext; i # nei blocchi di codice delimitati o indentati non sono titoli"""
+        self.assertScanned("# Introduction\nabc\n\nInstall\n-------\n```\n# no\n```\n~~~~\n## no\n~~~\n"
+                           "    # no\n### Usage ###\n##### small\n")
+        self.assertScanned("Intro\nmulti line\n===\ntext\n- - -\nAfter\n---\n")
+
+    def test_link_e_immagini(self):
+        """Link con testo, immagini (anche dentro i link), autolink; link vuoti e codice non contano"""
+        self.assertScanned("# Install\n[docs](http://a \"t\") ![i](p.png) [![b](i.svg)](http://ci) "
+                           "<http://auto> <m@x.io> [](http://e) [ ](http://s) [`c`](http://c) `[x](y)` "
+                           "[a](<http://x y>) [bad](javascript:x)\n")
+
+    def test_contenitori(self):
+        """Citazioni, elenchi e righe pigre decidono cosa è titolo e cosa è paragrafo"""
+        self.assertScanned("# A\n> # Quoted\n> text\nlazy [l](http://l)\n- item\n  ===\n"
+                           "1. x\n   > [q](http://q)\n2) y\n\n    code [c](http://c)\n")
+        self.assertScanned("# A\n<div>\n# not a title\n\n# Install\n<!--\n[x](http://x)\n-->\n")
+
+    def test_ripiego_su_markdown_it(self):
+        """Riferimenti, tabulazioni nei contenitori ed escape passano a markdown-it con lo stesso risultato"""
+        for md_text in ["# A\n[x][r]\n\n[r]: http://ref\n", "# A\n- a\n\t- [b](http://b)\n", "# A\n-\n  # B\n"]:
+            with self.assertRaises(pmc.ScannerFallback):
+                pmc.scan_titles_md(md_text, CATEGORIES, fallback=False)
+            self.assertSameSections(md_text)
+        self.assertSameSections("# A\n[\\]](http://esc) [&nbsp;](http://ent)\n")
+
+    def test_documenti_casuali(self):
+        """Su migliaia di documenti casuali i due motori danno le stesse sezioni"""
+        rng = random.Random(17)
+        for _ in range(1500):
+            self.assertSameSections(random_readme(rng))
+
+    def test_inline_casuali(self):
+        """Sul testo inline lo scanner conta immagini e link come markdown-it"""
+        rng = random.Random(3)
+        for _ in range(5000):
+            src = "".join(rng.choice(INLINE_FRAGMENTS) for _ in range(rng.randint(1, 25))).strip()
+            if src:
+                self.assertEqual(ls.inline_counts(src, pmc.md_parser), ls.inline_counts_md(src, pmc.md_parser), repr(src))
+
+    def test_scelta_del_motore(self):
+        """analyze_md_text usa il motore scelto; la cache su disco distingue i motori"""
+        try:
+            pmc.set_analysis_engine("scanner")
+            self.assertEqual(pmc.analysis_engine, "scanner")
+            self.assertNotEqual(pmc.analyzer_version(), pmc.ANALYZER_VERSION)
+            self.assertEqual(pmc.analyze_md_text("# Install\n[a](http://a)\n", CATEGORIES),
+                             pmc.find_titles_md("# Install\n[a](http://a)\n", CATEGORIES))
+            with self.assertRaises(ValueError):
+                pmc.set_analysis_engine("regex")
+        finally:
+            pmc.set_analysis_engine(pmc.DEFAULT_ANALYSIS_ENGINE)
+        self.assertEqual(pmc.analyzer_version(), pmc.ANALYZER_VERSION)
+
+    def test_file_di_test(self):
+        """I README di test danno lo stesso risultato con i due motori"""
+        for name in ["0.md", "1.md", "example.md"]:
+            self.assertSameSections(pmc.download_md_text(f"./test/test_md_files/{name}"))
+
+
+if __name__ == "__main__":
+    unittest.main()
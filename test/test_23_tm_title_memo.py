@@ -0,0 +1,74 @@
+import unittest
+import os
+import shutil
+import tempfile
+import utils.parse_markdown_column as pmc
+from utils.title_memo import TitleMemo
+
+
+class TestTitleMemo(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, "title_memo.json")
+        self.categories = {"install": {"keywords": ["Install"]}, "license": {"keywords": ["License"]}}
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_hit_e_miss(self):
+        """I titoli ripetuti vengono classificati una volta sola e contati come hit"""
+        categories = dict(self.categories)  # Dizionario nuovo: memo vuoto
+        md_text = "# Install\na\n## License\nb\n# Install\nc\n# Install 🚀\n"
+        sections = pmc.find_titles_md(md_text, categories)
+        self.assertEqual([(s.title, s.category) for s in sections],
+                         [("Install", "install"), ("License", "license"), ("Install", "install"),
+                          ("Install", "install")])
+        memo = pmc.get_title_memo(categories)
+        self.assertEqual((memo.stats["hit"], memo.stats["miss"]), (1, 3))
+        pmc.scan_titles_md(md_text, categories)
+        self.assertEqual((memo.stats["hit"], memo.stats["miss"]), (5, 3))
+        self.assertIn("5 hit, 3 miss (62% hit)", memo.summary())
+
+    def test_limite_lru(self):
+        """Oltre il limite si elimina il titolo usato meno di recente"""
+        memo = TitleMemo("f", max_entries=2)
+        compute = lambda heading: (heading.lower(), None)
+        memo.get("A", compute)
+        memo.get("B", compute)
+        memo.get("A", compute)
+        memo.get("C", compute)
+        self.assertEqual(len(memo), 2)
+        self.assertEqual(memo.stats["evicted"], 1)
+        memo.get("B", compute)
+        self.assertEqual(memo.stats["miss"], 4)
+
+    def test_salvataggio(self):
+        """Il memo salvato viene riusato con le stesse categorie"""
+        categories = dict(self.categories)
+        memo = pmc.load_title_memo(self.path, categories)
+        pmc.find_titles_md("# Install\n## Usage\n", categories)
+        memo.save()
+
+        categories = dict(self.categories)
+        memo = pmc.load_title_memo(self.path, categories)
+        self.assertEqual(len(memo), 2)
+        pmc.find_titles_md("# Install\n## Usage\n", categories)
+        self.assertEqual((memo.stats["hit"], memo.stats["miss"]), (2, 0))
+
+    def test_categorie_cambiate(self):
+        """Se il JSON delle categorie cambia il memo salvato viene scartato"""
+        categories = dict(self.categories)
+        memo = pmc.load_title_memo(self.path, categories)
+        pmc.find_titles_md("# Install\n", categories)
+        memo.save()
+
+        changed = {"setup": {"keywords": ["Install"]}}
+        memo = pmc.load_title_memo(self.path, changed)
+        self.assertEqual(len(memo), 0)
+        self.assertEqual(memo.stats["invalidated"], 1)
+        self.assertEqual(pmc.find_titles_md("# Install\n", changed)[0].category, "setup")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import codecs
+import os
+import shutil
+import tempfile
+import utils.md_reader as mr
+import utils.parse_markdown_column as pmc
+
+
+class TestMdReader(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def write(self, name, data):
+        path = os.path.join(self.test_dir, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_catena_di_codifiche(self):
+        """BOM, UTF-16 senza BOM, UTF-8 e codifiche di ripiego danno lo stesso testo"""
+        text = "# Installazione\nCaffè, però — così\r\n"
+        expected = "# Installazione\nCaffè, però — così\n"
+        cases = [(text.encode("utf-8"), "utf-8", mr.READ_OK),
+                 (codecs.BOM_UTF8 + text.encode("utf-8"), "utf-8-sig", mr.READ_BOM),
+                 (codecs.BOM_UTF16_LE + text.encode("utf-16-le"), "utf-16-le", mr.READ_BOM),
+                 (codecs.BOM_UTF16_BE + text.encode("utf-16-be"), "utf-16-be", mr.READ_BOM),
+                 (codecs.BOM_UTF32_LE + text.encode("utf-32-le"), "utf-32-le", mr.READ_BOM),
+                 (text.encode("utf-16-le"), "utf-16-le", mr.READ_FALLBACK),
+                 (text.encode("cp1252"), "cp1252", mr.READ_FALLBACK)]
+        for i, (data, encoding, status) in enumerate(cases):
+            self.assertEqual(mr.read_markdown(self.write(f"{i}.md", data)), (expected, encoding, status))
+        self.assertEqual(mr.decode_markdown("à\x81".encode("latin-1")), ("à\x81", "latin-1", mr.READ_FALLBACK))
+
+    def test_file_saltati(self):
+        """File mancanti, binari o non validi per il loro BOM risultano vuoti con il loro esito"""
+        self.assertEqual(mr.read_markdown(os.path.join(self.test_dir, "none.md")), ("", None, mr.READ_MISSING))
+        self.assertEqual(mr.read_markdown(self.write("bin.md", b"\x89PNG\x00\xff\x00")), ("", None, mr.READ_BINARY))
+        self.assertEqual(mr.read_markdown(self.write("bom.md", b"\xff\xfe\xfa")), ("", "utf-16-le", mr.READ_UNDECODABLE))
+        self.assertEqual(mr.read_markdown(self.write("empty.md", b"")), ("", "utf-8", mr.READ_OK))
+
+    def test_file_grandi_mappati(self):
+        """Sopra MMAP_MIN_SIZE il file è letto dalla mappa in memoria con lo stesso risultato"""
+        text = "# Titolo\n" + "riga di testo è\n" * (mr.MMAP_MIN_SIZE // 8)
+        path = self.write("big.md", codecs.BOM_UTF8 + text.encode("utf-8"))
+        self.assertGreater(os.path.getsize(path), mr.MMAP_MIN_SIZE)
+        self.assertEqual(mr.read_markdown(path), (text, "utf-8-sig", mr.READ_BOM))
+        path = self.write("big_latin.md", text.encode("latin-1"))
+        self.assertEqual(mr.read_markdown(path), (text, "cp1252", mr.READ_FALLBACK))
+
+    def test_resoconto_delle_letture(self):
+        """download_md_text registra codifiche e file saltati nel resoconto"""
+        report = pmc.reset_read_report()
+        try:
+            self.assertEqual(pmc.download_md_text(self.write("0.md", "# A è\n".encode("cp1252"))), "# A è\n")
+            pmc.download_md_text(self.write("1.md", b"# B\n"))
+            pmc.download_md_text(self.write("2.md", b"\xff\xfe\xfa"))
+            pmc.download_md_text(os.path.join(self.test_dir, "3.md"))
+            self.assertEqual(report.skipped, {os.path.join(self.test_dir, "2.md"): mr.READ_UNDECODABLE,
+                                              os.path.join(self.test_dir, "3.md"): mr.READ_MISSING})
+            self.assertEqual(report.summary(),
+                             "4 file letti, altre codifiche: cp1252 1, 2 saltati (missing 1, undecodable 1)")
+        finally:
+            pmc.reset_read_report()
+
+
+if __name__ == "__main__":
+    unittest.main()
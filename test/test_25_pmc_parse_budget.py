@@ -0,0 +1,89 @@
+import unittest
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import threading
+import utils.md_reader as mr
+import utils.parse_markdown_column as pmc
+
+# README patologico: elenchi annidati che markdown-it analizza in qualche secondo
+NESTED_LISTS = "# Nested\n" + "- a\n  - b\n    - c [x](http://x)\n" * 4000
+
+
+class TestParseBudget(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp() + os.sep
+        self.texts = ["# Install\nfirst line\n## Usage\nsecond line\n", NESTED_LISTS, "# License\nMIT\n"]
+        for i, md_text in enumerate(self.texts):
+            with open(os.path.join(self.test_dir, f"{i}.md"), "w", encoding="utf-8") as f:
+                f.write(md_text)
+        self.categories = {"install": {"keywords": ["Install"]}, "license": {"keywords": ["License"]}}
+        self.report = pmc.reset_read_report()
+
+    def tearDown(self):
+        pmc.set_parse_budget()
+        pmc.set_analysis_engine(pmc.DEFAULT_ANALYSIS_ENGINE)
+        pmc.reset_read_report()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def path(self, i):
+        return os.path.join(self.test_dir, f"{i}.md")
+
+    def test_file_troncati_e_saltati(self):
+        """Oltre la dimensione massima il file è troncato all'ultima riga intera o saltato"""
+        pmc.set_parse_budget(max_bytes=30)
+        self.assertEqual(pmc.download_md_text(self.path(0)), "# Install\nfirst line\n## Usage\n")
+        self.assertEqual(pmc.download_md_text(self.path(2)), "# License\nMIT\n")
+        pmc.set_parse_budget(max_bytes=30, oversize=mr.OVERSIZE_SKIP)
+        self.assertEqual(pmc.download_md_text(self.path(1)), "")
+        self.assertEqual(self.report.rows(), [(self.path(1), mr.READ_TOO_LARGE), (self.path(0), mr.READ_TRUNCATED)])
+
+        data = "# A\nè\n# B\n".encode("utf-16")
+        self.assertEqual(mr.decode_markdown(data, 15), ("# A\nè\n", "utf-16-le", mr.READ_TRUNCATED))
+        self.assertEqual(mr.decode_markdown(b"# one very long line", 10), ("", None, mr.READ_TOO_LARGE))
+        with self.assertRaises(ValueError):
+            pmc.set_parse_budget(oversize="cut")
+
+    def test_watchdog_nel_thread_principale(self):
+        """Il timer interrompe il parsing di markdown-it: il file resta senza sezioni e fuori dalla cache"""
+        pmc.set_parse_budget(max_seconds=0.05)
+        cache = {}
+        table = pmc.get_data_table2(3, self.test_dir, self.categories, analysis_cache=cache)
+        self.assertEqual([len(file_data.sections) for file_data in table], [2, 0, 1])
+        self.assertEqual(self.report.skipped, {self.path(1): mr.READ_TIMEOUT})
+        self.assertNotIn(pmc.text_hash(NESTED_LISTS), cache)
+
+    def test_controlli_cooperativi_negli_altri_thread(self):
+        """Fuori dal thread principale lo scanner si ferma con i controlli cooperativi"""
+        pmc.set_analysis_engine("scanner")
+        pmc.set_parse_budget(max_seconds=0.01)
+        results = []
+        md_text = NESTED_LISTS * 5
+        pmc._watchdog_warned = False
+
+        def analyze():
+            for _ in range(2):
+                results.append(pmc.analyze_with_budget(md_text, self.categories))
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            thread = threading.Thread(target=analyze)
+            thread.start()
+            thread.join()
+        self.assertEqual(results, [(None, mr.READ_TIMEOUT)] * 2)
+        self.assertEqual(output.getvalue().count(".. Attenzione: analisi fuori dal thread principale"), 1)
+        self.assertEqual(len(pmc.analyze_with_budget(self.texts[0], self.categories)[0]), 2)
+
+    def test_limiti_nel_pool(self):
+        """I worker del pool ricevono i limiti: stesso risultato della versione seriale"""
+        pmc.set_parse_budget(max_seconds=0.05)
+        parallel = pmc.get_data_table2(3, self.test_dir, self.categories, processes=2)
+        self.assertEqual([len(file_data.sections) for file_data in parallel], [2, 0, 1])
+        self.assertEqual(self.report.skipped, {self.path(1): mr.READ_TIMEOUT})
+
+
+if __name__ == "__main__":
+    unittest.main()
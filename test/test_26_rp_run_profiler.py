@@ -0,0 +1,97 @@
+import unittest
+import csv
+import json
+import os
+import shutil
+import tempfile
+import time
+import utils.in_out_csv as ioc
+import utils.parse_markdown_column as pmc
+import utils.run_profiler as rp
+
+
+class TestRunProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp() + os.sep
+        self.texts = ["# Install\nrun [it](http://a)\n## Usage\nabc\n", "# License\n" + "MIT text\n" * 3000,
+                      "No titles"]
+        for i, md_text in enumerate(self.texts):
+            with open(os.path.join(self.test_dir, f"{i}.md"), "w", encoding="utf-8") as f:
+                f.write(md_text)
+        self.categories = {"install": {"keywords": ["Install"]}, "license": {"keywords": ["License"]}}
+
+    def tearDown(self):
+        rp.disable()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_tempi_esclusivi(self):
+        """Il tempo di uno stadio annidato non conta in quello esterno"""
+        profiler = rp.RunProfiler()
+        with profiler.file(os.path.join(self.test_dir, "0.md")) as record:
+            with profiler.stage("outer"):
+                time.sleep(0.02)
+                with profiler.stage("inner"):
+                    time.sleep(0.06)
+        self.assertGreaterEqual(record["stages"]["inner"], 0.06)
+        self.assertGreaterEqual(record["stages"]["outer"], 0.02)
+        self.assertLess(record["stages"]["outer"], record["stages"]["inner"])
+        self.assertGreaterEqual(record["seconds"], 0.08)
+        self.assertEqual(record["bytes"], len(self.texts[0]))
+        self.assertEqual(profiler.stage_calls, {"outer": 1, "inner": 1})
+
+    def test_report_di_una_esecuzione(self):
+        """Con il profiler attivo ogni file ha i suoi stadi; il report ha totali, percentili e file più lenti"""
+        profiler = rp.enable(slowest=2)
+        data_table = pmc.get_data_table2(3, self.test_dir, self.categories)
+        ioc.get_csv_tab_url_2(data_table, os.path.join(self.test_dir, "url.csv"))
+        ioc.get_csv_tabs([[data_table[0]]], os.path.join(self.test_dir, "a.csv"), os.path.join(self.test_dir, "b.csv"))
+
+        report = profiler.save_json(os.path.join(self.test_dir, "profile.json"))
+        profiler.save_csv(os.path.join(self.test_dir, "profile.csv"))
+        self.assertEqual(report["files"], 3)
+        self.assertEqual(report["bytes"], sum(len(md_text) for md_text in self.texts))
+        for stage in ("read", "tokenize", "clean_text", "categorize_title", "section_length", "csv_write"):
+            self.assertIn(stage, report["stages"])
+        self.assertEqual(report["stages"]["read"]["calls"], 3)
+        self.assertAlmostEqual(sum(stage["share"] for stage in report["stages"].values()), 1, places=2)
+        self.assertLessEqual(report["file_seconds"]["p50"], report["file_seconds"]["p99"])
+        self.assertEqual(len(report["slowest_files"]), 2)
+        self.assertEqual(report["slowest_files"][0]["file"], os.path.join(self.test_dir, "1.md"))
+
+        with open(os.path.join(self.test_dir, "profile.json"), encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["files"], 3)
+        with open(os.path.join(self.test_dir, "profile.csv"), encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ["File", "Bytes", "Seconds"] + list(rp.STAGES))
+        self.assertEqual(len(rows), 3)
+
+    def test_tempi_dai_worker_del_pool(self):
+        """Con l'analisi parallela i tempi dei file arrivano dai worker; il risultato non cambia"""
+        serial = pmc.get_data_table2(3, self.test_dir, self.categories)
+        profiler = rp.enable()
+        parallel = pmc.get_data_table2(3, self.test_dir, self.categories, processes=2)
+        self.assertEqual(parallel, serial)
+        report = profiler.report()
+        self.assertEqual(report["files"], 3)
+        self.assertEqual(report["stages"]["tokenize"]["calls"], 3)
+
+    def test_titoli_senza_profiler(self):
+        """A profiler spento i titoli non entrano in nessuno stadio; acceso, misura clean_text e categorize_title"""
+        matcher = pmc.get_category_matcher(self.categories)
+        self.assertEqual(pmc.title_classifier(self.categories).keywords["compute"], matcher.clean_and_match)
+        profiler = rp.enable()
+        classify = pmc.title_classifier(self.categories)
+        self.assertEqual(classify("Install [it](http://a)"), ("Install", "install"))
+        self.assertEqual(profiler.stage_calls, {"clean_text": 1, "categorize_title": 1})
+
+    def test_percentili(self):
+        """Percentile con il metodo del rango più vicino"""
+        values = [float(v) for v in range(1, 101)]
+        self.assertEqual([rp.percentile(values, p) for p in (50, 90, 99, 100)], [50, 90, 99, 100])
+        self.assertEqual(rp.percentile([], 50), 0.0)
+        self.assertIsInstance(rp.current, rp.NullProfiler)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from bench.bench_suite import compare_results, run_suite
+from bench.synthetic_corpus import iter_readmes
+
+
+class TestBenchSuite(unittest.TestCase):
+
+    def test_corpus_riproducibili(self):
+        """Stesso seme, stessi README; i parametri cambiano densità dei titoli, link e codice"""
+        self.assertEqual(list(iter_readmes(20, seed=4)), list(iter_readmes(20, seed=4)))
+        self.assertNotEqual(list(iter_readmes(20, seed=4)), list(iter_readmes(20, seed=5)))
+
+        def count(texts, pattern):
+            return sum(md_text.count(pattern) for md_text in texts)
+
+        base = list(iter_readmes(50, max_sections=20))
+        self.assertGreater(count(iter_readmes(50, max_sections=20, code_ratio=1.0), "```bash"),
+                           count(base, "```bash"))
+        self.assertGreater(count(iter_readmes(50, max_sections=20, links_per_section=5), "]("), count(base, "]("))
+        dense = list(iter_readmes(50, max_sections=20, max_lines=0))
+        self.assertLess(sum(map(len, dense)) / count(dense, "\n#"), sum(map(len, base)) / count(base, "\n#"))
+
+    def test_confronto_con_la_baseline(self):
+        """Le misure più lente della soglia sono regressioni; i corpus di dimensione diversa non si confrontano"""
+        baseline = {"results": {"mixed": {"files": 4, "clean_text": {"min_seconds": 1.0},
+                                          "categorize_title": {"min_seconds": 1.0}},
+                                "large_files": {"files": 2, "clean_text": {"min_seconds": 1.0}}}}
+        current = {"results": {"mixed": {"files": 4, "clean_text": {"min_seconds": 1.1},
+                                         "categorize_title": {"min_seconds": 1.3}},
+                               "large_files": {"files": 3, "clean_text": {"min_seconds": 9.0}}}}
+        self.assertEqual(compare_results(current, baseline, 0.15),
+                         [("mixed", "clean_text", 1.0, 1.1, 1.1, False),
+                          ("mixed", "categorize_title", 1.0, 1.3, 1.3, True)])
+
+    def test_esecuzione_ridotta(self):
+        """La suite su un corpus piccolo produce una misura per benchmark scelto"""
+        categories = {"install": {"keywords": ["Install"]}, "license": {"keywords": ["License"]}}
+        results = run_suite(["mixed"], ["find_titles_md", "categorize_title", "csv_writers"], categories,
+                            repeat=1, scale=0.01, log=lambda message: None)
+        mixed = results["results"]["mixed"]
+        self.assertEqual(mixed["files"], 4)
+        self.assertEqual([name for name in mixed if name not in ("files", "bytes")],
+                         ["find_titles_md", "categorize_title", "csv_writers"])
+        self.assertEqual(mixed["find_titles_md"]["items"], 4)
+        self.assertGreater(mixed["csv_writers"]["per_second"], 0)
+        self.assertEqual(results["meta"]["scale"], 0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import utils.in_out_csv as ioc
+import utils.parse_markdown_column as pmc
+from utils.md_index import MdIndex
+
+
+class ChildHandler(BaseHTTPRequestHandler):
+    """Server locale con un file Markdown linkato da un README."""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"# Usage\nrun it\n"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestMdIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.md_dir = os.path.join(self.test_dir, "readmes")
+        os.makedirs(self.md_dir)
+        self.index_path = os.path.join(self.test_dir, "md_index.json")
+        for name in ["b_readme.md", "1.md", "a_readme.md", "notes.txt"]:
+            self.write(name, f"# Install\n{name}\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def write(self, name, md_text):
+        with open(os.path.join(self.md_dir, name), "w", encoding="utf-8") as f:
+            f.write(md_text)
+
+    def snapshot(self):
+        return {entry.name: entry.stat().st_mtime_ns for entry in os.scandir(self.md_dir)}
+
+    def test_id_come_la_rinomina(self):
+        """I file N.md tengono l'ID N, gli altri prendono il primo ID libero in ordine di nome"""
+        before = self.snapshot()
+        index = MdIndex.load(self.index_path, self.md_dir)
+        self.assertEqual(index.update(), [(0, "a_readme.md"), (1, "1.md"), (2, "b_readme.md")])
+        index.save()
+        self.assertEqual(self.snapshot(), before)
+        self.assertFalse(os.path.exists(os.path.join(self.md_dir, "md_index.json")))
+
+    def test_id_stabili(self):
+        """Fra un'esecuzione e l'altra gli ID non cambiano, anche se un file sparisce e ricompare"""
+        index = MdIndex.load(self.index_path, self.md_dir)
+        index.update()
+        index.save()
+        os.remove(os.path.join(self.md_dir, "a_readme.md"))
+        self.write("0_new.md", "# New\n")
+
+        index = MdIndex.load(self.index_path, self.md_dir)
+        self.assertEqual(index.update(), [(1, "1.md"), (2, "b_readme.md"), (3, "0_new.md")])
+        self.assertEqual((index.stats["added"], index.stats["missing"]), (1, 1))
+        index.save()
+        self.write("a_readme.md", "# Back\n")
+        self.assertEqual(MdIndex.load(self.index_path, self.md_dir).update()[0], (0, "a_readme.md"))
+
+        other = os.path.join(self.test_dir, "other")
+        os.makedirs(other)
+        index = MdIndex.load(self.index_path, other)
+        self.assertEqual((index.update(), index.stats["invalidated"]), ([], 4))
+
+    def test_analisi_sul_posto(self):
+        """I README sono letti con il loro nome, i CSV usano gli ID e i figli finiscono in un'altra cartella"""
+        server = ThreadingHTTPServer(("127.0.0.1", 0), ChildHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            host, port = server.server_address
+            self.write("b_readme.md", f"# Install\nsee [usage](http://{host}:{port}/USAGE.md)\n")
+            before = self.snapshot()
+            entries = MdIndex.load(self.index_path, self.md_dir).update()
+            linked_dir = os.path.join(self.test_dir, "linked")
+            groups = pmc.iter_indexed_groups(entries, self.md_dir, {"install": {"keywords": ["Install"]}},
+                                             download_dir=linked_dir)
+            csv_out, csv_url = os.path.join(self.test_dir, "tab.csv"), os.path.join(self.test_dir, "url.csv")
+            self.assertEqual(ioc.get_csv_tabs(groups, csv_out, csv_url, with_link=False), 3)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        with open(csv_out, encoding="utf-8") as f:
+            names = [line.split(",")[0] for line in f.read().splitlines()[1:]]
+        self.assertEqual(names, ["0.md", "1.md", "2.md", "2_USAGE.md"])
+        self.assertEqual(os.listdir(linked_dir), ["2_USAGE.md"])
+        self.assertEqual(self.snapshot(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
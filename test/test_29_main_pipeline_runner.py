@@ -0,0 +1,148 @@
+import unittest
+import contextlib
+import csv
+import importlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Cartella del progetto: i test cambiano la cartella corrente, config.py usa percorsi relativi
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+class TestPipelineRunner(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Progetto minimo con le cartelle controllate da config.py
+        cls.cwd = os.getcwd()
+        cls.test_dir = tempfile.mkdtemp()
+        for folder in ("in", "md_file", "out", "tables", "urls"):
+            os.makedirs(os.path.join(cls.test_dir, folder))
+        shutil.copy(os.path.join(ROOT, "in", "mini_apps.csv"), os.path.join(cls.test_dir, "in"))
+        shutil.copy(os.path.join(ROOT, "in", "tipologia.json"), os.path.join(cls.test_dir, "in"))
+        texts = {"a_readme.md": "# Install\nrun it\n## Usage\nsee [docs](http://a)\n",
+                 "1.md": "# License\nMIT\n",
+                 "b_readme.md": "No titles"}
+        for name, md_text in texts.items():
+            with open(os.path.join(cls.test_dir, "md_file", name), "w", encoding="utf-8") as f:
+                f.write(md_text)
+        os.chdir(cls.test_dir)
+        with contextlib.redirect_stdout(io.StringIO()):
+            cls.main = importlib.import_module("main")
+        cls.process_args = ["--max_depth", "0", "--no_parse_cache", "--no_title_memo"]
+
+    @classmethod
+    def tearDownClass(cls):
+        os.chdir(cls.cwd)
+        shutil.rmtree(cls.test_dir, ignore_errors=True)
+
+    def run_steps(self, runner, steps):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            runner.run_steps(steps)
+        return output.getvalue()
+
+    def read_csv(self, path):
+        with open(path, newline="", encoding="utf-8") as f:
+            return list(csv.reader(f))
+
+    def test_build_incrementale(self):
+        """I passi con input invariati vengono saltati; una modifica riesegue solo i passi che ne dipendono"""
+        state = self.main.bs.BuildState.load(os.path.join(self.test_dir, "build_state.json"))
+
+        def run(*steps, force=False):
+            runner = self.main.PipelineRunner(process_args=self.process_args, show_graphs=False,
+                                              build_state=state, force=force)
+            with contextlib.redirect_stdout(io.StringIO()):
+                return runner.run_steps(steps)
+
+        steps = ("process", "summary", "score")
+        self.assertEqual(run(*steps), list(steps))
+        self.assertEqual(run(*steps), [])
+        self.assertEqual(self.main.bs.BuildState.load(state.path).stages.keys(), set(steps))
+
+        # Stesso contenuto riscritto: hash ricalcolato, nessun passo rieseguito
+        readme = os.path.join("md_file", "1.md")
+        with open(readme, encoding="utf-8") as f:
+            md_text = f.read()
+        with open(readme, "w", encoding="utf-8") as f:
+            f.write(md_text)
+        os.utime(readme, ns=(0, 0))
+        self.assertEqual(run(*steps), [])
+        self.assertGreater(state.stats["hashed"], 0)
+
+        with open(readme, "a", encoding="utf-8") as f:
+            f.write("More license text\n")
+        self.assertEqual(run(*steps), list(steps))
+
+        os.remove(self.main.config.TABLES_FILE_SCORES)
+        self.assertEqual(run(*steps), ["score"])
+        self.assertEqual(run("summary", "score", force=True), ["summary", "score"])
+
+    def test_impronte_dagli_argomenti(self):
+        """Le impronte seguono gli argomenti usati: codice importato, --csv_out e file figli scaricati"""
+        code = [os.path.relpath(path, ROOT) for path in self.main.stage_code("process.py")]
+        for module in ("process.py", "config.py", "utils/parse_markdown_column.py", "utils/line_scanner.py",
+                       "utils/parse_cache.py", "utils/fetch_scheduler.py", "utils/md_reader.py"):
+            self.assertIn(module.replace("/", os.sep), code)
+        self.assertNotIn(os.path.join("utils", "download_from_url.py"), code)
+
+        runner = self.main.PipelineRunner(process_args=["--csv_out", "out/other_sections.csv"], show_graphs=False)
+        self.assertEqual(runner.stage_inputs("summary")[0]["files"], ["out/other_sections.csv"])
+        self.assertEqual(runner.stage_inputs("graphs")[0]["files"][0], "out/other_sections.csv")
+
+        state = self.main.bs.BuildState(os.path.join(self.test_dir, "fingerprints.json"))
+        runner = self.main.PipelineRunner(process_args=self.process_args, show_graphs=False)
+        inputs = runner.stage_inputs("process")[0]
+        before = state.fingerprint(**inputs)
+        linked_md = os.path.join(runner.process_options().linked_md_path, "0_child.md")
+        os.makedirs(os.path.dirname(linked_md), exist_ok=True)
+        with open(linked_md, "w", encoding="utf-8") as f:
+            f.write("# Usage\n")
+        try:
+            self.assertNotEqual(state.fingerprint(**inputs), before)
+        finally:
+            os.remove(linked_md)
+
+    def test_tabelle_in_memoria(self):
+        """process, summary e score nello stesso processo, nell'ordine della pipeline, senza rileggere i CSV"""
+        runner = self.main.PipelineRunner(process_args=self.process_args, show_graphs=False)
+        output = self.run_steps(runner, ["score", "summary", "process"])
+        self.assertLess(output.index(".. Passo process .."), output.index(".. Passo summary .."))
+        self.assertLess(output.index(".. Passo summary .."), output.index(".. Passo score .."))
+
+        sections = self.read_csv("out/output_section.csv")
+        self.assertEqual([[row["File_name"], row["Titles"], row["Category"]] for row in runner.sections],
+                         [[row[0], row[1], row[3] or None] for row in sections[1:]])
+        self.assertEqual([row["File_name"] for row in runner.summary_rows], ["0.md", "1.md"])
+        self.assertEqual(output.count("File: "), 2)
+        summary_from_memory = self.read_csv("tables/readme_summary.csv")
+
+        # Senza tabelle in memoria summary rilegge il CSV delle sezioni: stesso riepilogo
+        output = self.run_steps(self.main.PipelineRunner(show_graphs=False), ["summary", "score"])
+        self.assertIn(".. Tabella delle sezioni letta da", output)
+        self.assertEqual(self.read_csv("tables/readme_summary.csv"), summary_from_memory)
+        self.assertEqual(output.count("File: "), 2)
+
+    def test_menu(self):
+        """Esci resta sul 5 come prima di score, che è la voce 6"""
+        runner = self.main.PipelineRunner(show_graphs=False)
+        with patch("builtins.input", side_effect=["5"]):
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                self.main.menu(runner)
+        lines = output.getvalue().splitlines()
+        self.assertIn("5 - Esci", lines)
+        self.assertLess(lines.index("5 - Esci"), lines.index("6 - " + self.main.MENU["6"][1]))
+        self.assertEqual(self.main.MENU["6"][0], "score")
+        self.assertIn("Uscita dal programma...", lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import os
+import shutil
+import tempfile
+from utils.build_state import BuildState
+
+
+class TestBuildState(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.md_dir = os.path.join(self.test_dir, "md")
+        os.makedirs(self.md_dir)
+        for name in ["0.md", "1.md", "notes.txt"]:
+            self.write(os.path.join(self.md_dir, name), f"# {name}\n")
+        self.json = os.path.join(self.test_dir, "tipologia.json")
+        self.write(self.json, '{"install": {"keywords": ["Install"]}}')
+        self.state = BuildState.load(os.path.join(self.test_dir, "build_state.json"))
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def write(self, path, text):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def fingerprint(self, **params):
+        return self.state.fingerprint([self.json], [self.md_dir], params=params)
+
+    def test_impronta_degli_input(self):
+        """L'impronta cambia con i README, i file di input e i parametri, non con gli altri file"""
+        base = self.fingerprint(engine="scanner")
+        self.assertEqual(self.fingerprint(engine="scanner"), base)
+        self.assertNotEqual(self.fingerprint(engine="markdown-it"), base)
+
+        self.write(os.path.join(self.md_dir, "notes.txt"), "changed")
+        self.assertEqual(self.fingerprint(engine="scanner"), base)
+        self.write(os.path.join(self.md_dir, "2.md"), "# New\n")
+        self.assertNotEqual(self.fingerprint(engine="scanner"), base)
+        os.remove(os.path.join(self.md_dir, "2.md"))
+        self.assertEqual(self.fingerprint(engine="scanner"), base)
+
+        self.write(self.json, '{"license": {"keywords": ["License"]}}')
+        self.assertNotEqual(self.fingerprint(engine="scanner"), base)
+
+    def test_hash_riusati(self):
+        """Con dimensione e data di modifica invariate il file non viene riletto"""
+        self.fingerprint()
+        self.assertEqual(self.state.stats["hashed"], 3)
+        self.state.save()
+
+        state = BuildState.load(self.state.path)
+        state.fingerprint([self.json], [self.md_dir])
+        self.assertEqual((state.stats["hashed"], state.stats["reused"]), (0, 3))
+        os.utime(self.json, ns=(0, 0))
+        state.fingerprint([self.json], [self.md_dir])
+        self.assertEqual(state.stats["hashed"], 1)
+
+    def test_passo_aggiornato(self):
+        """Un passo è aggiornato con la stessa impronta e gli output invariati"""
+        output = os.path.join(self.test_dir, "out.csv")
+        self.write(output, "a,b\n")
+        fingerprint = self.fingerprint()
+        self.assertFalse(self.state.is_fresh("process", fingerprint))
+        self.state.record("process", fingerprint, [output])
+        self.assertTrue(self.state.is_fresh("process", fingerprint))
+        self.assertFalse(self.state.is_fresh("process", self.fingerprint(engine="scanner")))
+
+        self.write(output, "a,b\n1,2\n")
+        self.assertFalse(self.state.is_fresh("process", fingerprint))
+        os.remove(output)
+        self.assertFalse(self.state.is_fresh("process", fingerprint))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utils.download_from_url import download_md_files
+
+
+class ReadmeHandler(BaseHTTPRequestHandler):
+    """Server locale: /okN restituisce il README N, tutto il resto 404."""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path.startswith("/ok"):
+            body = f"# README {self.path[3:]}\n".encode("utf-8")
+            self.send_response(200)
+        else:
+            body = b"404: Not Found"
+            self.send_response(404)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestDownloadMdFiles(unittest.TestCase):
+
+    def setUp(self):
+        """Avvia il server HTTP locale e crea una cartella temporanea"""
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), ReadmeHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host, port = self.server.server_address
+        self.base_url = f"http://{host}:{port}"
+        self.test_dir = tempfile.mkdtemp() + os.sep
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_nomi_legati_alla_riga(self):
+        """Ogni file prende il nome della sua riga di input, anche se un link fallisce"""
+        link_list = [
+            f"{self.base_url}/ok0",
+            f"{self.base_url}/missing",
+            f"{self.base_url}/ok2",
+            f"{self.base_url}/ok3"
+        ]
+
+        downloaded = download_md_files(link_list, self.test_dir, max_workers=4)
+
+        self.assertEqual(downloaded, [0, 2, 3])
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, "1.md")))
+        for i in downloaded:
+            with open(os.path.join(self.test_dir, f"{i}.md"), encoding="utf-8") as f:
+                self.assertEqual(f.read(), f"# README {i}\n")
+
+    def test_molti_file_con_pochi_worker(self):
+        """Con più link che worker tutti i file vengono comunque scaricati"""
+        link_list = [f"{self.base_url}/ok{i}" for i in range(20)]
+        downloaded = download_md_files(link_list, self.test_dir, max_workers=3)
+        self.assertEqual(downloaded, list(range(20)))
+
+    def test_empty_link_list(self):
+        """Con una lista vuota non viene scaricato nulla"""
+        self.assertEqual(download_md_files([], self.test_dir), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
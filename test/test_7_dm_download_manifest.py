@@ -0,0 +1,124 @@
+import unittest
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import utils.download_manifest as dm
+from utils.download_from_url import download_md_files
+
+
+class EtagHandler(BaseHTTPRequestHandler):
+    """Server locale con ETag: risponde 304 se il contenuto non è cambiato."""
+    protocol_version = "HTTP/1.1"
+    files = {}    # path -> contenuto
+    requests = []  # path -> esito, per ogni richiesta ricevuta
+
+    def do_GET(self):
+        content = self.files.get(self.path)
+        if content is None:
+            self.requests.append((self.path, 404))
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        etag = '"' + hashlib.md5(content).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.requests.append((self.path, 304))
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.requests.append((self.path, 200))
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestDownloadManifest(unittest.TestCase):
+
+    def setUp(self):
+        """Avvia il server HTTP locale e crea una cartella temporanea"""
+        EtagHandler.files = {"/a": b"# A\n", "/b": b"# B\n", "/c": b"# C\n"}
+        EtagHandler.requests = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), EtagHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host, port = self.server.server_address
+        self.links = [f"http://{host}:{port}{path}" for path in ("/a", "/b", "/c")]
+        self.test_dir = tempfile.mkdtemp() + os.sep
+        self.manifest_path = os.path.join(self.test_dir, dm.MANIFEST_FILE_NAME)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def download(self, links):
+        manifest = dm.DownloadManifest.load(self.manifest_path)
+        downloaded = download_md_files(links, self.test_dir, max_workers=2, manifest=manifest)
+        return downloaded, manifest
+
+    def test_primo_download(self):
+        """Al primo avvio tutti i file risultano aggiunti e registrati nel manifest"""
+        downloaded, manifest = self.download(self.links)
+
+        self.assertEqual(downloaded, [0, 1, 2])
+        self.assertEqual(manifest.stats[dm.ADDED], 3)
+        saved = dm.DownloadManifest.load(self.manifest_path)
+        self.assertEqual(saved.entries["1.md"]["url"], self.links[1])
+        self.assertEqual(saved.entries["1.md"]["sha256"], hashlib.sha256(b"# B\n").hexdigest())
+        self.assertTrue(saved.entries["1.md"]["etag"])
+
+    def test_richieste_condizionali(self):
+        """Un file invariato riceve un 304 e non viene riscritto"""
+        self.download(self.links)
+        path_a = os.path.join(self.test_dir, "0.md")
+        os.utime(path_a, (0, 0))
+        EtagHandler.files["/b"] = b"# B modificato\n"
+        EtagHandler.requests = []
+
+        downloaded, manifest = self.download(self.links)
+
+        self.assertEqual(downloaded, [0, 1, 2])
+        self.assertEqual(manifest.stats[dm.UNCHANGED], 2)
+        self.assertEqual(manifest.stats[dm.UPDATED], 1)
+        self.assertEqual(sorted(EtagHandler.requests), [("/a", 304), ("/b", 200), ("/c", 304)])
+        self.assertEqual(os.path.getmtime(path_a), 0)
+        with open(os.path.join(self.test_dir, "1.md"), "rb") as f:
+            self.assertEqual(f.read(), b"# B modificato\n")
+
+    def test_file_rimossi(self):
+        """Righe sparite dall'input o 404 sul server vengono rimosse"""
+        self.download(self.links)
+        del EtagHandler.files["/a"]
+
+        downloaded, manifest = self.download(self.links[:2])
+
+        self.assertEqual(downloaded, [1])
+        self.assertEqual(manifest.stats[dm.GONE], 2)
+        self.assertEqual(sorted(manifest.entries), ["1.md"])
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, "0.md")))
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, "2.md")))
+
+    def test_file_non_tracciati_rimossi(self):
+        """I file .md non presenti nel manifest (es. figli scaricati) vengono ripuliti"""
+        self.download(self.links)
+        stray = os.path.join(self.test_dir, "0_CONTRIBUTING.md")
+        with open(stray, "w", encoding="utf-8") as f:
+            f.write("# Contributing\n")
+
+        self.download(self.links)
+
+        self.assertFalse(os.path.exists(stray))
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, "0.md")))
+
+
+if __name__ == "__main__":
+    unittest.main()
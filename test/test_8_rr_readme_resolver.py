@@ -0,0 +1,96 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import utils.readme_resolver as rr
+from utils.download_from_url import download_md_files
+
+
+class RawHandler(BaseHTTPRequestHandler):
+    """Server locale che simula raw.githubusercontent.com."""
+    protocol_version = "HTTP/1.1"
+    files = {
+        "/a/one/master/README.md": b"# One\n",
+        "/b/two/main/README.md": b"# Two\n",
+        "/c/three/main/readme.md": b"# Three\n"
+    }
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        content = self.files.get(self.path)
+        self.send_response(200 if content is not None else 404)
+        content = content or b""
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestReadmeResolver(unittest.TestCase):
+
+    def setUp(self):
+        """Avvia il server HTTP locale e crea una cartella temporanea"""
+        RawHandler.requests = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), RawHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host, port = self.server.server_address
+        self.base = f"http://{host}:{port}"
+        self.links = [f"{self.base}/{repo}/master/README.md" for repo in ("a/one", "b/two", "c/three", "d/none")]
+        self.test_dir = tempfile.mkdtemp() + os.sep
+        self.cache_path = os.path.join(self.test_dir, rr.RESOLVER_FILE_NAME)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_candidate_urls(self):
+        """Le combinazioni più comuni vengono provate per prime"""
+        urls = rr.candidate_urls("http://raw.githubusercontent.com/a/b/master/README.md")
+        self.assertEqual(urls[:3], [
+            "http://raw.githubusercontent.com/a/b/master/README.md",
+            "http://raw.githubusercontent.com/a/b/main/README.md",
+            "http://raw.githubusercontent.com/a/b/HEAD/README.md"
+        ])
+        self.assertIn("http://raw.githubusercontent.com/a/b/main/README.rst", urls)
+
+    def test_risoluzione_branch_e_nome(self):
+        """README su main o con nome minuscolo vengono trovati"""
+        resolver = rr.ReadmeResolver.load(self.cache_path)
+        downloaded = download_md_files(self.links, self.test_dir, max_workers=2, resolver=resolver)
+
+        self.assertEqual(downloaded, [0, 1, 2])
+        self.assertEqual(resolver.resolve(self.links[1]), f"{self.base}/b/two/main/README.md")
+        self.assertEqual(resolver.resolve(self.links[2]), f"{self.base}/c/three/main/readme.md")
+        self.assertEqual(resolver.resolve(self.links[3]), self.links[3])
+        with open(os.path.join(self.test_dir, "2.md"), "rb") as f:
+            self.assertEqual(f.read(), b"# Three\n")
+
+    def test_cache_persistente(self):
+        """Alla seconda esecuzione si va direttamente all'URL giusto"""
+        resolver = rr.ReadmeResolver.load(self.cache_path)
+        download_md_files(self.links, self.test_dir, max_workers=2, resolver=resolver)
+        RawHandler.requests = []
+
+        resolver = rr.ReadmeResolver.load(self.cache_path)
+        downloaded = download_md_files(self.links, self.test_dir, max_workers=2, resolver=resolver)
+
+        self.assertEqual(downloaded, [0, 1, 2])
+        self.assertEqual(sorted(RawHandler.requests), [
+            "/a/one/master/README.md", "/b/two/main/README.md", "/c/three/main/readme.md"
+        ])
+
+    def test_cache_negativa_scaduta(self):
+        """Un 404 scaduto viene verificato di nuovo"""
+        resolver = rr.ReadmeResolver(self.cache_path, negative_ttl=0)
+        resolver.record_miss(self.links[3], self.links[3])
+        self.assertIn(self.links[3], resolver.candidates(self.links[3]))
+
+
+if __name__ == "__main__":
+    unittest.main()
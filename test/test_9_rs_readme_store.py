@@ -0,0 +1,116 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+import utils.parse_markdown_column as pmc
+from utils.readme_store import ReadmeStore, content_hash
+from utils.download_from_url import download_md_files, normalize_repo_url, group_rows_by_link
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    """Server locale che conta le richieste ricevute per ciascun path."""
+    protocol_version = "HTTP/1.1"
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        content = b"# Same\nidentical readme\n"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestReadmeStore(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp() + os.sep
+        self.store = ReadmeStore(os.path.join(self.test_dir, "blobs"))
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_put_e_link(self):
+        """Contenuti identici producono un solo blob condiviso dalle righe"""
+        digest = self.store.put(b"# A\n")
+        self.assertEqual(self.store.put(b"# A\n"), digest)
+        self.assertEqual(digest, content_hash(b"# A\n"))
+
+        for row in (0, 1):
+            self.store.link(digest, os.path.join(self.test_dir, f"{row}.md"))
+        self.assertTrue(os.path.samefile(os.path.join(self.test_dir, "0.md"), self.store.blob_path(digest)))
+        with open(os.path.join(self.test_dir, "1.md"), "rb") as f:
+            self.assertEqual(f.read(), b"# A\n")
+
+    def test_prune(self):
+        """Vengono eliminati solo i blob non referenziati"""
+        keep = self.store.put(b"# A\n")
+        drop = self.store.put(b"# B\n")
+        self.assertEqual(self.store.prune({keep}), 1)
+        self.assertTrue(self.store.has(keep))
+        self.assertFalse(self.store.has(drop))
+
+
+class TestDeduplicazione(unittest.TestCase):
+
+    def setUp(self):
+        CountingHandler.requests = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), CountingHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host, port = self.server.server_address
+        self.base = f"http://{host}:{port}"
+        self.test_dir = tempfile.mkdtemp() + os.sep
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_normalize_repo_url(self):
+        self.assertEqual(normalize_repo_url(" http://www.GitHub.com/adamlui/js-utils.git/ "),
+                         "https://github.com/adamlui/js-utils")
+        self.assertEqual(normalize_repo_url("https://github.com/adamlui/js-utils"),
+                         "https://github.com/adamlui/js-utils")
+
+    def test_group_rows_by_link(self):
+        links = ["http://x/A/b/master/README.md", "http://x/c/d/master/README.md", "http://x/a/B/master/README.md"]
+        self.assertEqual(group_rows_by_link(links), [[0, 2], [1]])
+
+    def test_download_una_volta_per_repository(self):
+        """Le righe duplicate vengono scaricate una volta e puntano allo stesso blob"""
+        links = [f"{self.base}/a/b/master/README.md", f"{self.base}/c/d/master/README.md",
+                 f"{self.base}/a/b/master/README.md"]
+
+        downloaded = download_md_files(links, self.test_dir, max_workers=3)
+
+        self.assertEqual(downloaded, [0, 1, 2])
+        self.assertEqual(sorted(CountingHandler.requests), ["/a/b/master/README.md", "/c/d/master/README.md"])
+        # Anche repository diversi con lo stesso contenuto condividono il blob
+        paths = [os.path.join(self.test_dir, f"{i}.md") for i in downloaded]
+        self.assertTrue(os.path.samefile(paths[0], paths[1]))
+        self.assertTrue(os.path.samefile(paths[0], paths[2]))
+
+    def test_analisi_una_volta_per_contenuto(self):
+        """README identici vengono analizzati una sola volta ma riportati su ogni riga"""
+        for name in ("0.md", "1.md"):
+            with open(os.path.join(self.test_dir, name), "w", encoding="utf-8") as f:
+                f.write("# Installation\nabc\n")
+        categories = {"install": {"keywords": ["Install"]}}
+
+        with patch.object(pmc, "analyze_md_text", wraps=pmc.analyze_md_text) as analyze:
+            result = pmc.get_data_table2(2, self.test_dir, categories)
+
+        self.assertEqual(analyze.call_count, 1)
+        self.assertEqual(result[0]["h1_titles"], ["Installation"])
+        self.assertEqual(result[1]["h1_titles"], ["Installation"])
+        self.assertEqual(result[1]["category"], ["install"])
+
+
+if __name__ == "__main__":
+    unittest.main()
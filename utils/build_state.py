@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+from collections import Counter
+
+# Blocchi letti per calcolare l'hash di un file
+HASH_CHUNK_SIZE = 1 << 20
+
+
+class BuildState:
+    """
+    Stato persistente della build incrementale dei passi della pipeline (come make).
+
+    L'impronta di un passo è l'hash dei suoi input: file (es. tipologia.json e
+    i CSV dei passi precedenti), cartelle di README, codice del passo e
+    parametri. Se l'impronta è quella dell'ultima esecuzione e gli output
+    esistono ancora invariati, il passo può essere saltato. Gli hash dei file
+    sono riusati finché dimensione e data di modifica non cambiano, così
+    un corpus invariato costa una stat per file invece di una rilettura.
+    """
+
+    def __init__(self, path, stages=None, files=None):
+        """
+        Parametri:
+        - path (str): File JSON dello stato.
+        - stages (dict | None): Passo -> {"fingerprint", "outputs"}.
+        - files (dict | None): Percorso -> [dimensione, mtime in ns, hash].
+        """
+        self.path = path
+        self.stages = stages if stages is not None else {}
+        self.files = files if files is not None else {}
+        self.stats = Counter()
+
+    @classmethod
+    def load(cls, path):
+        """
+        Carica lo stato da file JSON (vuoto se il file non esiste).
+
+        Parametri:
+        - path (str): Percorso dello stato.
+
+        Ritorna:
+        - BuildState: Stato caricato.
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return cls(path)
+        return cls(path, data.get("stages", {}), data.get("files", {}))
+
+    def save(self):
+        """
+        Salva lo stato su disco in modo atomico (senza gli hash dei file che non esistono più).
+        """
+        self.files = {path: entry for path, entry in self.files.items() if os.path.isfile(path)}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump({"stages": self.stages, "files": self.files}, file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def file_digest(self, path):
+        """
+        Hash del contenuto di un file, riusato se dimensione e data di modifica non cambiano.
+
+        Parametri:
+        - path (str): Percorso del file.
+
+        Ritorna:
+        - str | None: Hash esadecimale, None se il file non esiste.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = os.path.abspath(path)
+        entry = self.files.get(key)
+        if entry is not None and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            self.stats["reused"] += 1
+            return entry[2]
+        digest = hashlib.sha256()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        self.files[key] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        self.stats["hashed"] += 1
+        return self.files[key][2]
+
+    def directory_digests(self, directory, suffix=".md"):
+        """
+        Hash dei file di una cartella (non ricorsivo) con il suffisso dato.
+
+        Ritorna:
+        - list: Coppie [nome del file, hash] in ordine di nome (vuota se la cartella non esiste).
+        """
+        if not os.path.isdir(directory):
+            return []
+        with os.scandir(directory) as entries:
+            names = sorted(entry.name for entry in entries if entry.name.endswith(suffix) and entry.is_file())
+        return [[name, self.file_digest(os.path.join(directory, name))] for name in names]
+
+    def fingerprint(self, files=(), md_directories=(), code=(), params=None):
+        """
+        Impronta degli input di un passo.
+
+        Parametri:
+        - files (iterable): File di input (un file mancante conta come input diverso).
+        - md_directories (iterable): Cartelle di README (conta ogni file .md).
+        - code (iterable): File sorgente del passo (versione del codice).
+        - params (dict | None): Parametri che cambiano gli output.
+
+        Ritorna:
+        - str: Hash esadecimale dell'impronta.
+        """
+        inputs = {
+            "files": [[path, self.file_digest(path)] for path in files],
+            "md_directories": [[path, self.directory_digests(path)] for path in md_directories],
+            "code": [[os.path.basename(path), self.file_digest(path)] for path in code],
+            "params": params or {},
+        }
+        encoded = json.dumps(inputs, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    def is_fresh(self, stage, fingerprint):
+        """
+        Indica se il passo può essere saltato: stessa impronta e output invariati dall'ultima esecuzione.
+
+        Parametri:
+        - stage (str): Nome del passo.
+        - fingerprint (str): Impronta attuale degli input.
+
+        Ritorna:
+        - bool: True se il passo è aggiornato.
+        """
+        entry = self.stages.get(stage)
+        if entry is None or entry["fingerprint"] != fingerprint:
+            return False
+        return all(self.file_digest(path) == digest for path, digest in entry["outputs"].items())
+
+    def record(self, stage, fingerprint, outputs):
+        """
+        Registra un'esecuzione completata del passo.
+
+        Parametri:
+        - stage (str): Nome del passo.
+        - fingerprint (str): Impronta degli input.
+        - outputs (iterable): File prodotti dal passo.
+        """
+        self.stages[stage] = {"fingerprint": fingerprint,
+                              "outputs": {path: self.file_digest(path) for path in outputs}}
+
+    def summary(self):
+        """
+        Riepilogo degli hash calcolati.
+
+        Ritorna:
+        - str: Testo con file riletti e hash riusati.
+        """
+        return f"{self.stats['hashed']} file riletti, {self.stats['reused']} hash riusati"
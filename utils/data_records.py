@@ -0,0 +1,126 @@
+class Section:
+    """
+    Dati di una sezione (un titolo h1-h4) di un file Markdown.
+
+    Record compatto con __slots__: al posto della lista di tuple
+    (categoria, numero, url) conserva solo la tupla degli URL, perché
+    categoria e numero progressivo del link si ricavano dalla sezione.
+    Iterandolo si ottiene la vecchia tupla di analyze_md_text:
+    (titolo, livello, categoria, caratteri, num_link, link_attivi, immagini, video, codice).
+    """
+
+    __slots__ = ("title", "level", "category", "char_count", "urls", "num_images", "num_videos", "num_code_blocks")
+
+    def __init__(self, title, level, category, char_count, urls=(), num_images=0, num_videos=0, num_code_blocks=0):
+        self.title = title
+        self.level = level
+        self.category = category
+        self.char_count = char_count
+        self.urls = tuple(urls)
+        self.num_images = num_images
+        self.num_videos = num_videos
+        self.num_code_blocks = num_code_blocks
+
+    @property
+    def num_links(self):
+        return len(self.urls)
+
+    def current_links(self):
+        """
+        Link della sezione nel formato originale.
+
+        Ritorna:
+        - list[tuple]: Tuple (categoria, numero progressivo, url).
+        """
+        return [(self.category, number, url) for number, url in enumerate(self.urls, 1)]
+
+    def to_list(self):
+        """
+        Forma compatta serializzabile (JSON), nell'ordine degli slot.
+        """
+        return [self.title, self.level, self.category, self.char_count, list(self.urls),
+                self.num_images, self.num_videos, self.num_code_blocks]
+
+    @classmethod
+    def from_list(cls, values):
+        """
+        Ricostruisce la sezione da to_list().
+        """
+        return cls(*values)
+
+    def __iter__(self):
+        return iter((self.title, self.level, self.category, self.char_count, self.num_links, self.current_links(),
+                     self.num_images, self.num_videos, self.num_code_blocks))
+
+    def __eq__(self, other):
+        if not isinstance(other, Section):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __reduce__(self):
+        return (Section, tuple(getattr(self, name) for name in self.__slots__))
+
+    def __repr__(self):
+        return f"Section({', '.join(repr(getattr(self, name)) for name in self.__slots__)})"
+
+
+# Colonne della vecchia struttura dati a liste parallele, ricavate dalle sezioni
+_COLUMNS = {
+    "h1_titles": lambda section: section.title,
+    "level": lambda section: section.level,
+    "category": lambda section: section.category,
+    "char_counts": lambda section: section.char_count,
+    "num_links": lambda section: section.num_links,
+    "current_links": lambda section: section.current_links(),
+    "num_images": lambda section: section.num_images,
+    "num_videos": lambda section: section.num_videos,
+    "num_code_blocks": lambda section: section.num_code_blocks,
+}
+
+
+class FileRecord:
+    """
+    Dati estratti da un file Markdown: nome, link del repository e sezioni.
+
+    Sostituisce il dizionario con nove liste parallele. Per compatibilità
+    file_data["h1_titles"], file_data["category"], ... restituiscono ancora
+    le colonne (costruite al momento dalle sezioni) e file_data["link"]
+    solleva KeyError se il file non ha un repository. source è il percorso
+    da cui leggere il file quando non coincide con file_name nella cartella
+    dei README (es. file indicizzati con il loro nome originale).
+    """
+
+    __slots__ = ("file_name", "link", "sections", "source")
+
+    def __init__(self, file_name, link=None, sections=None, source=None):
+        self.file_name = file_name
+        self.link = link
+        self.sections = sections if sections is not None else []
+        self.source = source
+
+    def __getitem__(self, key):
+        if key == "file_name":
+            return self.file_name
+        if key == "link":
+            if self.link is None:
+                raise KeyError(key)
+            return self.link
+        column = _COLUMNS[key]
+        return [column(section) for section in self.sections]
+
+    def __contains__(self, key):
+        return key == "file_name" or key in _COLUMNS or (key == "link" and self.link is not None)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __eq__(self, other):
+        if not isinstance(other, FileRecord):
+            return NotImplemented
+        return (self.file_name, self.link, self.sections) == (other.file_name, other.link, other.sections)
+
+    def __repr__(self):
+        return f"FileRecord({self.file_name!r}, {self.link!r}, {len(self.sections)} sezioni)"
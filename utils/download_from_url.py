@@ -1,10 +1,17 @@
 import os  # Per operazioni sul filesystem (cartelle, file)
 import re  # Per espressioni regolari (non usato in questo snippet ma incluso)
-import urllib.request  # Per scaricare contenuti via HTTP
-from urllib.parse import urlparse  # Per analizzare URL (non usato direttamente qui)
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait  # Per i download paralleli
+from urllib.parse import urlparse  # Per analizzare e normalizzare gli URL
 
-import \
-    requests  # Per effettuare richieste HTTP (non usato in queste funzioni ma probabilmente utile in altre parti del progetto)
+import requests  # Per effettuare richieste HTTP con connessioni persistenti (keep-alive)
+from requests.adapters import HTTPAdapter  # Per dimensionare il pool di connessioni per host
+
+import utils.fetch_scheduler as fs  # Rate limit, timeout e retry delle richieste
+import utils.readme_resolver as rr  # Risoluzione di branch e nome del README
+import utils.readme_store as rs  # Archivio dei README indirizzato per contenuto
+
+# Numero predefinito di download contemporanei
+DEFAULT_WORKERS = 8
 
 
 # Funzione per convertire gli URL originali nei corrispondenti URL raw di GitHubusercontent
@@ -32,13 +39,56 @@ def rename_urls(site_list):
     return s_raw
 
 
-def pulisci_cartella(cartella):
+def normalize_repo_url(site):
+    """
+    Normalizza l'URL di un repository, così le righe duplicate coincidono.
+
+    Uniforma schema (https) e host (minuscolo, senza "www."), rimuove query,
+    frammento, "/" finale ed estensione ".git".
+    Esempio: " http://www.GitHub.com/a/b.git/ " -> "https://github.com/a/b"
+
+    Parametri:
+    - site (str): URL del repository come compare nel CSV.
+
+    Ritorna:
+    - str: URL normalizzato.
+    """
+    parsed = urlparse(site.strip())
+    host = parsed.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parsed.path.rstrip('/')
+    if path.endswith('.git'):
+        path = path[:-4]
+    return f"https://{host}{path}"
+
+
+def group_rows_by_link(link_list):
+    """
+    Raggruppa le righe di input che puntano allo stesso README.
+
+    Il confronto ignora le maiuscole, come GitHub per utente e repository.
+
+    Parametri:
+    - link_list (list): Lista di URL, uno per riga di input.
+
+    Ritorna:
+    - list[list[int]]: Gruppi di indici di riga, nell'ordine della prima occorrenza.
+    """
+    groups = {}
+    for i, link in enumerate(link_list):
+        groups.setdefault(link.lower(), []).append(i)
+    return list(groups.values())
+
+
+def pulisci_cartella(cartella, keep=()):
     """
     Elimina solo i file con estensione .md presenti nella cartella,
     senza rimuovere la cartella stessa.
 
     Parametri:
     - cartella (str): Il percorso della cartella da "ripulire".
+    - keep (Collection[str]): Nomi dei file .md da conservare.
 
     Ritorna:
     - None
@@ -47,8 +97,8 @@ def pulisci_cartella(cartella):
         for file in os.listdir(cartella):
             file_path = os.path.join(cartella, file)
             try:
-                # Se è un file Markdown (.md), lo elimina
-                if os.path.isfile(file_path) and file.endswith(".md"):
+                # Se è un file Markdown (.md) non da conservare, lo elimina
+                if os.path.isfile(file_path) and file.endswith(".md") and file not in keep:
                     os.remove(file_path)
             except Exception as e:
                 print(f"Errore nell'eliminazione di {file}: {e}")
@@ -72,13 +122,219 @@ def download_md_file(link_list, path_md_file):
     pulisci_cartella(path_md_file)  # Pulisce la cartella prima di iniziare
 
     i = 0  # Contatore per i file scaricati
+    scheduler = fs.FetchScheduler()  # Timeout e retry per ogni richiesta
 
     for link in link_list:
         try:
             # Scarica il file e lo salva come 0.md, 1.md, 2.md, ecc.
-            urllib.request.urlretrieve(link, path_md_file + str(i) + ".md")
+            response = scheduler.get(link)
+            response.raise_for_status()
+            with open(path_md_file + str(i) + ".md", "wb") as file:
+                file.write(response.content)
             i += 1  # Incrementa il contatore se il download va a buon fine
-        except:
-            # Ignora errori (ad esempio se un URL è non valido o non raggiungibile)
-            pass
+        except (requests.RequestException, OSError) as e:
+            # Salta i link non validi o non raggiungibili, segnalandoli
+            print(f"Errore durante il download di {link}: {e}")
     return i
+
+
+# ── DOWNLOAD CONCORRENTE ──────────────────────────────────────────
+
+def create_session(max_workers=DEFAULT_WORKERS):
+    """
+    Crea una sessione HTTP condivisa fra i thread di download.
+
+    La sessione riusa le connessioni keep-alive verso lo stesso host: il pool
+    per host è dimensionato sul numero di worker, così nessun thread resta
+    in attesa di una connessione libera.
+
+    Parametri:
+    - max_workers (int): Numero di download contemporanei previsti.
+
+    Ritorna:
+    - requests.Session: Sessione pronta all'uso (da chiudere al termine).
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def download_one_md_file(scheduler, rows, link, path_md_file, store, manifest=None, resolver=None):
+    """
+    Scarica una sola volta il README condiviso da un gruppo di righe.
+
+    Il contenuto finisce nell'archivio per contenuto e ogni riga del gruppo
+    ottiene il suo file <riga>.md collegato al blob. Se è presente un
+    manifest la richiesta è condizionale (per la prima riga del gruppo): su
+    un 304 si ricollegano le righe al blob già noto senza riscaricare nulla.
+    Con un resolver vengono provate anche le altre combinazioni di branch e
+    nome del README.
+
+    Parametri:
+    - scheduler (FetchScheduler): Esecutore delle richieste HTTP.
+    - rows (list[int]): Righe di input che puntano a questo README.
+    - link (str): URL del file Markdown.
+    - path_md_file (str): Cartella di destinazione.
+    - store (ReadmeStore): Archivio dei README.
+    - manifest (DownloadManifest | None): Manifest dei download precedenti (sola lettura).
+    - resolver (ReadmeResolver | None): Resolver delle posizioni del README.
+
+    Ritorna:
+    - tuple: (rows, voce del manifest con url e sha256 del contenuto).
+    """
+    file_name = f"{rows[0]}.md"
+    previous = manifest.entries.get(file_name) if manifest else None
+
+    def headers_for(url):
+        if previous is None:
+            return {}
+        # Un 304 è utilizzabile solo se il blob registrato è ancora in archivio
+        return manifest.conditional_headers(file_name, url, store.blob_path(previous["sha256"]))
+
+    if resolver is not None:
+        link, response = resolver.fetch(scheduler, link, headers_for)
+    else:
+        response = scheduler.get(link, headers=headers_for(link))
+
+    if response.status_code == 304:
+        entry = dict(previous)
+    else:
+        response.raise_for_status()
+        digest = store.put(response.content)
+        if manifest is not None:
+            entry = manifest.make_entry(link, response.headers, digest, None)
+        else:
+            entry = {"url": link, "sha256": digest}
+
+    for row in rows:
+        store.link(entry["sha256"], os.path.join(path_md_file, f"{row}.md"))
+    return rows, entry
+
+
+def download_md_files(link_list, path_md_file, max_workers=DEFAULT_WORKERS, manifest=None, resolver=None,
+                      scheduler=None, on_done=None, hold=None):
+    """
+    Scarica in parallelo i file README.md dai link forniti.
+
+    A differenza di download_md_file, ogni file prende il nome dalla riga di
+    input a cui appartiene (link_list[i] -> i.md), indipendentemente
+    dall'ordine in cui i download terminano: un link fallito lascia un "buco"
+    nella numerazione invece di spostare i file successivi.
+
+    Le righe che puntano allo stesso repository vengono scaricate una volta
+    sola; i contenuti sono salvati nell'archivio <path_md_file>/blobs e i
+    file delle righe sono collegati al rispettivo blob.
+
+    Senza manifest la cartella viene svuotata e tutto viene riscaricato. Con
+    un manifest l'aggiornamento è incrementale: restano i file già noti, si
+    scaricano solo quelli cambiati e vengono rimossi i file delle righe
+    sparite dall'input o non più presenti sul server (404/410). Un errore
+    temporaneo lascia al suo posto la copia locale precedente.
+
+    Con un resolver ogni link viene cercato anche su altri branch e con altri
+    nomi di file; la cache del resolver viene salvata al termine.
+
+    Le richieste passano dallo scheduler (rate limit per host, timeout e
+    retry con backoff); ogni riga non scaricata finisce nel suo report dei
+    fallimenti (scheduler.failure_report()).
+
+    Con on_done i risultati vengono consegnati appena pronti, per analizzarli
+    mentre gli altri download sono in corso. In volo ci sono al massimo
+    2 * max_workers download: se on_done si blocca (es. coda piena) smette
+    anche l'invio di nuovi download, così la memoria resta costante.
+
+    Parametri:
+    - link_list (list): Lista di URL dei file Markdown da scaricare.
+    - path_md_file (str): Percorso della cartella in cui salvare i file Markdown.
+    - max_workers (int): Numero massimo di download contemporanei.
+    - manifest (DownloadManifest | None): Manifest da usare e aggiornare.
+    - resolver (ReadmeResolver | None): Resolver delle posizioni del README.
+    - scheduler (FetchScheduler | None): Scheduler delle richieste; se assente
+      ne viene creato uno con i parametri predefiniti.
+    - on_done (callable | None): Chiamata come on_done(righe, righe_disponibili)
+      per ogni gruppo di righe completato, anche se fallito.
+    - hold (callable | None): Finché restituisce True non partono nuovi download
+      (quelli in volo continuano a essere consegnati); se non ne resta nessuno
+      in volo, il successivo parte comunque, così il download non si blocca mai.
+
+    Ritorna:
+    - list[int]: Indici (ordinati) delle righe il cui file è disponibile.
+    """
+    # Pulisce la cartella prima di iniziare, conservando i file già tracciati
+    pulisci_cartella(path_md_file, keep=manifest.entries if manifest else ())
+    store = rs.ReadmeStore(os.path.join(path_md_file, rs.STORE_DIR_NAME))
+
+    own_session = None
+    if scheduler is None:
+        own_session = create_session(max_workers)
+        scheduler = fs.FetchScheduler(own_session)
+
+    downloaded = []
+    digests = set()
+    groups = iter(group_rows_by_link(link_list))
+    pending = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+        def submit_next():
+            rows = next(groups, None)
+            if rows is not None:
+                future = executor.submit(download_one_md_file, scheduler, rows, link_list[rows[0]], path_md_file,
+                                         store, manifest, resolver)
+                pending[future] = rows
+
+        for _ in range(2 * max_workers):
+            submit_next()
+
+        postponed = 0  # Download da inviare appena hold lo consente
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                rows = pending.pop(future)
+                available = rows
+                try:
+                    rows, entry = future.result()
+                except (requests.RequestException, OSError) as e:
+                    print(f"Errore durante il download di {link_list[rows[0]]}: {e}")
+                    scheduler.record_failure(link_list[rows[0]], e)
+                    available = []
+                    if manifest is not None:
+                        response = getattr(e, "response", None)
+                        not_found = isinstance(e, rr.ReadmeNotFoundError) or (
+                            response is not None and response.status_code in (404, 410))
+                        for row in rows:
+                            if not_found:
+                                manifest.remove(f"{row}.md")
+                            elif f"{row}.md" in manifest.entries:
+                                available.append(row)  # Resta valida la copia precedente
+                else:
+                    digests.add(entry["sha256"])
+                    if manifest is not None:
+                        for row in rows:
+                            row_entry = dict(entry, path=os.path.join(path_md_file, f"{row}.md"))
+                            manifest.record(f"{row}.md", manifest.classify(f"{row}.md", row_entry), row_entry)
+
+                downloaded.extend(available)
+                if on_done is not None:
+                    on_done(rows, available)
+                postponed += 1
+            while postponed and (not pending or hold is None or not hold()):
+                submit_next()
+                postponed -= 1
+
+    if manifest is not None:
+        # Righe non più presenti nel file di input
+        current = {f"{i}.md" for i in range(len(link_list))}
+        for file_name in [name for name in manifest.entries if name not in current]:
+            manifest.remove(file_name)
+        manifest.save()
+        digests = {entry["sha256"] for entry in manifest.entries.values()}
+    if resolver is not None:
+        resolver.save()
+    if own_session is not None:
+        own_session.close()
+
+    # Elimina i blob a cui non punta più nessuna riga
+    store.prune(digests)
+    return sorted(downloaded)
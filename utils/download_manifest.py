@@ -0,0 +1,154 @@
+import json
+import os
+from collections import Counter
+
+# Esiti possibili per ciascun file rispetto al download precedente
+UNCHANGED = "unchanged"
+UPDATED = "updated"
+ADDED = "added"
+GONE = "gone"
+
+# Nome predefinito del manifest, salvato nella cartella dei file Markdown
+MANIFEST_FILE_NAME = "download_manifest.json"
+
+
+class DownloadManifest:
+    """
+    Manifest persistente dei README scaricati.
+
+    Per ogni file locale (chiave: nome del file, es. "3.md") registra URL,
+    ETag, Last-Modified, hash del contenuto (cioè il blob dell'archivio
+    ReadmeStore a cui punta la riga) e percorso, così i download
+    successivi possono inviare richieste condizionali e riscrivere solo i
+    file realmente cambiati. Le modifiche vanno applicate da un solo thread.
+    """
+
+    def __init__(self, path, entries=None):
+        self.path = path
+        self.entries = entries if entries is not None else {}
+        self.stats = Counter()
+
+    @classmethod
+    def load(cls, path):
+        """
+        Carica il manifest da file JSON (vuoto se il file non esiste).
+
+        Parametri:
+        - path (str): Percorso del manifest.
+
+        Ritorna:
+        - DownloadManifest: Manifest caricato.
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                return cls(path, json.load(file))
+        except FileNotFoundError:
+            return cls(path)
+
+    def save(self):
+        """
+        Salva il manifest su disco in modo atomico.
+        """
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.entries, file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def conditional_headers(self, file_name, url, file_path):
+        """
+        Restituisce gli header per una richiesta condizionale.
+
+        Gli header vengono inviati solo se il file locale esiste ancora e
+        appartiene allo stesso URL, altrimenti un 304 non sarebbe utilizzabile.
+
+        Parametri:
+        - file_name (str): Nome del file locale.
+        - url (str): URL da scaricare.
+        - file_path (str): Percorso completo del file locale.
+
+        Ritorna:
+        - dict: Header If-None-Match / If-Modified-Since (eventualmente vuoto).
+        """
+        entry = self.entries.get(file_name)
+        if not entry or entry["url"] != url or not os.path.isfile(file_path):
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def make_entry(self, url, response_headers, digest, file_path):
+        """
+        Costruisce la voce del manifest per una risposta 200.
+
+        Parametri:
+        - url (str): URL scaricato.
+        - response_headers (Mapping): Header della risposta HTTP.
+        - digest (str): Hash SHA-256 del contenuto scaricato.
+        - file_path (str): Percorso del file locale.
+
+        Ritorna:
+        - dict: Nuova voce del manifest.
+        """
+        return {
+            "url": url,
+            "etag": response_headers.get("ETag"),
+            "last_modified": response_headers.get("Last-Modified"),
+            "sha256": digest,
+            "path": file_path
+        }
+
+    def classify(self, file_name, new_entry):
+        """
+        Confronta una nuova voce con quella registrata.
+
+        Ritorna:
+        - str: ADDED, UPDATED oppure UNCHANGED (stesso URL e stesso hash).
+        """
+        entry = self.entries.get(file_name)
+        if entry is None or entry["url"] != new_entry["url"]:
+            return ADDED
+        if entry["sha256"] != new_entry["sha256"]:
+            return UPDATED
+        return UNCHANGED
+
+    def record(self, file_name, status, new_entry=None):
+        """
+        Registra l'esito del download di un file.
+
+        Parametri:
+        - file_name (str): Nome del file locale.
+        - status (str): Esito (UNCHANGED, UPDATED, ADDED).
+        - new_entry (dict | None): Nuova voce; None per un 304.
+        """
+        if new_entry is not None:
+            self.entries[file_name] = new_entry
+        self.stats[status] += 1
+
+    def remove(self, file_name):
+        """
+        Rimuove un file non più disponibile, sia dal manifest che dal disco.
+
+        Parametri:
+        - file_name (str): Nome del file locale.
+        """
+        entry = self.entries.pop(file_name, None)
+        if entry is None:
+            return
+        try:
+            os.remove(entry["path"])
+        except FileNotFoundError:
+            pass
+        self.stats[GONE] += 1
+
+    def summary(self):
+        """
+        Riepilogo testuale dell'ultimo aggiornamento.
+
+        Ritorna:
+        - str: Conteggi di file invariati, aggiornati, aggiunti e rimossi.
+        """
+        return (f"{self.stats[UNCHANGED]} invariati, {self.stats[UPDATED]} aggiornati, "
+                f"{self.stats[ADDED]} aggiunti, {self.stats[GONE]} rimossi")
@@ -0,0 +1,209 @@
+import random
+import threading
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+
+# Timeout di connessione e di lettura (secondi): un socket bloccato non ferma più il batch
+DEFAULT_TIMEOUT = (5, 30)
+
+# Tentativi aggiuntivi per errori temporanei e attesa iniziale del backoff esponenziale
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+MAX_BACKOFF = 30
+
+# Richieste al secondo consentite verso ciascun host (e picco massimo)
+DEFAULT_RATE = 10
+
+# Risposte per cui ha senso riprovare
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# Errori di rete temporanei per cui ha senso riprovare (anche una connessione chiusa a metà del corpo)
+RETRY_EXCEPTIONS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError,
+                    requests.exceptions.ContentDecodingError)
+
+
+class TokenBucket:
+    """
+    Limitatore di frequenza a "secchio di gettoni".
+
+    Il secchio si riempie di `rate` gettoni al secondo fino a `capacity`;
+    ogni richiesta consuma un gettone e, se il secchio è vuoto, attende.
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1, rate)
+        self.tokens = self.capacity
+        self.updated = clock()
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Consuma un gettone, attendendo se necessario.
+        """
+        while True:
+            with self._lock:
+                now = self._clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            self._sleep(wait)
+
+
+def retry_after_seconds(response):
+    """
+    Legge l'header Retry-After (in secondi o come data HTTP).
+
+    Parametri:
+    - response (requests.Response): Risposta del server.
+
+    Ritorna:
+    - float | None: Secondi da attendere, oppure None se l'header manca o non è valido.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class FetchScheduler:
+    """
+    Esegue le richieste HTTP con limiti di frequenza per host, timeout e retry.
+
+    Gli errori di rete e le risposte 5xx/429 vengono ritentati con backoff
+    esponenziale limitato (rispettando Retry-After); gli URL che falliscono
+    definitivamente finiscono nel report dei fallimenti. Espone lo stesso
+    metodo get di una requests.Session e può essere usato da più thread.
+    """
+
+    def __init__(self, session=None, rate=DEFAULT_RATE, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES,
+                 backoff=DEFAULT_BACKOFF, max_backoff=MAX_BACKOFF, sleep=time.sleep):
+        self.session = session if session is not None else requests.Session()
+        self.rate = rate
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failures = {}  # url -> (tentativi, errore)
+        self.stats = Counter()
+        self._sleep = sleep
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url):
+        """
+        Restituisce il limitatore di frequenza dell'host di un URL.
+        """
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, sleep=self._sleep)
+            return self._buckets[host]
+
+    def backoff_delay(self, attempt, response=None):
+        """
+        Attesa prima del tentativo successivo.
+
+        Parametri:
+        - attempt (int): Numero del tentativo fallito (da 0).
+        - response (requests.Response | None): Risposta ricevuta, se presente.
+
+        Ritorna:
+        - float: Secondi da attendere, mai oltre max_backoff.
+        """
+        delay = retry_after_seconds(response) if response is not None else None
+        if delay is None:
+            delay = self.backoff * (2 ** attempt) * (1 + random.random() / 4)
+        return min(delay, self.max_backoff)
+
+    def get(self, url, headers=None):
+        """
+        Esegue una GET con rate limit, timeout e retry.
+
+        Parametri:
+        - url (str): URL da scaricare.
+        - headers (dict | None): Header aggiuntivi.
+
+        Ritorna:
+        - requests.Response: Ultima risposta ricevuta (può essere ancora 5xx/429
+          se i tentativi sono esauriti).
+
+        Solleva:
+        - requests.RequestException: Se anche l'ultimo tentativo fallisce per errore di rete.
+        """
+        bucket = self.bucket(url)
+        for attempt in range(self.retries + 1):
+            bucket.acquire()
+            self._count("requests")
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except RETRY_EXCEPTIONS as e:
+                if attempt == self.retries:
+                    self.record_failure(url, e, attempt + 1)
+                    raise
+                self._count("retries")
+                self._sleep(self.backoff_delay(attempt))
+                continue
+
+            if response.status_code in RETRY_STATUS and attempt < self.retries:
+                self._count("retries")
+                self._sleep(self.backoff_delay(attempt, response))
+                response.close()
+                continue
+            if response.status_code in RETRY_STATUS:
+                self.record_failure(url, f"HTTP {response.status_code}", attempt + 1)
+            return response
+
+    def record_failure(self, url, error, attempts=1):
+        """
+        Registra il fallimento definitivo di un URL nel report.
+        """
+        with self._lock:
+            previous = self.failures.get(url, (0, None))[0]
+            self.failures[url] = (max(previous, attempts), str(error))
+
+    def failure_report(self):
+        """
+        Report dei fallimenti definitivi.
+
+        Ritorna:
+        - list[tuple]: Tuple (url, tentativi, errore) ordinate per URL.
+        """
+        with self._lock:
+            return [(url, attempts, error) for url, (attempts, error) in sorted(self.failures.items())]
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+
+# Scheduler condiviso per chi non ne passa uno esplicitamente
+_default_scheduler = None
+_default_lock = threading.Lock()
+
+
+def default_scheduler():
+    """
+    Restituisce lo scheduler condiviso del processo (creato al primo uso).
+    """
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = FetchScheduler()
+        return _default_scheduler
@@ -1,5 +1,7 @@
 import csv
 
+import utils.run_profiler as rp  # Tempo di scrittura dei CSV (--profile)
+
 def read_urls(path):
     """
     Legge un file CSV e restituisce una lista di URL validi.
@@ -20,12 +22,141 @@ def read_urls(path):
     return site_list
 
 
+# Intestazioni dei CSV di output
+HEADER_TAB = [
+    "File_name",
+    "H1_titles",
+    "Level",
+    "Category",
+    "Char_counts",
+    "Num_images",
+    "Num_videos",
+    "Num_code_blocks",
+    "Num_links",
+    "Current_links",
+    "Repository_link"
+]
+HEADER_TAB2 = ["File_name", "Titles"] + HEADER_TAB[2:-1]
+HEADER_TAB_URL = ["File_name", "Category", "Number", "Link", "Repository"]
+HEADER_TAB_URL_2 = HEADER_TAB_URL[:-1]
+
+
+def tab_rows(file_data, with_link=True):
+    """
+    Righe (una per titolo) di un singolo file analizzato, come nel CSV delle sezioni.
+
+    Parametri:
+    - file_data (FileRecord): Dati estratti da un file Markdown.
+    - with_link (bool): Se aggiungere la colonna con il link del repository.
+
+    Ritorna:
+    - generator: Liste di valori nell'ordine di HEADER_TAB (o HEADER_TAB2 senza link).
+    """
+    for section in file_data.sections:
+        row = [
+            file_data.file_name,
+            section.title,
+            section.level,
+            section.category,
+            section.char_count,
+            section.num_images,
+            section.num_videos,
+            section.num_code_blocks,
+            section.num_links,
+            section.current_links()
+        ]
+        if with_link:
+            row.append(file_data.link)
+        yield row
+
+
+def write_tab_rows(writer, file_data, with_link=True):
+    """
+    Scrive le righe (una per titolo) di un singolo file analizzato.
+
+    Parametri:
+    - writer (csv.writer): Writer del CSV di output.
+    - file_data (FileRecord): Dati estratti da un file Markdown.
+    - with_link (bool): Se aggiungere la colonna con il link del repository.
+    """
+    writer.writerows(tab_rows(file_data, with_link))
+
+
+def write_tab_url_rows(writer, file_data, with_link=True):
+    """
+    Scrive le righe (una per link) di un singolo file analizzato.
+
+    Parametri:
+    - writer (csv.writer): Writer del CSV di output.
+    - file_data (FileRecord): Dati estratti da un file Markdown.
+    - with_link (bool): Se aggiungere la colonna con il link del repository.
+    """
+    for section in file_data.sections:
+        category = section.category if section.category else "None"  # Categoria 'None' se mancante
+        for number, link in enumerate(section.urls, 1):
+            row = [file_data.file_name, category, number, link]
+            if with_link:
+                row.append(file_data.link)
+            writer.writerow(row)
+
+
+def write_group_rows(writer, writer_url, group, with_link=True):
+    """
+    Scrive le righe di un README e dei suoi file figli nei due CSV.
+
+    Parametri:
+    - writer (csv.writer): Writer del CSV delle sezioni.
+    - writer_url (csv.writer): Writer del CSV degli URL.
+    - group (list): Record del README seguito dai record dei file figli.
+    - with_link (bool): Se aggiungere la colonna con il link del repository.
+    """
+    with rp.current.stage("csv_write"):
+        for file_data in group:
+            write_tab_rows(writer, file_data, with_link)
+        # Il CSV degli URL riporta solo il README, non i file figli
+        write_tab_url_rows(writer_url, group[0], with_link)
+
+
+def get_csv_tabs(file_groups, name_file_csv_out, name_file_csv_out_url, with_link=True, on_group=None):
+    """
+    Scrive in una sola passata il CSV delle sezioni e quello degli URL.
+
+    I gruppi vengono scritti appena arrivano, quindi con un generatore
+    (es. pmc.iter_data_groups) la memoria non dipende dal numero di file.
+
+    Parametri:
+    - file_groups (iterable): Liste [README, figli...] di record analizzati.
+    - name_file_csv_out (str): Nome del CSV delle sezioni.
+    - name_file_csv_out_url (str): Nome del CSV degli URL.
+    - with_link (bool): Se aggiungere la colonna con il link del repository
+      (False: stesse intestazioni di get_csv_tab2 e get_csv_tab_url_2).
+    - on_group (callable | None): Chiamata con ogni gruppo scritto (es. per tenere
+      la tabella in memoria per i passi successivi della pipeline).
+
+    Ritorna:
+    - int: Numero di README scritti.
+    """
+    count = 0
+    with open(name_file_csv_out, mode='w', newline='', encoding='utf-8') as file, \
+            open(name_file_csv_out_url, mode='w', newline='', encoding='utf-8') as file_url:
+        writer = csv.writer(file)
+        writer_url = csv.writer(file_url)
+        writer.writerow(HEADER_TAB if with_link else HEADER_TAB2)
+        writer_url.writerow(HEADER_TAB_URL if with_link else HEADER_TAB_URL_2)
+        for group in file_groups:
+            write_group_rows(writer, writer_url, group, with_link)
+            if on_group is not None:
+                on_group(group)
+            count += 1
+    return count
+
+
 def get_csv_tab(data_table, name_file_csv_out):
     """
     Scrive i dati estratti da file Markdown in un file CSV strutturato.
 
     Parametri:
-    - data_table (list): Lista di dizionari contenenti le informazioni estratte.
+    - data_table (iterable): Record dei file analizzati, anche generati man mano (es. pmc.iter_data_table).
     - name_file_csv_out (str): Nome del file CSV di output.
 
     Ritorna:
@@ -35,37 +166,11 @@ def get_csv_tab(data_table, name_file_csv_out):
         writer = csv.writer(file)
 
         # Intestazione del CSV
-        writer.writerow([
-            "File_name",
-            "H1_titles",
-            "Level",
-            "Category",
-            "Char_counts",
-            "Num_images",
-            "Num_videos",
-            "Num_code_blocks",
-            "Num_links",
-            "Current_links",
-            "Repository_link"
-        ])
+        writer.writerow(HEADER_TAB)
 
         # Scrive ogni riga per ciascun H1 nel file
         for file_data in data_table:
-            for i, title in enumerate(file_data["h1_titles"]):
-                level = file_data["level"][i]
-                writer.writerow([
-                    file_data["file_name"],
-                    title,
-                    level,
-                    file_data["category"][i],
-                    file_data["char_counts"][i],
-                    file_data["num_images"][i],
-                    file_data["num_videos"][i],
-                    file_data["num_code_blocks"][i],
-                    file_data["num_links"][i],
-                    file_data["current_links"][i],
-                    file_data["link"]
-                ])
+            write_tab_rows(writer, file_data)
 
 
 def get_csv_tab2(data_table, name_file_csv_out):
@@ -73,7 +178,7 @@ def get_csv_tab2(data_table, name_file_csv_out):
     Variante semplificata di get_csv_tab che esclude il link al repository.
 
     Parametri:
-    - data_table (list): Lista di dizionari contenenti le informazioni estratte.
+    - data_table (iterable): Record dei file analizzati, anche generati man mano (es. pmc.iter_data_table).
     - name_file_csv_out (str): Nome del file CSV di output.
 
     Ritorna:
@@ -83,35 +188,11 @@ def get_csv_tab2(data_table, name_file_csv_out):
         writer = csv.writer(file)
 
         # Intestazione del CSV semplificata
-        writer.writerow([
-            "File_name",
-            "Titles",
-            "Level",
-            "Category",
-            "Char_counts",
-            "Num_images",
-            "Num_videos",
-            "Num_code_blocks",
-            "Num_links",
-            "Current_links"
-        ])
+        writer.writerow(HEADER_TAB2)
 
         # Scrive ogni riga per ciascun H1 nel file
         for file_data in data_table:
-            for i, title in enumerate(file_data["h1_titles"]):
-                level = file_data["level"][i]
-                writer.writerow([
-                    file_data["file_name"],
-                    title,
-                    level,
-                    file_data["category"][i],
-                    file_data["char_counts"][i],
-                    file_data["num_images"][i],
-                    file_data["num_videos"][i],
-                    file_data["num_code_blocks"][i],
-                    file_data["num_links"][i],
-                    file_data["current_links"][i]
-                ])
+            write_tab_rows(writer, file_data, with_link=False)
 
 
 def get_csv_tab_url(data_table, name_file_csv_out):
@@ -126,7 +207,7 @@ def get_csv_tab_url(data_table, name_file_csv_out):
     - Link del repository sorgente
 
     Parametri:
-    - data_table (list): Lista di dizionari contenenti i dati estratti.
+    - data_table (iterable): Record dei file analizzati, anche generati man mano (es. pmc.iter_data_table).
     - name_file_csv_out (str): Nome del file CSV di output.
 
     Ritorna:
@@ -136,23 +217,10 @@ def get_csv_tab_url(data_table, name_file_csv_out):
         writer = csv.writer(file)
 
         # Intestazione del CSV
-        writer.writerow(["File_name", "Category", "Number", "Link", "Repository"])
+        writer.writerow(HEADER_TAB_URL)
 
         for file_data in data_table:
-            file_name = file_data["file_name"]
-            repository_link = file_data["link"]
-
-            # Estrae tutti i link da tutte le sezioni (lista di tuple)
-            all_links = [item for section_links in file_data["current_links"] for item in section_links]
-
-            for category, number, link in all_links:
-                writer.writerow([
-                    file_name,
-                    category if category else "None",  # Categoria 'None' se mancante
-                    number,
-                    link,
-                    repository_link
-                ])
+            write_tab_url_rows(writer, file_data)
 
 
 def get_csv_tab_url_2(data_table, name_file_csv_out):
@@ -166,7 +234,7 @@ def get_csv_tab_url_2(data_table, name_file_csv_out):
     - URL del link
 
     Parametri:
-    - data_table (list): Lista di dizionari contenenti i dati estratti.
+    - data_table (iterable): Record dei file analizzati, anche generati man mano (es. pmc.iter_data_table).
     - name_file_csv_out (str): Nome del file CSV di output.
 
     Ritorna:
@@ -176,18 +244,43 @@ def get_csv_tab_url_2(data_table, name_file_csv_out):
         writer = csv.writer(file)
 
         # Intestazione del CSV
-        writer.writerow(["File_name", "Category", "Number", "Link"])
+        writer.writerow(HEADER_TAB_URL_2)
 
         for file_data in data_table:
-            file_name = file_data["file_name"]
-
-            # Estrae tutti i link da tutte le sezioni (lista di tuple)
-            all_links = [item for sublist in file_data["current_links"] for item in sublist]
-
-            for category, number, link in all_links:
-                writer.writerow([
-                    file_name,
-                    category if category else "None",
-                    number,
-                    link
-                ])
+            write_tab_url_rows(writer, file_data, with_link=False)
+
+
+def get_csv_failures(failure_report, name_file_csv_out):
+    """
+    Scrive il report dei download falliti definitivamente.
+
+    Parametri:
+    - failure_report (list): Tuple (url, tentativi, errore).
+    - name_file_csv_out (str): Nome del file CSV di output.
+
+    Ritorna:
+    - None: I dati vengono scritti direttamente nel file.
+    """
+    with open(name_file_csv_out, mode='w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(["Url", "Attempts", "Error"])
+        for url, attempts, error in failure_report:
+            writer.writerow([url, attempts, error])
+
+
+def get_csv_skipped(read_rows, name_file_csv_out):
+    """
+    Scrive il report dei README saltati o troncati, con il motivo.
+
+    Parametri:
+    - read_rows (list): Tuple (file, esito), es. da ReadReport.rows().
+    - name_file_csv_out (str): Nome del file CSV di output.
+
+    Ritorna:
+    - None: I dati vengono scritti direttamente nel file.
+    """
+    with open(name_file_csv_out, mode='w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(["File", "Reason"])
+        for md_file, status in read_rows:
+            writer.writerow([md_file, status])
@@ -0,0 +1,806 @@
+import functools
+import re
+from markdown_it.common.html_re import HTML_TAG_RE  # Regole di markdown-it riusate dallo scanner a righe
+from markdown_it.helpers import parseLinkDestination, parseLinkTitle
+from markdown_it.rules_block.html_block import HTML_SEQUENCES
+from markdown_it.rules_inline.autolink import AUTOLINK_RE, EMAIL_RE
+
+from utils.data_records import Section  # Record compatti delle sezioni
+
+
+# ── MOTORE ALTERNATIVO: SCANNER A RIGHE ───────────────────────────
+#
+# Scanner usato da parse_markdown_column.scan_titles_md (motore "scanner"),
+# che sceglie quando usarlo e gli passa parser, categorie e limiti dell'analisi.
+
+# Fine riga come le riconosce markdown-it (che normalizza \r\n e \r in \n)
+NEWLINE_PATTERN = re.compile(r'\r\n|\r|\n')
+
+
+def line_offsets(md_text):
+    """
+    Tabella degli offset di inizio riga, per passare dalle righe di token.map ai caratteri.
+
+    Parametri:
+    - md_text (str): Contenuto Markdown.
+
+    Ritorna:
+    - list[int]: offsets[k] è l'indice del primo carattere della riga k; l'ultimo
+      elemento è len(md_text), così anche la riga dopo l'ultima ha un offset.
+    """
+    offsets = [0]
+    offsets.extend(match.end() for match in NEWLINE_PATTERN.finditer(md_text))
+    offsets.append(len(md_text))
+    return offsets
+
+
+class ScannerFallback(Exception):
+    """
+    Costrutto Markdown che lo scanner a righe non gestisce: il testo va analizzato con markdown-it.
+    """
+
+
+# Definizioni di riferimenti ([x]: url, anche in liste e citazioni) e caratteri \0:
+# cambiano il significato di tutto il documento, che passa quindi a markdown-it
+SCANNER_FALLBACK_PATTERN = re.compile(r'^[ \t>*+\-\d.)]*\[(?:[^\]\\]|\\.)*\]:|\x00', re.MULTILINE)
+
+# Marcatore di un elemento di lista numerato (fino a 9 cifre, poi "." o ")")
+ORDERED_MARKER_PATTERN = re.compile(r'[0-9]{1,9}[.)]')
+
+# Caratteri da cui possono iniziare codice, link, immagini, autolink e HTML inline
+INLINE_START_PATTERN = re.compile(r'[`\[!<]')
+
+# Entità HTML, che markdown-it decodifica nel testo dei link
+ENTITY_PATTERN = re.compile(r'&(?:#[0-9]{1,7}|#[xX][0-9a-fA-F]{1,6}|[A-Za-z][A-Za-z0-9]{1,31});')
+
+# Tag HTML inline di markdown-it senza l'ancora iniziale, per applicarlo da una posizione
+INLINE_HTML_PATTERN = re.compile(HTML_TAG_RE.pattern[1:], HTML_TAG_RE.flags)
+
+# Contenitori annidati oltre i quali lo scanner rinuncia (markdown-it smette di annidare a 20 livelli)
+MAX_SCANNER_CONTAINERS = 8
+
+# Ogni quante righe lo scanner controlla il tempo massimo di analisi (vedi LineScanner)
+DEADLINE_CHECK_LINES = 512
+
+
+def _scan_indent(line, pos):
+    """
+    Spazi di rientro a partire da pos; le tabulazioni nel rientro non sono gestite.
+    """
+    end = pos
+    length = len(line)
+    while end < length and line[end] == " ":
+        end += 1
+    if end < length and line[end] == "\t":
+        raise ScannerFallback("tabulazione nel rientro")
+    return end - pos
+
+
+def _is_blank(text):
+    """
+    Riga vuota per markdown-it: solo spazi e tabulazioni.
+    """
+    return not text.strip(" \t")
+
+
+def _atx_heading(line, pos):
+    """
+    Titolo ATX (# ...) che inizia in pos, come la regola heading di markdown-it.
+
+    Ritorna:
+    - tuple | None: (livello, contenuto) o None se la riga non è un titolo.
+    """
+    end = len(line)
+    start = pos
+    while pos < end and line[pos] == "#":
+        pos += 1
+    level = pos - start
+    if level > 6 or (pos < end and line[pos] not in " \t"):
+        return None
+    # Toglie la sequenza di chiusura (" ###") e gli spazi finali
+    stop = max(pos, len(line.rstrip(" \t")))
+    closing = stop
+    while closing > pos and line[closing - 1] == "#":
+        closing -= 1
+    if closing > pos and line[closing - 1] in " \t":
+        stop = closing
+    return level, line[pos:stop].strip()
+
+
+def _fence_open(line, pos):
+    """
+    Apertura di un blocco di codice delimitato (``` o ~~~) in pos.
+
+    Ritorna:
+    - tuple | None: (carattere, lunghezza della sequenza) o None.
+    """
+    char = line[pos]
+    run = len(line) - pos - len(line[pos:].lstrip(char))
+    if run < 3 or (char == "`" and "`" in line[pos + run:]):
+        return None
+    return char, run
+
+
+def _fence_close(line, pos, fence):
+    """
+    Se la riga (dal primo carattere dopo il rientro) chiude il blocco di codice delimitato.
+    """
+    char, size = fence
+    rest = line[pos:]
+    run = len(rest) - len(rest.lstrip(char))
+    return run >= size and _is_blank(rest[run:])
+
+
+def _thematic_break(line, pos):
+    """
+    Linea orizzontale (***, ---, ___ anche con spazi) in pos.
+    """
+    char = line[pos]
+    rest = line[pos:]
+    return rest.count(char) >= 3 and _is_blank(rest.replace(char, ""))
+
+
+def _setext_underline(line, pos):
+    """
+    Sottolineatura di un titolo setext (=== o ---) in pos.
+
+    Ritorna:
+    - int: Livello del titolo (1 o 2), 0 se la riga non è una sottolineatura.
+    """
+    char = line[pos]
+    if char not in "=-" or not _is_blank(line[pos:].lstrip(char)):
+        return 0
+    return 1 if char == "=" else 2
+
+
+def _list_marker(line, pos):
+    """
+    Marcatore di un elemento di lista (-, +, * oppure 1. / 1)) in pos.
+
+    Ritorna:
+    - tuple | None: (posizione dopo il marcatore, numero o None per gli elenchi puntati).
+    """
+    char = line[pos]
+    if char in "*-+":
+        end = pos + 1
+        value = None
+    else:
+        match = ORDERED_MARKER_PATTERN.match(line, pos)
+        if match is None:
+            return None
+        end = match.end()
+        value = int(line[pos:end - 1])
+    if end < len(line) and line[end] not in " \t":
+        return None
+    return end, value
+
+
+# Destinazione di un link senza parentesi, escape, entità né spazi (il caso comune)
+SIMPLE_DESTINATION_PATTERN = re.compile(r'[^\x00-\x20\x7f()\\&<][^\x00-\x20\x7f()\\&]*')
+
+
+@functools.lru_cache(maxsize=4096)
+def _link_href(md_parser, destination):
+    """
+    URL normalizzato di una destinazione (normalizeLink di markdown-it), None se non valido.
+
+    I README ripetono spesso gli stessi URL (badge, documentazione): il risultato è memorizzato.
+    """
+    href = md_parser.normalizeLink(destination)
+    return href if md_parser.validateLink(href) else None
+
+
+def _link_destination(src, pos, end):
+    """
+    Destinazione di un link in pos, come parseLinkDestination di markdown-it.
+
+    Ritorna:
+    - tuple | None: (destinazione, posizione successiva) o None se non c'è.
+    """
+    match = SIMPLE_DESTINATION_PATTERN.match(src, pos, end)
+    if match is not None and (match.end() == end or src[match.end()] not in "(\\&"):
+        return match.group(), match.end()
+    result = parseLinkDestination(src, pos, end)
+    return (result.str, result.pos) if result.ok else None
+
+
+def _skip_link_spaces(src, pos, end):
+    """
+    Salta spazi, tabulazioni e a capo dentro le parentesi di un link.
+    """
+    while pos < end and src[pos] in " \t\n":
+        pos += 1
+    return pos
+
+
+class InlineScanner:
+    """
+    Conta immagini e link di un testo inline con le regole di markdown-it.
+
+    Riproduce le regole link, image, backticks, autolink e html_inline del
+    preset commonmark (senza riferimenti, che fanno usare markdown-it per
+    tutto il file) e la lettura dei token di find_titles_md: un link conta
+    il suo URL solo se contiene del testo. Con escape (\\) o entità che
+    potrebbero lasciare vuoto il testo di un link solleva ScannerFallback.
+    """
+
+    def __init__(self, src, md_parser):
+        """
+        Parametri:
+        - src (str): Testo inline.
+        - md_parser (MarkdownIt): Parser di riferimento (normalizzazione dei link e annidamento massimo).
+        """
+        self.src = src
+        self.md_parser = md_parser
+        self.images = 0
+        self.urls = []
+        self.link_active = False
+        self.link_text = False
+        self.link_url = ""
+        self._cache = {}            # Fine del token saltato da ogni posizione (state.cache di markdown-it)
+        self._backticks = {}        # Ultima sequenza di backtick per lunghezza (state.backticks)
+        self._backticks_scanned = False
+
+    def scan(self):
+        """
+        Ritorna:
+        - tuple: (numero di immagini, URL dei link con testo).
+        """
+        if "\\" in self.src:
+            raise ScannerFallback("escape nel testo inline")
+        self.tokenize(0, len(self.src), 0)
+        return self.images, self.urls
+
+    # Eventi come li legge find_titles_md dai figli dei token inline
+
+    def open_link(self, href):
+        self.link_active = True
+        self.link_text = False
+        self.link_url = href
+
+    def text(self, content):
+        if self.link_active and not self.link_text and content.strip():
+            if "&" in content and not ENTITY_PATTERN.sub("", content).strip():
+                raise ScannerFallback("entità nel testo di un link")
+            self.link_text = True
+
+    def close_link(self):
+        if self.link_active and self.link_text:
+            self.urls.append(self.link_url)
+            self.link_active = False
+
+    # Regole inline
+
+    def tokenize(self, pos, end, level):
+        """
+        Analizza src[pos:end] come markdown-it.inline.tokenize.
+        """
+        src = self.src
+        while pos < end:
+            match = INLINE_START_PATTERN.search(src, pos, end)
+            stop = match.start() if match else end
+            if stop > pos:
+                self.text(src[pos:stop])
+            if match is None:
+                return
+            pos = stop
+            char = src[pos]
+            if char == "`":
+                after, is_code = self.code_span(pos, end)
+                if not is_code:
+                    self.text(src[pos:after])
+                pos = after
+            elif char == "[":
+                link = self.link(pos, end, level)
+                if link is None:
+                    self.text(char)
+                    pos += 1
+                else:
+                    label_end, pos, href = link
+                    self.open_link(href)
+                    self.tokenize(stop + 1, label_end, level + 1)
+                    self.close_link()
+            elif char == "!":
+                after = self.image(pos, end, level)
+                if after < 0:
+                    self.text(char)
+                    pos += 1
+                else:
+                    self.images += 1
+                    pos = after
+            else:
+                autolink = self.autolink(pos, end)
+                if autolink is not None:
+                    pos, href = autolink
+                    self.open_link(href)
+                    self.link_text = True
+                    self.close_link()
+                else:
+                    after = self.html_tag(pos, end)
+                    if after < 0:
+                        self.text(char)
+                        pos += 1
+                    else:
+                        pos = after
+
+    def skip_token(self, pos, end, level):
+        """
+        Fine del token che inizia in pos (skipToken di markdown-it, in modalità di verifica).
+        """
+        cached = self._cache.get(pos)
+        if cached is not None:
+            return cached
+        if level >= self.md_parser.options["maxNesting"]:
+            raise ScannerFallback("annidamento eccessivo")
+        char = self.src[pos]
+        after = -1
+        if char == "`":
+            after = self.code_span(pos, end)[0]
+        elif char == "[":
+            link = self.link(pos, end, level + 1)
+            if link is not None:
+                after = link[1]
+        elif char == "!":
+            after = self.image(pos, end, level + 1)
+        elif char == "<":
+            autolink = self.autolink(pos, end)
+            after = autolink[0] if autolink is not None else self.html_tag(pos, end)
+        if after < 0:
+            after = pos + 1
+        self._cache[pos] = after
+        return after
+
+    def code_span(self, pos, end):
+        """
+        Codice inline fra sequenze di backtick della stessa lunghezza.
+
+        Ritorna:
+        - tuple: (posizione successiva, True se è codice o False se i backtick restano testo).
+        """
+        src = self.src
+        run_end = pos
+        while run_end < end and src[run_end] == "`":
+            run_end += 1
+        length = run_end - pos
+        if self._backticks_scanned and self._backticks.get(length, 0) <= pos:
+            return run_end, False
+        closer_end = run_end
+        while True:
+            closer = src.find("`", closer_end)
+            if closer < 0:
+                break
+            closer_end = closer + 1
+            while closer_end < end and src[closer_end] == "`":
+                closer_end += 1
+            if closer_end - closer == length:
+                return closer_end, True
+            self._backticks[closer_end - closer] = closer
+        self._backticks_scanned = True
+        return run_end, False
+
+    def link_label(self, pos, end, disable_nested, level):
+        """
+        Fine dell'etichetta [...] che inizia in pos (parseLinkLabel), -1 se non c'è.
+        """
+        src = self.src
+        depth = 1
+        current = pos + 1
+        while current < end:
+            char = src[current]
+            if char == "]":
+                depth -= 1
+                if depth == 0:
+                    return current
+            after = self.skip_token(current, end, level)
+            if char == "[":
+                if after == current + 1:
+                    depth += 1
+                elif disable_nested:
+                    return -1
+            current = after
+        return -1
+
+    def link_target(self, pos, end, is_image):
+        """
+        Destinazione e titolo fra parentesi dopo l'etichetta (regole link e image).
+
+        Ritorna:
+        - tuple | None: (posizione dopo la parentesi chiusa, href) o None.
+        """
+        src = self.src
+        if pos >= end or src[pos] != "(":
+            return None
+        pos = _skip_link_spaces(src, pos + 1, end)
+        if pos >= end:
+            return None
+        href = ""
+        destination = _link_destination(src, pos, end)
+        if destination is not None:
+            href = _link_href(self.md_parser, destination[0])
+            if href is not None:
+                pos = destination[1]
+            else:
+                href = ""
+        # Nei link il titolo si cerca solo dopo una destinazione valida, nelle immagini sempre
+        if destination is not None or is_image:
+            start = pos
+            pos = _skip_link_spaces(src, pos, end)
+            if pos < end and start != pos:
+                result = parseLinkTitle(src, pos, end)
+                if result.ok:
+                    pos = _skip_link_spaces(src, result.pos, end)
+        if pos >= end or src[pos] != ")":
+            return None
+        return pos + 1, href
+
+    def link(self, pos, end, level):
+        """
+        Ritorna:
+        - tuple | None: (fine dell'etichetta, fine del link, href) o None se non è un link.
+        """
+        label_end = self.link_label(pos, end, True, level)
+        if label_end < 0:
+            return None
+        target = self.link_target(label_end + 1, end, False)
+        if target is None:
+            return None
+        return label_end, target[0], target[1]
+
+    def image(self, pos, end, level):
+        """
+        Fine dell'immagine ![...](...) che inizia in pos, -1 se non è un'immagine.
+        """
+        if pos + 1 < end and self.src[pos + 1] != "[":
+            return -1
+        label_end = self.link_label(pos + 1, end, False, level)
+        if label_end < 0:
+            return -1
+        target = self.link_target(label_end + 1, end, True)
+        return -1 if target is None else target[0]
+
+    def autolink(self, pos, end):
+        """
+        Autolink <schema:...> o <email> in pos.
+
+        Ritorna:
+        - tuple | None: (posizione successiva, href) o None.
+        """
+        src = self.src
+        close = pos + 1
+        while close < end and src[close] not in "<>":
+            close += 1
+        if close >= end or src[close] != ">":
+            return None
+        url = src[pos + 1:close]
+        if AUTOLINK_RE.search(url) is not None:
+            href = _link_href(self.md_parser, url)
+        elif EMAIL_RE.search(url) is not None:
+            href = _link_href(self.md_parser, "mailto:" + url)
+        else:
+            return None
+        return None if href is None else (close + 1, href)
+
+    def html_tag(self, pos, end):
+        """
+        Fine del tag HTML inline che inizia in pos, -1 se non è un tag.
+        """
+        src = self.src
+        if pos + 2 >= end:
+            return -1
+        second = src[pos + 1]
+        if second not in "!?/" and not ("a" <= second.lower() <= "z" and second.isascii()):
+            return -1
+        match = INLINE_HTML_PATTERN.match(src, pos)
+        return -1 if match is None else match.end()
+
+
+def inline_counts_md(src, md_parser):
+    """
+    Immagini e URL dei link di un testo inline, letti dai token di markdown-it come in find_titles_md.
+
+    Ritorna:
+    - tuple: (numero di immagini, URL dei link con testo).
+    """
+    images = 0
+    urls, link_text, link_url = [], "", ""
+    link_active = False
+    for child in md_parser.parseInline(src)[0].children:
+        if child.type == 'image':
+            images += 1
+        elif child.type == 'link_open':
+            link_active = True
+            link_text, link_url = "", child.attrs.get('href', "")
+        elif child.type == 'text' and link_active:
+            link_text += child.content.strip()
+        elif child.type == 'link_close' and link_active and link_text.strip():
+            urls.append(link_url)
+            link_active = False
+    return images, urls
+
+
+def inline_counts(src, md_parser):
+    """
+    Immagini e URL dei link di un testo inline: scanner, o markdown-it per i casi non gestiti.
+    """
+    if "[" not in src and "<" not in src:
+        return 0, []
+    try:
+        return InlineScanner(src, md_parser).scan()
+    except ScannerFallback:
+        return inline_counts_md(src, md_parser)
+
+
+class LineScanner:
+    """
+    Motore alternativo a find_titles_md: legge il Markdown riga per riga senza creare token.
+
+    Segue le regole a blocchi di markdown-it (preset commonmark) solo per
+    quello che serve all'analisi: titoli ATX e setext, paragrafi, codice
+    delimitato e indentato, HTML, citazioni ed elenchi, che decidono se una
+    riga è un titolo e quale testo contiene link. Il testo inline passa a
+    InlineScanner solo se contiene "[" o "<". Davanti a costrutti che non
+    gestisce (tabulazioni nei rientri, elementi di lista vuoti, ...) solleva
+    ScannerFallback.
+    """
+
+    def __init__(self, md_text, md_parser, title_category, section_length, check_deadline):
+        """
+        Parametri:
+        - md_text (str): Contenuto Markdown.
+        - md_parser (MarkdownIt): Parser di riferimento, per il testo inline che lo scanner non gestisce.
+        - title_category (callable): Testo di un titolo -> (titolo pulito, categoria).
+        - section_length (callable): (inizio, fine) -> caratteri della sezione.
+        - check_deadline (callable): Controllo del tempo massimo di analisi, chiamato ogni
+          DEADLINE_CHECK_LINES righe.
+        """
+        self.md_text = md_text
+        self.md_parser = md_parser
+        self.title_category = title_category
+        self.section_length = section_length
+        self.check_deadline = check_deadline
+        self.offsets = line_offsets(md_text)
+        self.sections = []
+        self.section = None      # Sezione aperta: [titolo, livello, categoria, inizio, immagini, url]
+        self.containers = []     # Citazioni (None) ed elementi di lista (rientro del contenuto) aperti
+        self.tip = None          # Blocco aperto: "para", "fence", "code", "html" o None
+        self.para = []           # Righe del paragrafo aperto
+        self.para_start = 0      # Prima riga del paragrafo
+        self.para_lazy = False   # Se il paragrafo ha righe di continuazione "pigre"
+        self.fence = None        # (carattere, lunghezza) del codice delimitato aperto
+        self.html_end = None     # Chiusura del blocco HTML aperto (None: riga vuota)
+
+    def scan(self):
+        """
+        Ritorna:
+        - list[Section]: Le sezioni come find_titles_md.
+        """
+        lines = NEWLINE_PATTERN.split(self.md_text)
+        if len(lines) > 1 and not lines[-1]:
+            lines.pop()  # Il testo termina con un a capo: non c'è un'ultima riga vuota
+        for number, line in enumerate(lines):
+            if not number % DEADLINE_CHECK_LINES:
+                self.check_deadline()
+            self.scan_line(number, line)
+        self.close_blocks(0)
+        self.close_section(len(self.md_text))
+        return self.sections
+
+    # Sezioni
+
+    def close_section(self, end):
+        if self.section is not None:
+            title, level, category, start, images, urls = self.section
+            # Video e blocchi di codice restano a 0, come risultano da find_titles_md
+            self.sections.append(Section(title, level, category, self.section_length(start, end), urls, images))
+
+    def heading(self, level, content, start_line, end_line):
+        if level <= 4:
+            self.close_section(self.offsets[start_line])
+            title, category = self.title_category(content)
+            self.section = [title, level, category, self.offsets[end_line], 0, []]
+        self.inline(content)
+
+    def inline(self, content):
+        if self.section is not None:
+            images, urls = inline_counts(content, self.md_parser)
+            self.section[4] += images
+            self.section[5].extend(urls)
+
+    # Blocchi
+
+    def close_blocks(self, depth):
+        """
+        Chiude il blocco aperto e i contenitori oltre i primi depth.
+        """
+        if self.tip == "para":
+            self.inline("\n".join(self.para).strip())
+        self.tip = None
+        del self.containers[depth:]
+
+    def open_container(self, matched, width):
+        self.close_blocks(matched)
+        self.containers.append(width)
+        if len(self.containers) > MAX_SCANNER_CONTAINERS:
+            raise ScannerFallback("troppi contenitori annidati")
+        return matched + 1
+
+    def scan_line(self, number, line):
+        tip = self.tip
+        containers = self.containers
+
+        # Codice e HTML fuori da contenitori: basta cercarne la chiusura
+        if not containers and tip is not None and tip != "para":
+            indent_text = line[:len(line) - len(line.lstrip(" \t"))]
+            if tip == "fence":
+                if len(indent_text.expandtabs(4)) <= 3 and _fence_close(line, len(indent_text), self.fence):
+                    self.tip = None
+                return
+            if tip == "html":
+                if self.html_end is None:
+                    if _is_blank(line):
+                        self.tip = None
+                elif self.html_end.search(line[len(indent_text):]):
+                    self.tip = None
+                return
+            # Codice indentato: continua con righe vuote o rientrate di almeno 4 colonne
+            if _is_blank(line) or len(indent_text.expandtabs(4)) >= 4:
+                return
+            self.tip = tip = None
+
+        # Contenitori aperti che continuano su questa riga
+        pos = 0
+        matched = 0
+        length = len(line)
+        for width in containers:
+            indent = _scan_indent(line, pos)
+            start = pos + indent
+            if width is None:
+                if start >= length or line[start] != ">":
+                    break
+                pos = start + 1
+                if pos < length and line[pos] == " ":
+                    pos += 1
+                elif pos < length and line[pos] == "\t":
+                    raise ScannerFallback("tabulazione dopo >")
+            elif start < length:
+                if indent < width:
+                    break
+                pos += width
+            matched += 1
+        all_matched = matched == len(containers)
+
+        if tip == "fence":
+            if all_matched:
+                if line[pos:].lstrip(" \t")[:1] != self.fence[0]:
+                    return
+                indent = _scan_indent(line, pos)
+                if indent <= 3 and _fence_close(line, pos + indent, self.fence):
+                    self.tip = None
+                return
+            self.tip = tip = None
+        elif tip == "html":
+            if all_matched:
+                rest = line[pos:]
+                if _is_blank(rest):
+                    if self.html_end is None:
+                        self.tip = None
+                    elif any(width is not None for width in containers):
+                        # Dentro un elemento di lista la riga vuota chiude l'HTML se è meno rientrata del contenuto
+                        if None in containers:
+                            raise ScannerFallback("HTML in una citazione dentro una lista")
+                        if _scan_indent(line, 0) < sum(containers):
+                            self.tip = None
+                elif self.html_end is not None and self.html_end.search(rest):
+                    self.tip = None
+                return
+            self.tip = tip = None
+        elif tip == "code":
+            if all_matched:
+                rest = line[pos:]
+                if _is_blank(rest) or _scan_indent(line, pos) >= 4:
+                    return
+            self.tip = tip = None
+
+        # Fuori da contenitori un rientro con tabulazioni vale almeno 4 colonne
+        if not containers and line[:1] in (" ", "\t") and "\t" in line[:len(line) - len(line.lstrip(" \t"))]:
+            if _is_blank(line):
+                self.close_blocks(0)
+            elif tip == "para":
+                self.para.append(line)
+            else:
+                self.tip = "code"
+            return
+
+        # Nuovi blocchi
+        while True:
+            indent = _scan_indent(line, pos)
+            start = pos + indent
+            if start >= length:
+                break
+            if indent >= 4:
+                if self.tip == "para":
+                    # Riga pigra rientrata: markdown-it la valuta con rientri diversi nei contenitori annidati
+                    if not all_matched and (containers[matched] is not None or len(containers) - matched > 1):
+                        raise ScannerFallback("riga pigra rientrata")
+                    break
+                self.close_blocks(matched)
+                self.tip = "code"
+                return
+            char = line[start]
+            if char == ">":
+                matched = self.open_container(matched, None)
+                pos = start + 1
+                if pos < length and line[pos] == " ":
+                    pos += 1
+                elif pos < length and line[pos] == "\t":
+                    raise ScannerFallback("tabulazione dopo >")
+                all_matched = True
+                continue
+            if char == "#":
+                heading = _atx_heading(line, start)
+                if heading is not None:
+                    self.close_blocks(matched)
+                    self.heading(heading[0], heading[1], number, number + 1)
+                    return
+            elif char in "`~":
+                fence = _fence_open(line, start)
+                if fence is not None:
+                    self.close_blocks(matched)
+                    self.tip = "fence"
+                    self.fence = fence
+                    return
+            elif char == "<":
+                rest = line[start:]
+                for open_pattern, close_pattern, interrupts in HTML_SEQUENCES:
+                    if open_pattern.search(rest):
+                        if not interrupts and self.tip == "para":
+                            break
+                        self.close_blocks(matched)
+                        self.html_end = None if close_pattern.pattern == "^$" else close_pattern
+                        if self.html_end is None or not self.html_end.search(rest):
+                            self.tip = "html"
+                        return
+            if self.tip == "para" and all_matched:
+                level = _setext_underline(line, start)
+                if level:
+                    if self.para_lazy:
+                        raise ScannerFallback("titolo setext con righe pigre")
+                    content = "\n".join(self.para).strip()
+                    self.tip = None
+                    self.heading(level, content, self.para_start, number + 1)
+                    return
+            if char in "*-_" and _thematic_break(line, start):
+                self.close_blocks(matched)
+                return
+            if char in "*-+" or "0" <= char <= "9":
+                marker = _list_marker(line, start)
+                if marker is not None:
+                    marker_end, value = marker
+                    empty = _is_blank(line[marker_end:])
+                    # Un elenco interrompe un paragrafo solo se non è vuoto e, se numerato, parte da 1
+                    if self.tip == "para" and all_matched and (empty or value not in (None, 1)):
+                        break
+                    if empty:
+                        raise ScannerFallback("elemento di lista vuoto")
+                    spaces = _scan_indent(line, marker_end)
+                    if spaces > 4:
+                        spaces = 1
+                    matched = self.open_container(matched, marker_end - pos + spaces)
+                    pos = marker_end + spaces
+                    all_matched = True
+                    continue
+            break
+
+        rest = line[pos:]
+        if _is_blank(rest):
+            self.close_blocks(matched)
+        elif self.tip == "para":
+            if not all_matched:
+                self.para_lazy = True
+            self.para.append(rest)
+        else:
+            self.close_blocks(matched)
+            self.tip = "para"
+            self.para = [rest]
+            self.para_start = number
+            self.para_lazy = False
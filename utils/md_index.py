@@ -0,0 +1,117 @@
+import json
+import os
+import re
+from collections import Counter
+
+# Nome predefinito dell'indice (salvato fuori dalla cartella dei README)
+INDEX_FILE_NAME = "md_index.json"
+
+# File già in formato N.md: mantengono l'ID N
+NUMERIC_NAME_PATTERN = re.compile(r'^(\d+)\.md$')
+
+
+class MdIndex:
+    """
+    Indice persistente dei README di una cartella locale: ID numerico -> nome del file.
+
+    Sostituisce la rinomina dei file in N.md: i README restano dove sono,
+    con il loro nome, e nei CSV compaiono come "ID.md". Un file conserva il
+    suo ID fra un'esecuzione e l'altra (anche se nel frattempo sparisce e
+    poi ricompare); i file già chiamati N.md ricevono l'ID N, se libero, e
+    gli altri il primo ID libero, in ordine di nome, come faceva la rinomina.
+    L'indice vale per una sola cartella: con una cartella diversa si riparte
+    da un indice vuoto.
+    """
+
+    def __init__(self, path, directory, names=None):
+        """
+        Parametri:
+        - path (str): File JSON dell'indice.
+        - directory (str): Cartella dei README.
+        - names (dict | None): ID -> nome del file.
+        """
+        self.path = path
+        self.directory = os.path.abspath(directory)
+        self.names = names if names is not None else {}
+        self.ids = {name: file_id for file_id, name in self.names.items()}
+        self.stats = Counter()
+        self._next_id = 0  # Nessun ID libero sotto questo valore
+
+    @classmethod
+    def load(cls, path, directory):
+        """
+        Carica l'indice da file JSON (vuoto se il file non esiste o è di un'altra cartella).
+
+        Parametri:
+        - path (str): Percorso dell'indice.
+        - directory (str): Cartella dei README.
+
+        Ritorna:
+        - MdIndex: Indice caricato.
+        """
+        index = cls(path, directory)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return index
+        if data.get("directory") != index.directory:
+            index.stats["invalidated"] = len(data.get("files", {}))
+            return index
+        return cls(path, directory, {int(file_id): name for file_id, name in data.get("files", {}).items()})
+
+    def save(self):
+        """
+        Salva l'indice su disco in modo atomico.
+        """
+        data = {"directory": self.directory,
+                "files": {str(file_id): name for file_id, name in sorted(self.names.items())}}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def _assign(self, file_id, name):
+        self.names[file_id] = name
+        self.ids[name] = file_id
+        self.stats["added"] += 1
+
+    def update(self):
+        """
+        Aggiunge all'indice i README nuovi della cartella, senza modificarla.
+
+        Ritorna:
+        - list: Coppie (ID, nome del file) dei README presenti, in ordine di ID.
+        """
+        with os.scandir(self.directory) as entries:
+            present = sorted(entry.name for entry in entries if entry.name.endswith('.md') and entry.is_file())
+        new_names = []
+        for name in present:
+            if name in self.ids:
+                continue
+            match = NUMERIC_NAME_PATTERN.match(name)
+            if match and int(match.group(1)) not in self.names:
+                self._assign(int(match.group(1)), name)
+            else:
+                new_names.append(name)
+        for name in new_names:
+            while self._next_id in self.names:
+                self._next_id += 1
+            self._assign(self._next_id, name)
+
+        present = set(present)
+        self.stats["missing"] = sum(1 for name in self.ids if name not in present)
+        return sorted((file_id, name) for file_id, name in self.names.items() if name in present)
+
+    def summary(self):
+        """
+        Riepilogo dell'aggiornamento.
+
+        Ritorna:
+        - str: Testo con file indicizzati, nuovi e non più presenti.
+        """
+        text = (f"{len(self.names)} file indicizzati, {self.stats['added']} nuovi, "
+                f"{self.stats['missing']} non più presenti")
+        if self.stats["invalidated"]:
+            text += f", indice di un'altra cartella scartato ({self.stats['invalidated']} file)"
+        return text
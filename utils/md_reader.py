@@ -0,0 +1,267 @@
+import codecs
+import mmap
+import threading
+from collections import Counter
+
+# Esito della lettura di un file Markdown
+READ_OK = "ok"                    # UTF-8 senza BOM
+READ_BOM = "bom"                  # Codifica indicata dal BOM (UTF-8, UTF-16 o UTF-32)
+READ_FALLBACK = "fallback"        # Non UTF-8: UTF-16 senza BOM, cp1252 o latin-1
+READ_MISSING = "missing"          # File inesistente o non leggibile
+READ_BINARY = "binary"            # Byte nulli in un file non UTF-8/UTF-16: non è testo
+READ_UNDECODABLE = "undecodable"  # Contenuto non valido per la codifica del suo BOM
+READ_TRUNCATED = "truncated"      # Oltre la dimensione massima: letto fino all'ultima riga entro il limite
+READ_TOO_LARGE = "too_large"      # Oltre la dimensione massima e saltato (o senza righe entro il limite)
+READ_TIMEOUT = "timeout"          # Analisi oltre il tempo massimo (esito registrato dall'analizzatore)
+
+# Esiti per cui il file viene analizzato come vuoto
+SKIPPED_STATUSES = (READ_MISSING, READ_BINARY, READ_UNDECODABLE, READ_TOO_LARGE, READ_TIMEOUT)
+
+# Cosa fare dei file oltre la dimensione massima
+OVERSIZE_TRUNCATE = "truncate"
+OVERSIZE_SKIP = "skip"
+OVERSIZE_POLICIES = (OVERSIZE_TRUNCATE, OVERSIZE_SKIP)
+
+# Sopra questa dimensione il file viene mappato in memoria e decodificato senza copiarne i byte
+MMAP_MIN_SIZE = 1 << 16
+
+# BOM riconosciuti, dal più lungo (il BOM UTF-32 LE inizia con quello UTF-16 LE)
+BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+]
+
+# Codifiche provate, in ordine, se il file non è UTF-8 (latin-1 decodifica qualunque byte)
+FALLBACK_ENCODINGS = ("cp1252", "latin-1")
+
+
+def detect_bom(data):
+    """
+    Codifica indicata dal BOM all'inizio dei dati.
+
+    Parametri:
+    - data (bytes | mmap): Contenuto del file.
+
+    Ritorna:
+    - tuple: (codifica, lunghezza del BOM), oppure (None, 0) se non c'è BOM.
+    """
+    head = bytes(data[:4])
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding, len(bom)
+    return None, 0
+
+
+def sniff_utf16(data):
+    """
+    Riconosce un file UTF-16 senza BOM dai byte nulli alternati all'inizio (testo ASCII).
+
+    Ritorna:
+    - str | None: "utf-16-le", "utf-16-be" oppure None.
+    """
+    head = bytes(data[:4])
+    if len(head) < 4:
+        return None
+    if head[0] and not head[1] and head[2] and not head[3]:
+        return "utf-16-le"
+    if not head[0] and head[1] and not head[2] and head[3]:
+        return "utf-16-be"
+    return None
+
+
+def truncation_point(data, max_bytes, encoding, skip):
+    """
+    Fine dell'ultima riga completa entro i primi max_bytes byte.
+
+    Parametri:
+    - data (bytes | mmap): Contenuto del file.
+    - max_bytes (int): Dimensione massima.
+    - encoding (str): Codifica (per riconoscere l'a capo in UTF-16 e UTF-32).
+    - skip (int): Lunghezza del BOM.
+
+    Ritorna:
+    - int: Byte da decodificare (skip se entro il limite non c'è un a capo).
+    """
+    newline = "\n".encode(encoding.replace("-sig", ""))
+    end = max_bytes
+    while True:
+        position = data.rfind(newline, skip, end)
+        if position == -1:
+            return skip
+        if (position - skip) % len(newline) == 0:
+            return position + len(newline)
+        end = position + len(newline) - 1  # A capo non allineato ai caratteri: si cerca più indietro
+
+
+def decode_markdown(data, max_bytes=None):
+    """
+    Decodifica il contenuto di un file Markdown con la catena di codifiche.
+
+    Prova, in ordine: la codifica del BOM (se presente, è vincolante),
+    UTF-16 senza BOM, UTF-8 e infine cp1252 / latin-1. I file con byte
+    nulli che non sono UTF-8 vengono considerati binari. Come la lettura
+    in modalità testo, i fine riga \\r\\n e \\r diventano \\n.
+    Oltre max_bytes si decodificano solo le righe complete entro il limite.
+
+    Parametri:
+    - data (bytes | mmap): Contenuto del file (non viene copiato).
+    - max_bytes (int | None): Dimensione massima (None = senza limite).
+
+    Ritorna:
+    - tuple: (testo, codifica o None, esito READ_*).
+    """
+    if not len(data):
+        return "", "utf-8", READ_OK
+    encoding, skip = detect_bom(data)
+    end = len(data)
+    if max_bytes is not None and end > max_bytes:
+        end = truncation_point(data, max_bytes, encoding or sniff_utf16(data) or "utf-8", skip)
+        if end == skip:
+            return "", encoding, READ_TOO_LARGE
+    with memoryview(data) as full, full[:end] as view:
+        if encoding is not None:
+            try:
+                text, status = str(view[skip:], encoding), READ_BOM
+            except UnicodeDecodeError:
+                return "", encoding, READ_UNDECODABLE
+        else:
+            text, encoding, status = _decode_without_bom(data, view)
+    if status in SKIPPED_STATUSES:
+        return text, encoding, status
+    if end < len(data):
+        status = READ_TRUNCATED
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text, encoding, status
+
+
+def _decode_without_bom(data, view):
+    """
+    Catena di decodifica per i file senza BOM (vedi decode_markdown).
+    """
+    encoding = sniff_utf16(data)
+    if encoding is not None:
+        try:
+            return str(view, encoding), encoding, READ_FALLBACK
+        except UnicodeDecodeError:
+            pass
+    try:
+        return str(view, "utf-8"), "utf-8", READ_OK
+    except UnicodeDecodeError:
+        pass
+    if data.find(b"\x00", 0, len(view)) != -1:
+        return "", None, READ_BINARY
+    for encoding in FALLBACK_ENCODINGS:
+        try:
+            return str(view, encoding), encoding, READ_FALLBACK
+        except UnicodeDecodeError:
+            continue
+    return "", None, READ_UNDECODABLE
+
+
+def read_markdown(md_file, max_bytes=None, oversize=OVERSIZE_TRUNCATE):
+    """
+    Legge e decodifica un file Markdown locale.
+
+    I file fino a MMAP_MIN_SIZE byte vengono letti normalmente; quelli più
+    grandi vengono mappati in memoria e decodificati direttamente dalla
+    mappa, senza una copia intermedia dei byte (e, se troncati, senza
+    leggere la parte oltre il limite).
+
+    Parametri:
+    - md_file (str): Percorso del file Markdown.
+    - max_bytes (int | None): Dimensione massima (None = senza limite).
+    - oversize (str): Per i file oltre il limite: OVERSIZE_TRUNCATE o OVERSIZE_SKIP.
+
+    Ritorna:
+    - tuple: (testo, codifica o None, esito READ_*). Il testo è vuoto se il file è saltato.
+    """
+    try:
+        with open(md_file, 'rb') as file:
+            size = file.seek(0, 2)
+            if max_bytes is not None and size > max_bytes and oversize == OVERSIZE_SKIP:
+                return "", None, READ_TOO_LARGE
+            if size < MMAP_MIN_SIZE:
+                file.seek(0)
+                return decode_markdown(file.read(), max_bytes)
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return decode_markdown(data, max_bytes)
+    except OSError:
+        return "", None, READ_MISSING
+
+
+class ReadReport:
+    """
+    Esiti delle letture: quanti file per esito e quali file sono stati saltati.
+
+    Può essere usato da più thread.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.encodings = Counter()  # Codifiche diverse da UTF-8 usate per decodificare
+        self.skipped = {}  # Percorso -> esito dei file saltati
+        self.truncated = []  # File letti solo fino alla dimensione massima
+        self._lock = threading.Lock()
+
+    def add(self, md_file, encoding, status):
+        """
+        Registra l'esito della lettura di un file.
+
+        Parametri:
+        - md_file (str): Percorso del file.
+        - encoding (str | None): Codifica usata.
+        - status (str): Esito READ_*.
+        """
+        with self._lock:
+            self.counts[status] += 1
+            if status in SKIPPED_STATUSES:
+                self.skipped[md_file] = status
+                return
+            if status == READ_TRUNCATED:
+                self.truncated.append(md_file)
+            if encoding != "utf-8":
+                self.encodings[encoding] += 1
+
+    def skip(self, md_file, status):
+        """
+        Segna come saltato un file già letto (es. analisi oltre il tempo massimo).
+
+        Parametri:
+        - md_file (str): Percorso del file.
+        - status (str): Esito READ_*.
+        """
+        with self._lock:
+            self.skipped[md_file] = status
+
+    def rows(self):
+        """
+        Ritorna:
+        - list: Tuple (file, esito) dei file saltati e di quelli troncati.
+        """
+        with self._lock:
+            return list(self.skipped.items()) + [(md_file, READ_TRUNCATED) for md_file in self.truncated]
+
+    def summary(self):
+        """
+        Riepilogo delle letture.
+
+        Ritorna:
+        - str: File letti, decodificati con altre codifiche e saltati (per esito).
+        """
+        total = sum(self.counts.values())
+        text = f"{total} file letti"
+        if self.encodings:
+            text += ", altre codifiche: " + ", ".join(f"{encoding} {count}"
+                                                      for encoding, count in self.encodings.most_common())
+        counts = Counter(self.skipped.values())
+        skipped = [f"{status} {counts[status]}" for status in SKIPPED_STATUSES if counts[status]]
+        text += f", {len(self.skipped)} saltati"
+        if skipped:
+            text += f" ({', '.join(skipped)})"
+        if self.truncated:
+            text += f", {len(self.truncated)} troncati"
+        return text
@@ -0,0 +1,228 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from utils.data_records import Section
+
+# Analisi conservate al massimo (oltre, si eliminano quelle usate meno di recente)
+DEFAULT_MAX_ENTRIES = 50000
+
+# Analisi decodificate tenute in memoria (le altre si rileggono dal database)
+DEFAULT_MEMORY_ENTRIES = 4096
+
+# Accessi accumulati prima di una scrittura automatica su disco
+FLUSH_EVERY = 1000
+
+
+def categories_hash(categories):
+    """
+    Impronta del dizionario delle categorie.
+
+    L'ordine delle categorie conta (vince la prima che corrisponde), quindi
+    le chiavi non vengono ordinate.
+
+    Parametri:
+    - categories (dict): Categorie e relative parole chiave.
+
+    Ritorna:
+    - str: Digest sha256 esadecimale.
+    """
+    return hashlib.sha256(json.dumps(categories, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def encode_sections(sections):
+    """
+    Serializza in JSON le sezioni restituite da analyze_md_text.
+    """
+    return json.dumps([section.to_list() for section in sections], ensure_ascii=False)
+
+
+def decode_sections(data):
+    """
+    Ricostruisce le sezioni (record Section) dal JSON.
+    """
+    return [Section.from_list(values) for values in json.loads(data)]
+
+
+class ParseCache:
+    """
+    Cache persistente (SQLite) dei risultati di analyze_md_text.
+
+    La chiave è (hash del contenuto del README, hash delle categorie,
+    versione dell'analizzatore): cambiare tipologia.json o la logica di
+    analisi invalida automaticamente i risultati. Si usa come il dizionario
+    analysis_cache di extract_sections_recursive (get e assegnazione per hash
+    del contenuto); gli accessi vengono scritti su disco in blocco ogni
+    FLUSH_EVERY accessi e da close(), applicando anche il limite di dimensione
+    (si eliminano le analisi usate meno di recente). In memoria restano solo
+    le ultime memory_entries analisi, così la memoria non cresce con il corpus.
+    Può essere usata da più thread.
+    """
+
+    def __init__(self, path, categories, version, max_entries=DEFAULT_MAX_ENTRIES, clock=time.time,
+                 memory_entries=DEFAULT_MEMORY_ENTRIES):
+        """
+        Parametri:
+        - path (str): Percorso del database SQLite.
+        - categories (dict): Categorie usate dall'analisi.
+        - version (int): Versione dell'analizzatore (analyzer_version()).
+        - max_entries (int): Numero massimo di analisi conservate.
+        - clock (callable): Orologio usato per l'ordine LRU.
+        - memory_entries (int): Analisi decodificate tenute in memoria.
+        """
+        self.path = path
+        self.categories_hash = categories_hash(categories)
+        self.version = version
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.stats = Counter()
+        self._clock = clock
+        self._memory = OrderedDict()  # Ultime analisi lette o calcolate in questa esecuzione
+        self._used = {}     # content_hash -> istante dell'ultimo uso, da scrivere su disco
+        self._new = {}      # content_hash -> sezioni serializzate, da inserire
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS analyses (
+                content_hash TEXT NOT NULL,
+                categories_hash TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                sections TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (content_hash, categories_hash, version)
+            )""")
+        self._db.execute("CREATE INDEX IF NOT EXISTS analyses_last_used ON analyses (last_used)")
+
+    def get(self, content_hash, default=None):
+        """
+        Restituisce le sezioni analizzate di un contenuto, contando hit e miss.
+
+        Parametri:
+        - content_hash (str): Hash del contenuto (text_hash).
+        - default: Valore restituito se l'analisi non è in cache.
+
+        Ritorna:
+        - list | None: Sezioni come analyze_md_text, oppure default.
+        """
+        with self._lock:
+            sections = self._memory.get(content_hash)
+            if sections is None:
+                data = self._new.get(content_hash)  # Calcolata ma non ancora scritta su disco
+                if data is None:
+                    row = self._db.execute(
+                        "SELECT sections FROM analyses WHERE content_hash = ? AND categories_hash = ? AND version = ?",
+                        (content_hash, self.categories_hash, self.version)).fetchone()
+                    if row is None:
+                        self.stats["miss"] += 1
+                        return default
+                    data = row[0]
+                sections = decode_sections(data)
+            self._remember(content_hash, sections)
+            self.stats["hit"] += 1
+            self._used[content_hash] = self._clock()
+            pending = len(self._used)
+        if pending >= FLUSH_EVERY:
+            self.flush()
+        return sections
+
+    def __setitem__(self, content_hash, sections):
+        with self._lock:
+            self._remember(content_hash, sections)
+            self._new[content_hash] = encode_sections(sections)
+            self._used[content_hash] = self._clock()
+            pending = len(self._used)
+        if pending >= FLUSH_EVERY:
+            self.flush()
+
+    def _remember(self, content_hash, sections):
+        # Da chiamare con il lock acquisito
+        self._memory[content_hash] = sections
+        self._memory.move_to_end(content_hash)
+        if len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def flush(self):
+        """
+        Scrive su disco le nuove analisi e gli accessi, poi applica il limite LRU.
+        """
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO analyses VALUES (?, ?, ?, ?, ?)",
+                [(key, self.categories_hash, self.version, data, self._used[key]) for key, data in self._new.items()])
+            self._db.executemany(
+                "UPDATE analyses SET last_used = ? WHERE content_hash = ? AND categories_hash = ? AND version = ?",
+                [(used, key, self.categories_hash, self.version) for key, used in self._used.items()
+                 if key not in self._new])
+            self._new.clear()
+            self._used.clear()
+
+            excess = self._db.execute("SELECT COUNT(*) FROM analyses").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self._db.execute("DELETE FROM analyses WHERE rowid IN "
+                                 "(SELECT rowid FROM analyses ORDER BY last_used LIMIT ?)", (excess,))
+                self.stats["evicted"] += excess
+
+    def worker_index(self):
+        """
+        Chiavi della cache da passare ai processi del pool di analisi.
+
+        Le analisi in attesa vengono prima scritte su disco, così i worker le
+        trovano nel database.
+
+        Ritorna:
+        - ParseCacheIndex: Vista in sola lettura delle chiavi.
+        """
+        self.flush()
+        return ParseCacheIndex(self.path, self.categories_hash, self.version)
+
+    def close(self):
+        """
+        Salva le modifiche e chiude il database.
+        """
+        self.flush()
+        self._db.close()
+
+    def summary(self):
+        """
+        Riepilogo delle statistiche della cache.
+
+        Ritorna:
+        - str: Testo con hit, miss e analisi eliminate.
+        """
+        lookups = self.stats["hit"] + self.stats["miss"]
+        rate = 100 * self.stats["hit"] / lookups if lookups else 0
+        return (f"{self.stats['hit']} hit, {self.stats['miss']} miss ({rate:.0f}% hit), "
+                f"{self.stats['evicted']} analisi eliminate")
+
+
+class ParseCacheIndex:
+    """
+    Vista in sola lettura delle chiavi di una ParseCache (in per hash del contenuto).
+
+    Si serializza con il solo percorso del database e l'impronta di categorie
+    e versione, non con le analisi: la connessione viene aperta al primo
+    controllo nel processo che la riceve.
+    """
+
+    def __init__(self, path, categories_hash, version):
+        self.path = path
+        self.categories_hash = categories_hash
+        self.version = version
+        self._db = None
+
+    def __getstate__(self):
+        return self.path, self.categories_hash, self.version
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def __contains__(self, content_hash):
+        if self._db is None:
+            self._db = sqlite3.connect(self.path)
+        row = self._db.execute(
+            "SELECT 1 FROM analyses WHERE content_hash = ? AND categories_hash = ? AND version = ?",
+            (content_hash, self.categories_hash, self.version)).fetchone()
+        return row is not None
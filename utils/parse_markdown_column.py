@@ -1,9 +1,26 @@
 # ── LIBRERIE ──────────────────────────────────────────────────────
 import re
 import json
+import contextlib
+import functools
+import hashlib
 import os
-import urllib.request
+import signal
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from markdown_it import MarkdownIt  # Parser Markdown
+import requests
+
+import utils.fetch_scheduler as fs  # Rate limit, timeout e retry delle richieste
+import utils.line_scanner as ls  # Motore alternativo: scanner a righe
+import utils.md_reader as mr  # Lettura dei file con BOM e codifiche di ripiego
+import utils.run_profiler as rp  # Tempi per stadio e per file (--profile)
+import utils.title_memo as tm  # Memo dei titoli già classificati
+from utils.parse_cache import categories_hash
+from utils.data_records import FileRecord, Section  # Record compatti di file e sezioni
+from utils.line_scanner import ScannerFallback, line_offsets
 
 
 # ── FUNZIONI DI SUPPORTO FILE ─────────────────────────────────────
@@ -12,34 +29,74 @@ def download_md_text(md_file):
     """
     Legge e restituisce il contenuto di un file Markdown locale.
 
+    Il file viene decodificato con la catena di codifiche di md_reader
+    (BOM, UTF-8, cp1252, latin-1) e l'esito viene registrato nel
+    resoconto delle letture (vedi get_read_report).
+
     Parametri:
     - md_file (str): Percorso del file Markdown.
 
     Ritorna:
-    - str: Contenuto testuale del file, oppure stringa vuota in caso di errore.
+    - str: Contenuto testuale del file, oppure stringa vuota se il file
+      non esiste, è binario, non è decodificabile o supera la dimensione
+      massima con OVERSIZE_SKIP (vedi set_parse_budget).
     """
-    try:
-        with open(md_file, 'r', encoding='utf-8') as file:
-            return file.read()
-    except (FileNotFoundError, UnicodeDecodeError):
-        return ""
+    with rp.current.stage("read"):
+        md_text, encoding, status = mr.read_markdown(md_file, max_file_bytes, oversize_policy)
+    read_report.add(md_file, encoding, status)
+    return md_text
+
+
+# Esiti delle letture dei file Markdown (file saltati e codifiche usate)
+read_report = mr.ReadReport()
+
 
+def get_read_report():
+    """
+    Ritorna:
+    - ReadReport: Resoconto delle letture fatte da download_md_text.
+    """
+    return read_report
 
-def download_markdown_file(url, destination_path):
+
+def reset_read_report():
+    """
+    Azzera il resoconto delle letture (es. prima di una nuova elaborazione).
+
+    Ritorna:
+    - ReadReport: Il nuovo resoconto.
+    """
+    global read_report
+    read_report = mr.ReadReport()
+    return read_report
+
+
+def download_markdown_file(url, destination_path, scheduler=None):
     """
     Scarica un file Markdown da un URL remoto e lo salva localmente.
 
     Parametri:
     - url (str): Indirizzo del file Markdown.
     - destination_path (str): Percorso locale in cui salvare il file.
+    - scheduler (FetchScheduler | None): Scheduler delle richieste (rate limit, timeout,
+      retry e report dei fallimenti); None per quello condiviso del processo.
 
     Ritorna:
     - bool: True se il download è riuscito, False altrimenti.
     """
+    if scheduler is None:
+        scheduler = fs.default_scheduler()
     try:
-        urllib.request.urlretrieve(url, destination_path)
+        response = scheduler.get(url)
+        response.raise_for_status()
+        # Scrittura atomica: un file interrotto a metà non resta su disco per le esecuzioni successive
+        tmp_path = destination_path + ".part"
+        with open(tmp_path, 'wb') as file:
+            file.write(response.content)
+        os.replace(tmp_path, destination_path)
         return True
-    except Exception as e:
+    except (requests.RequestException, OSError) as e:
+        scheduler.record_failure(url, e)  # Finisce nel report dei download falliti
         print(f"Errore durante il download di {url}: {e}")
         return False
 
@@ -60,28 +117,129 @@ def load_categories_from_json(json_file):
         return json.load(file)
 
 
+# Pattern di clean_text, compilati una volta
+MD_LINK_PATTERN = re.compile(r'\[.*?\]\(.*?\)')   # Link in formato Markdown
+HTML_TAG_PATTERN = re.compile(r'<.*?>')            # Tag HTML
+URL_PATTERN = re.compile(r'http[s]?://\S+')        # URL
+
+# Byte ASCII da eliminare: tutto tranne lettere e spazi (gli stessi spazi di \s nelle regex)
+NON_ALPHA_BYTES = bytes(c for c in range(128) if not (chr(c).isalpha() or chr(c).isspace()))
+
+
 def clean_text(md_text):
     """
     Pulisce il testo Markdown rimuovendo link, HTML, emoji e simboli non alfabetici.
 
+    Le tre sostituzioni con regex restano in sequenza (ognuna lavora sul
+    risultato della precedente) ma vengono saltate se il testo non contiene
+    il loro carattere di innesco; emoji, caratteri non ASCII e simboli sono
+    rimossi in un solo passaggio con encode + bytes.translate.
+
     Parametri:
     - md_text (str): Testo Markdown da pulire.
 
     Ritorna:
     - str: Testo ripulito, pronto per l’analisi.
     """
-    md_text = re.sub(r'\[.*?\]\(.*?\)', '', md_text)     # Link in formato Markdown
-    md_text = re.sub(r'<.*?>', '', md_text)              # Tag HTML
-    md_text = re.sub(r'http[s]?://\S+', '', md_text)     # URL
-    md_text = re.sub(r'[^\x00-\x7F]+', '', md_text)      # Emoji / caratteri non ASCII
-    md_text = re.sub(r'[^a-zA-Z\s]', '', md_text)        # Simboli non alfabetici
-    return md_text.strip()
+    if '](' in md_text:
+        md_text = MD_LINK_PATTERN.sub('', md_text)
+    if '<' in md_text:
+        md_text = HTML_TAG_PATTERN.sub('', md_text)
+    if 'http' in md_text:
+        md_text = URL_PATTERN.sub('', md_text)
+    # Emoji / caratteri non ASCII e simboli non alfabetici
+    return md_text.encode('ascii', 'ignore').translate(None, NON_ALPHA_BYTES).decode('ascii').strip()
+
+
+class CategoryMatcher:
+    """
+    Classificatore dei titoli compilato una volta dalle categorie del JSON.
+
+    Tutte le parole chiave (più il nome della categoria, come ultima parola
+    chiave) finiscono in un'unica espressione regolare: un'alternativa per
+    categoria, nell'ordine del JSON, ciascuna con un lookahead che cerca una
+    qualsiasi delle sue parole chiave nel titolo. Il motore prova le
+    alternative in ordine, quindi vince la prima categoria con una
+    corrispondenza, come nel confronto parola per parola. Il dizionario delle
+    categorie non viene modificato.
+    """
+
+    def __init__(self, categories):
+        self.names = []
+        alternatives = []
+        for category_name, category_data in categories.items():
+            keywords = list(category_data["keywords"]) + [category_name]
+            pattern = "|".join(re.escape(keyword.lower()) for keyword in keywords)
+            alternatives.append(f"(?=.*?(?:{pattern}))()")
+            self.names.append(category_name)
+        self.pattern = re.compile("^(?:" + "|".join(alternatives) + ")", re.DOTALL) if alternatives else None
+        # Titoli già puliti e classificati con queste categorie
+        self.titles = tm.TitleMemo(f"{categories_hash(categories)}:{ANALYZER_VERSION}")
+
+    def match(self, cleaned_title):
+        """
+        Restituisce la categoria del titolo, oppure None se nessuna parola chiave compare.
+        """
+        if self.pattern is None:
+            return None
+        found = self.pattern.match(cleaned_title.lower())
+        return self.names[found.lastindex - 1] if found else None
+
+    def clean_and_match(self, heading):
+        """
+        Ritorna:
+        - tuple: (titolo pulito, categoria o None) del testo di un titolo.
+        """
+        title = clean_text(heading)
+        return title, self.match(title)
+
+    def profiled_clean_and_match(self, heading):
+        """
+        Come clean_and_match, misurando gli stadi clean_text e categorize_title.
+        """
+        with rp.current.stage("clean_text"):
+            title = clean_text(heading)
+        with rp.current.stage("categorize_title"):
+            return title, self.match(title)
+
+
+# Matcher già compilati, per identità del dizionario delle categorie
+# (il dizionario resta referenziato, quindi il suo id non può essere riusato)
+_matchers = {}
+_matchers_lock = threading.Lock()
+MAX_MATCHERS = 8
+
+
+def get_category_matcher(categories):
+    """
+    Restituisce il matcher compilato per un dizionario di categorie (creato al primo uso).
+
+    Il dizionario va trattato come immutabile dopo il primo utilizzo.
+
+    Parametri:
+    - categories (dict): Categorie e relative parole chiave.
+
+    Ritorna:
+    - CategoryMatcher: Matcher delle categorie.
+    """
+    with _matchers_lock:
+        cached = _matchers.get(id(categories))
+        if cached is not None and cached[0] is categories:
+            return cached[1]
+        matcher = CategoryMatcher(categories)
+        if len(_matchers) >= MAX_MATCHERS:
+            _matchers.pop(next(iter(_matchers)))
+        _matchers[id(categories)] = (categories, matcher)
+        return matcher
 
 
 def categorize_title(cleaned_title, categories):
     """
     Assegna una categoria a un titolo sulla base delle parole chiave.
 
+    La prima categoria (nell'ordine del JSON) che ha una parola chiave, o il
+    proprio nome, contenuta nel titolo vince.
+
     Parametri:
     - cleaned_title (str): Titolo già pulito.
     - categories (dict): Categorie e relative parole chiave.
@@ -89,72 +247,213 @@ def categorize_title(cleaned_title, categories):
     Ritorna:
     - str | None: Categoria assegnata oppure None se nessuna corrispondenza.
     """
-    for category_name, category_data in categories.items():
-        keywords = category_data["keywords"]
-        keywords.append(category_name)  # Include anche il nome della categoria come keyword
-        for keyword in keywords:
-            if re.search(re.escape(keyword.lower()), cleaned_title.lower()):
-                return category_name
-    return None
+    return get_category_matcher(categories).match(cleaned_title)
+
+
+def title_category(heading, categories):
+    """
+    Pulisce e classifica il testo di un titolo, passando dal memo dei titoli delle categorie.
+
+    Parametri:
+    - heading (str): Testo del titolo nel Markdown.
+    - categories (dict): Categorie e relative parole chiave.
+
+    Ritorna:
+    - tuple: (titolo pulito, categoria o None).
+    """
+    matcher = get_category_matcher(categories)
+    return matcher.titles.get(heading, matcher.clean_and_match)
+
+
+def title_classifier(categories):
+    """
+    Funzione titolo -> (titolo pulito, categoria) da usare per un intero file.
+
+    Il profiler viene controllato una volta sola: se è attivo la funzione
+    misura gli stadi clean_text e categorize_title, altrimenti passa solo dal
+    memo dei titoli e i titoli non pagano nulla per la misura dei tempi.
+
+    Parametri:
+    - categories (dict): Categorie e relative parole chiave.
+
+    Ritorna:
+    - callable: Testo di un titolo -> (titolo pulito, categoria o None).
+    """
+    matcher = get_category_matcher(categories)
+    compute = matcher.profiled_clean_and_match if rp.current.enabled else matcher.clean_and_match
+    return functools.partial(matcher.titles.get, compute=compute)
+
+
+def get_title_memo(categories):
+    """
+    Memo dei titoli usato con un dizionario di categorie (per statistiche e salvataggio).
+    """
+    return get_category_matcher(categories).titles
+
+
+def load_title_memo(path, categories, max_entries=tm.DEFAULT_MAX_TITLES):
+    """
+    Carica il memo dei titoli salvato e lo usa per le categorie indicate.
+
+    Se le categorie (o la versione dell'analisi) sono cambiate rispetto al
+    salvataggio il memo parte vuoto.
+
+    Parametri:
+    - path (str): File del memo.
+    - categories (dict): Categorie e relative parole chiave.
+    - max_entries (int): Numero massimo di titoli memorizzati.
+
+    Ritorna:
+    - TitleMemo: Memo in uso, da salvare con save() a fine esecuzione.
+    """
+    matcher = get_category_matcher(categories)
+    matcher.titles = tm.TitleMemo.load(path, matcher.titles.fingerprint, max_entries)
+    return matcher.titles
 
 
 # ── PARSING MARKDOWN ──────────────────────────────────────────────
 
+# Regole di markdown-it (preset commonmark) disattivate perché non servono all'analisi,
+# che legge solo titoli h1-h4 (con token.map), immagini, link e il loro testo:
+# - emphasis, balance_pairs, fragments_join: enfasi (*a*, **b**) e relativa post-elaborazione;
+# - newline: interruzioni di riga (softbreak/hardbreak), il testo resta uguale a meno di spazi.
+# (strikethrough e table non fanno parte del preset commonmark: sono già spente.)
+# Restano attive, oltre a quelle di struttura (paragraph, heading, lheading, text):
+# - code, fence, html_block: i titoli e i link al loro interno non contano;
+# - blockquote, list, hr: decidono dove stanno i titoli e se "---" sottolinea un titolo;
+# - reference: le definizioni [id]: url danno l'indirizzo ai link per riferimento;
+# - escape, backticks, html_inline, autolink: decidono cosa è un link ("\[", `[a](b)`, tag HTML, <url>);
+# - entity: un testo di link fatto solo di entità (es. &nbsp;) resta vuoto e il link non conta;
+# - normalize, block, inline, text_join: catena di base (text_join unisce il testo degli escape).
+# Per riattivarne una: configure_md_parser(enable=["emphasis"]).
+DISABLED_MD_RULES = ("emphasis", "balance_pairs", "fragments_join", "newline")
+
+# Post-elaborazione necessaria a enfasi e strikethrough: si riattiva insieme a loro
+DELIMITER_RULES = ("balance_pairs", "fragments_join")
+
+# Testo che attraversa tutte le catene di regole, per compilarne le cache prima dell'uso concorrente
+_WARMUP_TEXT = "# a\n\n> b\n\n- [c](d) ![e](f) `g` *h*\n\n[i]: j\n"
+
+
+def build_md_parser(enable=(), disable=DISABLED_MD_RULES):
+    """
+    Crea un parser markdown-it configurato per l'analisi dei README.
+
+    Parametri:
+    - enable (iterable): Regole da riattivare fra quelle disattivate (es. "emphasis")
+      o da attivare in più (es. "table", "strikethrough").
+    - disable (iterable): Regole da disattivare.
+
+    Ritorna:
+    - MarkdownIt: Parser pronto, utilizzabile da più thread.
+    """
+    md = MarkdownIt()
+    if "emphasis" in enable or "strikethrough" in enable:
+        enable = list(enable) + [rule for rule in DELIMITER_RULES if rule not in enable]
+    rules = [rule for rule in disable if rule not in enable]
+    if rules:
+        md.disable(rules)
+    if enable:
+        md.enable(list(enable))
+    # markdown-it compila le catene di regole al primo parse senza lock:
+    # un parse iniziale le prepara, così il parser può essere condiviso fra thread
+    md.parse(_WARMUP_TEXT)
+    return md
+
+
+# Parser condiviso, creato una volta per processo
+md_parser = build_md_parser()
+
+# Se il parser condiviso non ha le regole predefinite (lo scanner a righe allora usa sempre markdown-it)
+md_parser_customized = False
+
+
+def configure_md_parser(enable=(), disable=DISABLED_MD_RULES):
+    """
+    Sostituisce il parser condiviso (es. per riattivare regole disattivate).
+
+    Parametri:
+    - enable (iterable): Regole da attivare.
+    - disable (iterable): Regole da disattivare.
+
+    Ritorna:
+    - MarkdownIt: Nuovo parser condiviso.
+    """
+    global md_parser, md_parser_customized
+    md_parser = build_md_parser(enable, disable)
+    md_parser_customized = bool(enable) or set(disable) != set(DISABLED_MD_RULES)
+    return md_parser
+
+
 def extract_md_tokens(md_text):
     """
     Esegue il parsing del testo Markdown e restituisce i token.
 
+    Usa il parser condiviso del modulo: ogni parse ha uno stato proprio,
+    quindi la funzione può essere chiamata da più thread contemporaneamente.
+
     Parametri:
     - md_text (str): Contenuto di un file Markdown.
 
     Ritorna:
     - list: Lista di token Markdown (oggetti markdown-it).
     """
-    md = MarkdownIt()
-    return md.parse(md_text)
+    with rp.current.stage("tokenize"):
+        return md_parser.parse(md_text)
+
+
+def section_char_count(md_text, start, end):
+    """
+    Numero di caratteri (dopo la pulizia) del testo compreso fra due offset.
+    """
+    with rp.current.stage("section_length"):
+        return len(clean_text(md_text[start:end].strip()))
 
 
 def find_titles_md(md_text, categories):
     """
     Analizza il Markdown per trovare titoli, contare immagini, link, video e codice.
 
+    La lunghezza di ogni sezione è calcolata nello stesso passaggio sui token:
+    va dalla riga dopo il titolo (token.map) alla riga del titolo successivo,
+    quindi è corretta anche con titoli ripetuti o citati nel testo.
+
     Parametri:
     - md_text (str): Contenuto Markdown da analizzare.
     - categories (dict): Categorie per classificare i titoli.
 
     Ritorna:
-    - tuple: (titoli, immagini, num_link, link_attivi, video, codice)
+    - list[Section]: Una sezione per titolo h1-h4, nell'ordine del testo.
     """
     tokens = extract_md_tokens(md_text)
+    offsets = line_offsets(md_text)
 
     # Inizializzazione delle variabili di output
-    titles, images, links_count, links_list, videos, code_blocks = [], [], [], [], [], []
-    countim = countlink = countvideo = countcode = 0
-    current_links, link_text, link_url = [], "", ""
+    sections = []
+    classify = title_classifier(categories)
+    title = level = category = None
+    section_start = 0
+    countim = countvideo = countcode = 0
+    urls, link_text, link_url = [], "", ""
     link_active = False
-    cat = ""
 
     for i, token in enumerate(tokens):
         if token.type == 'heading_open' and token.tag in ['h1', 'h2', 'h3', 'h4']:
+            check_deadline()
+
             # Salva i dati della sezione precedente
-            if titles:
-                images.append(countim)
-                links_count.append(countlink)
-                links_list.append(current_links)
-                videos.append(countvideo)
-                code_blocks.append(countcode)
+            if title is not None:
+                char_count = section_char_count(md_text, section_start, offsets[token.map[0]])
+                sections.append(Section(title, level, category, char_count, urls, countim, countvideo, countcode))
 
             # Inizio nuova sezione
-            title_content = tokens[i + 1].content
-            cleaned_title = clean_text(title_content)
-            category = categorize_title(cleaned_title, categories)
+            title, category = classify(tokens[i + 1].content)
             level = int(token.tag[1])
-            titles.append((title_content, level, category))
+            section_start = offsets[token.map[1]]
 
             # Reset contatori
-            cat = category
-            countim = countlink = countvideo = countcode = 0
-            current_links, link_text, link_url = [], "", ""
+            countim = countvideo = countcode = 0
+            urls, link_text, link_url = [], "", ""
             link_active = False
 
         elif token.type == 'inline':
@@ -168,21 +467,45 @@ def find_titles_md(md_text, categories):
                 elif child.type == 'text' and link_active:
                     link_text += child.content.strip()
                 elif child.type == 'link_close' and link_active and link_text.strip():
-                    countlink += 1
-                    current_links.append((cat, countlink, link_url))
+                    urls.append(link_url)
                     link_active = False
                 elif child.type in ['code_block', 'inline_code']:
                     countcode += 1
 
     # Salva l’ultima sezione
-    if titles:
-        images.append(countim)
-        links_count.append(countlink)
-        links_list.append(current_links)
-        videos.append(countvideo)
-        code_blocks.append(countcode)
+    if title is not None:
+        char_count = section_char_count(md_text, section_start, len(md_text))
+        sections.append(Section(title, level, category, char_count, urls, countim, countvideo, countcode))
+
+    return sections
+
 
-    return titles, images, links_count, links_list, videos, code_blocks
+# ── MOTORE ALTERNATIVO: SCANNER A RIGHE (utils/line_scanner.py) ───
+
+def scan_titles_md(md_text, categories, fallback=True):
+    """
+    Analizza il Markdown con lo scanner a righe: stesso risultato di find_titles_md, più veloce.
+
+    Parametri:
+    - md_text (str): Contenuto Markdown da analizzare.
+    - categories (dict): Categorie per classificare i titoli.
+    - fallback (bool): Se True i testi che lo scanner non gestisce passano a
+      find_titles_md; se False solleva ScannerFallback (per misurare quanti sono).
+
+    Ritorna:
+    - list[Section]: Una sezione per titolo h1-h4, nell'ordine del testo.
+    """
+    try:
+        if md_parser_customized or ls.SCANNER_FALLBACK_PATTERN.search(md_text):
+            raise ScannerFallback("riferimenti o parser personalizzato")
+        scanner = ls.LineScanner(md_text, md_parser, title_classifier(categories),
+                                 functools.partial(section_char_count, md_text), check_deadline)
+        with rp.current.stage("scan"):
+            return scanner.scan()
+    except ScannerFallback:
+        if not fallback:
+            raise
+        return find_titles_md(md_text, categories)
 
 
 # ── CALCOLO STATISTICHE ────────────────────────────────────────────
@@ -191,6 +514,9 @@ def calculate_section_length(md_text, h_title, next_h_title):
     """
     Calcola la lunghezza (in caratteri) della sezione compresa tra due titoli.
 
+    Cerca i titoli nel testo: resta per compatibilità, ma l'analisi usa le
+    lunghezze calcolate da find_titles_md, che non dipendono dal testo dei titoli.
+
     Parametri:
     - md_text (str): Contenuto completo del file Markdown.
     - h_title (str): Titolo iniziale della sezione.
@@ -204,12 +530,215 @@ def calculate_section_length(md_text, h_title, next_h_title):
         raise ValueError(f"Titolo '{h_title}' non trovato nel testo.")
     section_start += len(h_title)
     section_end = md_text.find(next_h_title, section_start) if next_h_title else len(md_text)
-    section_text = md_text[section_start:section_end].strip()
-    return len(clean_text(section_text))
+    return section_char_count(md_text, section_start, section_end)
+
+
+# Versione della logica di analisi: va incrementata quando cambiano i risultati
+# di analyze_md_text, così le analisi salvate nella cache su disco non vengono riusate
+ANALYZER_VERSION = 2
+SCANNER_VERSION = 1
+
+# Motori di analisi: markdown-it (find_titles_md) o lo scanner a righe (scan_titles_md)
+ANALYSIS_ENGINES = {"markdown-it": find_titles_md, "scanner": scan_titles_md}
+DEFAULT_ANALYSIS_ENGINE = "markdown-it"
+
+# Motore usato da analyze_md_text in questo processo
+analysis_engine = DEFAULT_ANALYSIS_ENGINE
+
+
+def set_analysis_engine(engine):
+    """
+    Sceglie il motore usato da analyze_md_text.
+
+    Parametri:
+    - engine (str): "markdown-it" o "scanner".
+
+    Solleva:
+    - ValueError: Se il motore non esiste.
+    """
+    global analysis_engine
+    if engine not in ANALYSIS_ENGINES:
+        raise ValueError(f"Motore di analisi sconosciuto: {engine} (disponibili: {', '.join(ANALYSIS_ENGINES)})")
+    analysis_engine = engine
+
+
+def analyzer_version():
+    """
+    Versione dell'analisi per la cache su disco: i due motori non ne condividono le voci.
+    """
+    if analysis_engine == "markdown-it":
+        return ANALYZER_VERSION
+    return ANALYZER_VERSION * 100 + SCANNER_VERSION
+
+
+def analyze_md_text(md_text, categories):
+    """
+    Analizza un intero file Markdown e restituisce i dati di ogni sezione.
+
+    Usa il motore scelto con set_analysis_engine (markdown-it se non indicato).
+
+    Parametri:
+    - md_text (str): Contenuto Markdown da analizzare.
+    - categories (dict): Categorie per classificare i titoli.
+
+    Ritorna:
+    - list[Section]: Una sezione per titolo (titolo pulito, livello, categoria,
+      caratteri, link, immagini, video, codice).
+    """
+    return ANALYSIS_ENGINES[analysis_engine](md_text, categories)
+
+
+# ── BUDGET PER FILE (DIMENSIONE E TEMPO DI ANALISI) ───────────────
+
+class ParseTimeout(Exception):
+    """
+    L'analisi di un file ha superato il tempo massimo (vedi set_parse_budget).
+    """
+
+
+# Limiti per file usati in questo processo (None = senza limite)
+max_file_bytes = None
+max_parse_seconds = None
+oversize_policy = mr.OVERSIZE_TRUNCATE
+
+# Scadenza dell'analisi in corso, per thread (controllata da check_deadline)
+_deadline = threading.local()
+
+
+def set_parse_budget(max_bytes=None, max_seconds=None, oversize=mr.OVERSIZE_TRUNCATE):
+    """
+    Imposta i limiti per file: dimensione letta e tempo di analisi.
+
+    Un README oltre max_bytes viene troncato all'ultima riga completa entro
+    il limite (OVERSIZE_TRUNCATE) oppure saltato (OVERSIZE_SKIP); un'analisi
+    oltre max_seconds viene interrotta e il file risulta senza sezioni.
+    In entrambi i casi l'esito resta nel resoconto delle letture.
+
+    Parametri:
+    - max_bytes (int | None): Byte letti al massimo per file.
+    - max_seconds (float | None): Secondi di analisi al massimo per file.
+    - oversize (str): "truncate" o "skip".
+
+    Solleva:
+    - ValueError: Se oversize non è una delle due scelte.
+    """
+    global max_file_bytes, max_parse_seconds, oversize_policy
+    if oversize not in mr.OVERSIZE_POLICIES:
+        raise ValueError(f"Scelta sconosciuta per i file troppo grandi: {oversize} "
+                         f"(disponibili: {', '.join(mr.OVERSIZE_POLICIES)})")
+    max_file_bytes, max_parse_seconds, oversize_policy = max_bytes, max_seconds, oversize
+
+
+def parse_budget():
+    """
+    Ritorna:
+    - tuple: (max_bytes, max_seconds, oversize), da passare a set_parse_budget (es. nei worker).
+    """
+    return max_file_bytes, max_parse_seconds, oversize_policy
+
+
+def check_deadline():
+    """
+    Controllo cooperativo del tempo di analisi, chiamato dai cicli dei due motori.
+
+    Solleva:
+    - ParseTimeout: Se l'analisi in corso nel thread ha superato la scadenza.
+    """
+    deadline = getattr(_deadline, "at", None)
+    if deadline is not None and time.monotonic() > deadline:
+        raise ParseTimeout()
+
+
+def _raise_parse_timeout(signum, frame):
+    raise ParseTimeout()
+
+
+# Se è già stato segnalato che il tempo massimo non può interrompere markdown-it
+_watchdog_warned = False
+
+
+def _warn_without_watchdog():
+    global _watchdog_warned
+    if not _watchdog_warned:
+        _watchdog_warned = True
+        print(".. Attenzione: analisi fuori dal thread principale, il tempo massimo per file viene controllato "
+              "solo fra un titolo e l'altro (il parsing di markdown-it non può essere interrotto) ..")
+
+
+@contextlib.contextmanager
+def parse_deadline(seconds):
+    """
+    Limita il tempo del blocco a seconds secondi.
+
+    Nel thread principale (anche dei worker del pool) un timer SIGALRM
+    interrompe pure il parsing di markdown-it; negli altri thread restano
+    i controlli cooperativi di check_deadline, e la prima volta viene
+    stampato un avviso (la pipeline di download analizza quindi i README
+    nel thread principale).
+
+    Parametri:
+    - seconds (float | None): Tempo massimo (None = senza limite).
+
+    Solleva:
+    - ParseTimeout: Se il blocco supera il tempo massimo.
+    """
+    if seconds is None:
+        yield
+        return
+    watchdog = hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+    _deadline.at = time.monotonic() + seconds
+    if not watchdog:
+        _warn_without_watchdog()
+    if watchdog:
+        previous = signal.signal(signal.SIGALRM, _raise_parse_timeout)
+        signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        _deadline.at = None
+        if watchdog:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous if previous is not None else signal.SIG_DFL)
+
+
+def analyze_with_budget(md_text, categories):
+    """
+    Come analyze_md_text, ma entro il tempo massimo per file.
+
+    Ritorna:
+    - tuple: (sezioni, None), oppure (None, READ_TIMEOUT) se l'analisi è stata interrotta.
+    """
+    try:
+        with parse_deadline(max_parse_seconds):
+            return analyze_md_text(md_text, categories), None
+    except ParseTimeout:
+        return None, mr.READ_TIMEOUT
+
+
+def text_hash(md_text):
+    """
+    Hash del contenuto di un file Markdown, usato per riconoscere i README identici.
+    """
+    return hashlib.sha256(md_text.encode('utf-8', 'surrogatepass')).digest()
 
 
 # ── FUNZIONI DI INIZIALIZZAZIONE DATI ──────────────────────────────
 
+def new_file_data(file_name, link=None, source=None):
+    """
+    Crea la struttura dati vuota di un singolo file Markdown.
+
+    Parametri:
+    - file_name (str): Nome del file (es. "3.md").
+    - link (str | None): Link del repository, se presente.
+    - source (str | None): Percorso da cui leggere il file (default: file_name nella cartella dei README).
+
+    Ritorna:
+    - FileRecord: Record del file, senza sezioni.
+    """
+    return FileRecord(file_name, link, source=source)
+
+
 def initialize_data_table(num_file_md, link_list):
     """
     Inizializza una struttura dati completa per ciascun file Markdown remoto.
@@ -219,21 +748,9 @@ def initialize_data_table(num_file_md, link_list):
     - link_list (list): Lista dei link corrispondenti.
 
     Ritorna:
-    - list[dict]: Lista di dizionari inizializzati per ogni file.
+    - list[FileRecord]: Record inizializzati per ogni file.
     """
-    return [{
-        "file_name": f"{i}.md",
-        "level": [],
-        "h1_titles": [],
-        "category": [],
-        "char_counts": [],
-        "num_links": [],
-        "current_links": [],
-        "num_images": [],
-        "num_videos": [],
-        "num_code_blocks": [],
-        "link": link_list[i]
-    } for i in range(num_file_md)]
+    return [new_file_data(f"{i}.md", link_list[i]) for i in range(num_file_md)]
 
 
 def initialize_data_table2(num_file_md):
@@ -244,38 +761,23 @@ def initialize_data_table2(num_file_md):
     - num_file_md (int): Numero di file.
 
     Ritorna:
-    - list[dict]: Lista di strutture dati iniziali.
+    - list[FileRecord]: Record inizializzati per ogni file.
     """
-    return [{
-        "file_name": f"{i}.md",
-        "level": [],
-        "h1_titles": [],
-        "category": [],
-        "char_counts": [],
-        "num_links": [],
-        "current_links": [],
-        "num_images": [],
-        "num_videos": [],
-        "num_code_blocks": []
-    } for i in range(num_file_md)]
+    return [new_file_data(f"{i}.md") for i in range(num_file_md)]
 
 
 def initialize_data_table_url(num_file_md, link_list):
     """
-    Inizializza struttura minimale per analisi URL (con link remoti).
+    Inizializza la struttura per l'analisi dei soli URL (con link remoti).
 
     Parametri:
     - num_file_md (int): Numero file.
     - link_list (list): Lista dei link remoti.
 
     Ritorna:
-    - list[dict]: Strutture dati base per estrazione URL.
+    - list[FileRecord]: Record base per l'estrazione degli URL.
     """
-    return [{
-        "file_name": f"{i}.md",
-        "current_links": [],
-        "link": link_list[i]
-    } for i in range(num_file_md)]
+    return initialize_data_table(num_file_md, link_list)
 
 
 def initialize_data_table_url_2(num_file_md):
@@ -286,19 +788,429 @@ def initialize_data_table_url_2(num_file_md):
     - num_file_md (int): Numero file.
 
     Ritorna:
-    - list[dict]: Strutture dati minimali.
+    - list[FileRecord]: Record base per l'estrazione degli URL.
     """
-    return [{
-        "file_name": f"{i}.md",
-        "current_links": []
-    } for i in range(num_file_md)]
+    return initialize_data_table2(num_file_md)
 
 
-# ── FUNZIONE PRINCIPALE (RICORSIVA) ───────────────────────────────
+# ── RIEMPIMENTO DATI ──────────────────────────────────────────────
 
-def extract_sections_recursive(data_table, path_md_file, categories, processed_files=None, download_dir=None):
+def fill_file_data(file_data, md_text, categories, analysis_cache, md_file=None):
     """
-    Estrae sezioni e statistiche da Markdown, anche ricorsivamente da link a file remoti.
+    Analizza il testo di un file e ne aggiunge le sezioni alla sua struttura dati.
+
+    I README con contenuto identico (es. repository duplicati nel CSV)
+    vengono analizzati una sola volta: il risultato è riusato per ogni riga.
+    Un'analisi interrotta per il tempo massimo non aggiunge sezioni, non
+    entra nella cache e viene registrata nel resoconto delle letture.
+
+    Parametri:
+    - file_data (FileRecord): Struttura dati del file.
+    - md_text (str): Contenuto Markdown.
+    - categories (dict): Mappa delle categorie.
+    - analysis_cache (dict | ParseCache): Analisi già calcolate, per hash del contenuto.
+    - md_file (str | None): Percorso del file, per il resoconto (default: file_data.file_name).
+    """
+    key = text_hash(md_text)
+    sections = analysis_cache.get(key)
+    if sections is None:
+        sections, status = analyze_with_budget(md_text, categories)
+        if sections is None:
+            read_report.skip(md_file or file_data.file_name, status)
+            return
+        analysis_cache[key] = sections
+    add_sections(file_data, sections)
+
+
+def add_sections(file_data, sections):
+    """
+    Aggiunge alla struttura dati di un file le sezioni restituite da analyze_md_text.
+    """
+    file_data.sections.extend(sections)
+
+
+# Analisi recenti conservate in memoria durante l'elaborazione a stream
+DEFAULT_RECENT_ANALYSES = 128
+
+
+class RecentAnalyses:
+    """
+    Memo limitato delle analisi, da usare come analysis_cache.
+
+    Conserva solo le ultime max_entries analisi (per hash del contenuto):
+    i README duplicati vicini vengono analizzati una volta sola, ma la
+    memoria non cresce con il numero di file come con un dizionario.
+    """
+
+    def __init__(self, max_entries=DEFAULT_RECENT_ANALYSES):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        sections = self._data.get(key)
+        if sections is None:
+            return default
+        self._data.move_to_end(key)
+        return sections
+
+    def __setitem__(self, key, sections):
+        self._data[key] = sections
+        self._data.move_to_end(key)
+        if len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+    def keys(self):
+        return self._data.keys()
+
+
+# ── ANALISI PARALLELA (POOL DI PROCESSI) ──────────────────────────
+
+# Categorie del processo worker, caricate una volta dall'initializer del pool
+_worker_categories = None
+
+# Chiavi delle analisi già in cache viste dal processo worker (None: nessuna cache)
+_worker_cached = None
+
+# Analisi recenti del processo worker: il pool vive per tutto lo stream, i README
+# duplicati calcolati dopo la sua creazione non sono fra le chiavi dell'initializer
+_worker_recent = None
+
+# Esito di un task del pool il cui contenuto è già nella cache del processo principale
+ANALYSIS_CACHED = "cached"
+
+
+def _init_analysis_worker(categories, engine=DEFAULT_ANALYSIS_ENGINE, budget=(None, None, mr.OVERSIZE_TRUNCATE),
+                          profile=False, cached=None):
+    """
+    Initializer dei processi del pool: riceve categorie, motore, limiti per file
+    e chiavi già in cache una sola volta per worker.
+    """
+    global _worker_categories, _worker_cached, _worker_recent
+    _worker_categories = categories
+    _worker_cached = cached
+    _worker_recent = RecentAnalyses()
+    set_analysis_engine(engine)
+    set_parse_budget(*budget)
+    if profile:
+        rp.enable()
+
+
+def _analyze_file(file_path):
+    """
+    Task del pool: legge un file e, se il contenuto non è già in cache, lo
+    analizza con le categorie e i limiti del worker.
+
+    Ritorna:
+    - tuple: (hash del contenuto, sezioni o None se già in cache o interrotte,
+      (codifica, esito) della lettura, esito dell'analisi (None, ANALYSIS_CACHED
+      o READ_TIMEOUT), record dei tempi del file o None se il profiler è disattivato).
+    """
+    with rp.current.file(file_path) as record:
+        with rp.current.stage("read"):
+            md_text, encoding, read_status = mr.read_markdown(file_path, max_file_bytes, oversize_policy)
+        key = text_hash(md_text)
+        if _worker_cached is not None and key in _worker_cached:
+            sections, status = None, ANALYSIS_CACHED
+        else:
+            sections, status = _worker_recent.get(key), None
+            if sections is None:
+                sections, status = analyze_with_budget(md_text, _worker_categories)
+                if sections is not None:
+                    _worker_recent[key] = sections
+    return key, sections, (encoding, read_status), status, record
+
+
+def file_size(file_path):
+    """
+    Dimensione di un file in byte (0 se non esiste).
+    """
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
+
+
+def analysis_cache_keys(analysis_cache):
+    """
+    Chiavi di un analysis_cache da passare ai processi del pool.
+
+    Parametri:
+    - analysis_cache (dict | RecentAnalyses | ParseCache): Analisi già calcolate.
+
+    Ritorna:
+    - frozenset | ParseCacheIndex: Insieme su cui controllare gli hash con in.
+    """
+    worker_index = getattr(analysis_cache, "worker_index", None)
+    if worker_index is not None:
+        return worker_index()
+    return frozenset(analysis_cache.keys())
+
+
+class AnalysisPool:
+    """
+    Pool di processi per l'analisi dei README, riusabile per più gruppi di file.
+
+    Categorie, motore, limiti per file e chiavi di analysis_cache arrivano a
+    ogni worker una volta sola, tramite l'initializer, alla creazione del
+    pool. Ogni file viene letto una volta sola, dal worker: se il suo
+    contenuto è già in cache il worker restituisce solo l'hash e le sezioni
+    vengono prese dalla cache. I file di ogni gruppo inviato vengono
+    analizzati dal più grande, così un README enorme non resta da solo alla
+    fine; i risultati tornano comunque nell'ordine di input.
+    """
+
+    def __init__(self, categories, processes, analysis_cache=None):
+        """
+        Parametri:
+        - categories (dict): Mappa delle categorie.
+        - processes (int): Numero di processi del pool.
+        - analysis_cache (dict | RecentAnalyses | ParseCache | None): Analisi già calcolate,
+          per hash del contenuto; le nuove analisi vi vengono aggiunte.
+        """
+        self.analysis_cache = analysis_cache
+        cached = analysis_cache_keys(analysis_cache) if analysis_cache is not None else None
+        self.executor = ProcessPoolExecutor(max_workers=processes, initializer=_init_analysis_worker,
+                                            initargs=(categories, analysis_engine, parse_budget(),
+                                                      rp.current.enabled, cached))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Chiude il pool, annullando i file inviati e non ancora iniziati.
+        """
+        self.executor.shutdown(cancel_futures=True)
+
+    def submit(self, file_paths):
+        """
+        Invia un gruppo di file ai worker, dal più grande.
+
+        Ritorna:
+        - list: Future di ogni file, nell'ordine di file_paths (da passare a results).
+        """
+        futures = [None] * len(file_paths)
+        for i in sorted(range(len(file_paths)), key=lambda i: file_size(file_paths[i]), reverse=True):
+            futures[i] = self.executor.submit(_analyze_file, file_paths[i])
+        return futures
+
+    def results(self, file_paths, futures):
+        """
+        Attende le analisi di un gruppo inviato con submit.
+
+        Ritorna:
+        - list: Sezioni di ogni file (come analyze_md_text), nell'ordine di file_paths;
+          None per i file la cui analisi ha superato il tempo massimo (registrati
+          nel resoconto delle letture e lasciati fuori dalla cache).
+        """
+        outcomes = []
+        for file_path, future in zip(file_paths, futures):
+            key, sections, (encoding, read_status), status, record = future.result()
+            read_report.add(file_path, encoding, read_status)
+            if status == mr.READ_TIMEOUT:
+                read_report.skip(file_path, status)
+            if record is not None:
+                rp.current.add_file(record)
+            outcomes.append((key, sections, status))
+
+        # Prima le analisi prese dalla cache, poi quelle nuove (che in un memo limitato potrebbero eliminarle)
+        results = [self.analysis_cache.get(key) if status == ANALYSIS_CACHED else sections
+                   for key, sections, status in outcomes]
+        if self.analysis_cache is not None:
+            for key, sections, status in outcomes:
+                if status is None:
+                    self.analysis_cache[key] = sections
+        return results
+
+    def map(self, file_paths):
+        """
+        Analizza un gruppo di file e ne attende i risultati (vedi results).
+        """
+        return self.results(file_paths, self.submit(file_paths))
+
+
+def analyze_files_parallel(file_paths, categories, processes, analysis_cache=None):
+    """
+    Analizza più file Markdown su un pool di processi creato per l'occasione (vedi AnalysisPool).
+
+    Parametri:
+    - file_paths (list): Percorsi dei file da analizzare.
+    - categories (dict): Mappa delle categorie.
+    - processes (int): Numero di processi del pool.
+    - analysis_cache (dict | RecentAnalyses | ParseCache | None): Analisi già calcolate,
+      per hash del contenuto; le nuove analisi vi vengono aggiunte.
+
+    Ritorna:
+    - list: Sezioni di ogni file (come analyze_md_text), nell'ordine di file_paths;
+      None per i file la cui analisi ha superato il tempo massimo.
+    """
+    with AnalysisPool(categories, processes, analysis_cache) as pool:
+        return pool.map(file_paths)
+
+
+# ── FUNZIONE PRINCIPALE (CRAWL DEI FILE FIGLI) ────────────────────
+
+# Download contemporanei dei file figli linkati dai README
+DEFAULT_CRAWL_WORKERS = 8
+
+
+def child_md_links(file_data):
+    """
+    Restituisce, in ordine di apparizione, i link a file Markdown remoti di un file analizzato.
+    """
+    for section in file_data.sections:
+        for link_url in section.urls:
+            if link_url.lower().endswith(".md") and link_url.startswith("http://"):
+                yield link_url
+
+
+class ChildCrawler:
+    """
+    Scarica e analizza i file Markdown remoti linkati dai README, livello per livello.
+
+    La visita è in ampiezza su una frontiera esplicita (niente ricorsione,
+    quindi nessun limite di profondità dello stack): i figli di un livello
+    vengono scaricati in parallelo da un pool di thread e analizzati man mano
+    che arrivano. Ogni URL viene visitato una sola volta per tutta la durata
+    del crawler, anche se linkato da più file. Il figlio di `padre.md` si
+    chiama sempre `padre_figlio.md` e l'output segue l'ordine della visita in
+    profondità (ogni file seguito dai suoi figli), come nella versione ricorsiva.
+    Un figlio già presente nella cartella di download (es. scaricato da
+    un'esecuzione precedente) non viene riscaricato ma analizzato dal disco,
+    così resta nell'output anche rieseguendo l'elaborazione.
+    """
+
+    def __init__(self, max_depth=None, max_children=None, max_workers=DEFAULT_CRAWL_WORKERS, scheduler=None):
+        """
+        Parametri:
+        - max_depth (int | None): Profondità massima dei figli (1 = solo i link dei README), None senza limite.
+        - max_children (int | None): Figli scaricati al massimo per ogni file, None senza limite.
+        - max_workers (int): Download contemporanei.
+        - scheduler (FetchScheduler | None): Scheduler dei download dei figli (es. quello di
+          download.py, con i suoi limiti e il suo report dei fallimenti); None per quello condiviso.
+        """
+        self.max_depth = max_depth
+        self.max_children = max_children
+        self.max_workers = max_workers
+        self.scheduler = scheduler
+        self.seen_urls = set()
+
+    def next_level(self, frontier, download_dir, processed_files):
+        """
+        Sceglie i figli da scaricare per i file di un livello.
+
+        Ritorna:
+        - list[tuple]: Tuple (padre, url, nome del file, percorso) in ordine di visita.
+        """
+        tasks = []
+        scheduled = set()
+        for parent in frontier:
+            parent_file_name = os.path.splitext(os.path.basename(parent.file_name))[0]
+            count = 0
+            for link_url in child_md_links(parent):
+                if self.max_children is not None and count >= self.max_children:
+                    break
+                if link_url in self.seen_urls:
+                    continue
+                child_base_name = os.path.splitext(os.path.basename(link_url))[0]
+                combined_file_name = f"{parent_file_name}_{child_base_name}.md"
+                new_file_path = os.path.join(download_dir, combined_file_name)
+                if new_file_path in processed_files or new_file_path in scheduled:
+                    continue
+                self.seen_urls.add(link_url)
+                scheduled.add(new_file_path)
+                count += 1
+                tasks.append((parent, link_url, combined_file_name, new_file_path))
+        return tasks
+
+    def fetch(self, url, path):
+        """
+        Scarica un figlio, a meno che non sia già su disco (scaricato da un'esecuzione precedente).
+
+        Ritorna:
+        - bool: True se il file è disponibile in path.
+        """
+        return os.path.isfile(path) or download_markdown_file(url, path, self.scheduler)
+
+    def crawl(self, roots, download_dir, categories, processed_files, analysis_cache):
+        """
+        Visita i file figli dei README già analizzati.
+
+        Parametri:
+        - roots (list): README già analizzati.
+        - download_dir (str): Directory di salvataggio file remoti.
+        - categories (dict): Mappa delle categorie.
+        - processed_files (set): Set dei file già processati.
+        - analysis_cache (dict): Analisi già calcolate, per hash del contenuto.
+
+        Ritorna:
+        - list: README e file figli, ogni file seguito dai propri figli.
+        """
+        children = {}  # id(padre) -> figli analizzati, nell'ordine dei link
+        frontier = roots
+        depth = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while frontier and (self.max_depth is None or depth < self.max_depth):
+                depth += 1
+                tasks = self.next_level(frontier, download_dir, processed_files)
+                futures = {executor.submit(self.fetch, url, path): i
+                           for i, (_, url, _, path) in enumerate(tasks)}
+                entries = [None] * len(tasks)
+                for future in as_completed(futures):
+                    i = futures[future]
+                    if not future.result():
+                        continue
+                    _, _, combined_file_name, new_file_path = tasks[i]
+                    processed_files.add(new_file_path)
+                    entries[i] = new_file_data(combined_file_name)
+                    with rp.current.file(new_file_path):
+                        fill_file_data(entries[i], download_md_text(new_file_path), categories, analysis_cache,
+                                       new_file_path)
+
+                frontier = []
+                for (parent, _, _, _), entry in zip(tasks, entries):
+                    if entry is not None:
+                        children.setdefault(id(parent), []).append(entry)
+                        frontier.append(entry)
+
+        # Ricompone l'ordine della visita in profondità
+        result_data_table = []
+        stack = list(reversed(roots))
+        while stack:
+            file_data = stack.pop()
+            result_data_table.append(file_data)
+            stack.extend(reversed(children.get(id(file_data), [])))
+        return result_data_table
+
+
+def select_roots(data_table, path_md_file, processed_files):
+    """
+    README da analizzare: quelli non ancora processati, segnati come processati.
+
+    Ritorna:
+    - tuple: (record dei README, percorsi da cui leggerli).
+    """
+    roots, root_paths = [], []
+    for file_data in data_table:
+        file_path = file_data.source or os.path.join(path_md_file, file_data.file_name)
+        if file_path in processed_files:
+            continue
+        processed_files.add(file_path)
+        roots.append(file_data)
+        root_paths.append(file_path)
+    return roots, root_paths
+
+
+def extract_sections_recursive(data_table, path_md_file, categories, processed_files=None, download_dir=None,
+                               analysis_cache=None, crawler=None, processes=None):
+    """
+    Estrae sezioni e statistiche da Markdown, inclusi i file remoti linkati (e i loro link).
 
     Parametri:
     - data_table (list): Lista strutture dati iniziali.
@@ -306,6 +1218,10 @@ def extract_sections_recursive(data_table, path_md_file, categories, processed_f
     - categories (dict): Mappa delle categorie.
     - processed_files (set): Set dei file già processati.
     - download_dir (str): Directory di salvataggio file remoti.
+    - analysis_cache (dict | ParseCache): Analisi già calcolate, per hash del contenuto.
+    - crawler (ChildCrawler | None): Crawler dei file figli (limiti e URL già visitati).
+    - processes (int | None): Se maggiore di 1, i file della tabella vengono analizzati
+      su un pool di processi (i file figli restano nel processo principale).
 
     Ritorna:
     - list: Tabella finale con tutte le analisi (inclusi file figli).
@@ -314,79 +1230,213 @@ def extract_sections_recursive(data_table, path_md_file, categories, processed_f
         processed_files = set()
     if download_dir is None:
         download_dir = path_md_file
+    if analysis_cache is None:
+        analysis_cache = {}
+    if crawler is None:
+        crawler = ChildCrawler()
 
     os.makedirs(download_dir, exist_ok=True)
-    result_data_table = []
+    roots, root_paths = select_roots(data_table, path_md_file, processed_files)
+
+    if processes is not None and processes > 1 and len(roots) > 1:
+        # I worker leggono i file e analizzano solo i contenuti non ancora in cache
+        for file_data, sections in zip(roots, analyze_files_parallel(root_paths, categories, processes,
+                                                                     analysis_cache)):
+            add_sections(file_data, sections if sections is not None else [])  # Interrotta: senza sezioni
+    else:
+        for file_data, file_path in zip(roots, root_paths):
+            with rp.current.file(file_path):
+                fill_file_data(file_data, download_md_text(file_path), categories, analysis_cache, file_path)
+
+    return crawler.crawl(roots, download_dir, categories, processed_files, analysis_cache)
+
+
+# ── ANALISI A STREAM ──────────────────────────────────────────────
+
+# README elaborati insieme (con i loro figli) prima di restituirli
+DEFAULT_STREAM_CHUNK = 64
+
+
+def iter_file_groups(data_table, path_md_file, categories, processed_files=None, download_dir=None,
+                     analysis_cache=None, crawler=None, processes=None, chunk_size=DEFAULT_STREAM_CHUNK):
+    """
+    Versione a stream di extract_sections_recursive: restituisce i file man mano che sono analizzati.
 
+    I README vengono letti dall'iterabile a blocchi di chunk_size ed elaborati
+    come in extract_sections_recursive, quindi in memoria c'è al più un blocco
+    (due con il pool di processi): la memoria resta costante anche su corpus
+    più grandi della RAM. I file figli linkati da più README vengono
+    assegnati al primo blocco che li raggiunge.
+
+    Con più processi il pool viene creato una volta per tutto lo stream e il
+    blocco successivo viene inviato ai worker prima di attendere quello
+    corrente: mentre si aspettano i README più lenti di un blocco (e si
+    scaricano i suoi figli) i worker analizzano già il blocco dopo.
+
+    Parametri:
+    - data_table (iterable): Record iniziali dei README, anche generati al momento.
+    - path_md_file (str): Directory dei file Markdown.
+    - categories (dict): Mappa delle categorie.
+    - processed_files (set): Set dei file già processati.
+    - download_dir (str): Directory di salvataggio file remoti.
+    - analysis_cache (dict | ParseCache | RecentAnalyses | None): Analisi già calcolate
+      (default: RecentAnalyses, limitato).
+    - crawler (ChildCrawler | None): Crawler dei file figli, condiviso da tutti i blocchi.
+    - processes (int | None): Processi del pool di analisi dei README (None o 1: seriale).
+    - chunk_size (int): README per blocco.
+
+    Ritorna:
+    - generator: Liste [README, figli...] nell'ordine di input, una per README.
+    """
+    if processed_files is None:
+        processed_files = set()
+    if analysis_cache is None:
+        analysis_cache = RecentAnalyses()
+    if crawler is None:
+        crawler = ChildCrawler()
+
+    if processes is None or processes <= 1:
+        for chunk in _iter_chunks(data_table, chunk_size):
+            table = extract_sections_recursive(chunk, path_md_file, categories, processed_files, download_dir,
+                                               analysis_cache, crawler)
+            yield from _split_groups(chunk, table)
+        return
+
+    if download_dir is None:
+        download_dir = path_md_file
+    os.makedirs(download_dir, exist_ok=True)
+    with AnalysisPool(categories, processes, analysis_cache) as pool:
+        window = deque()  # Blocchi inviati al pool: (README, percorsi, future), al più due
+        for chunk in _iter_chunks(data_table, chunk_size):
+            roots, root_paths = select_roots(chunk, path_md_file, processed_files)
+            window.append((roots, root_paths, pool.submit(root_paths)))
+            if len(window) > 1:
+                yield from _finish_chunk(pool, *window.popleft(), download_dir, categories, processed_files,
+                                         analysis_cache, crawler)
+        while window:
+            yield from _finish_chunk(pool, *window.popleft(), download_dir, categories, processed_files,
+                                     analysis_cache, crawler)
+
+
+def _iter_chunks(data_table, chunk_size):
+    """
+    Divide i record in liste di chunk_size, leggendo l'iterabile solo quando serve.
+    """
+    chunk = []
     for file_data in data_table:
-        file_path = os.path.join(path_md_file, file_data["file_name"])
-        if file_path in processed_files:
-            continue
-        processed_files.add(file_path)
+        chunk.append(file_data)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
 
-        md_text = download_md_text(file_path)
-        h1_titles, images, nlinks, cur_links, videos, code_blocks = find_titles_md(md_text, categories)
-
-        for i, (title, level, category) in enumerate(h1_titles):
-            next_h1_title = h1_titles[i + 1][0] if i + 1 < len(h1_titles) else None
-            char_count = calculate_section_length(md_text, title, next_h1_title)
-
-            file_data["h1_titles"].append(clean_text(title))
-            file_data["char_counts"].append(char_count)
-            file_data["category"].append(category)
-            file_data["num_links"].append(nlinks[i])
-            file_data["current_links"].append(cur_links[i])
-            file_data["num_images"].append(images[i])
-            file_data["num_videos"].append(videos[i])
-            file_data["num_code_blocks"].append(code_blocks[i])
-            file_data["level"].append(level)
-
-        result_data_table.append(file_data)
-
-        # Parsing ricorsivo per file .md remoti linkati
-        for section_links in file_data["current_links"]:
-            for _, _, link_url in section_links:
-                if link_url.lower().endswith(".md") and link_url.startswith("http://"):
-                    original_child_file = os.path.basename(link_url)
-                    parent_file_name = os.path.splitext(os.path.basename(file_data["file_name"]))[0]
-                    child_base_name = os.path.splitext(original_child_file)[0]
-                    combined_file_name = f"{parent_file_name}_{child_base_name}.md"
-                    new_file_path = os.path.join(download_dir, combined_file_name)
-
-                    if new_file_path in processed_files or os.path.exists(new_file_path):
-                        continue
-                    if not download_markdown_file(link_url, new_file_path):
-                        continue
 
-                    # Inizializzazione ricorsiva
-                    child_entry = {
-                        "file_name": combined_file_name,
-                        "h1_titles": [],
-                        "category": [],
-                        "char_counts": [],
-                        "num_links": [],
-                        "current_links": [],
-                        "num_images": [],
-                        "num_videos": [],
-                        "num_code_blocks": [],
-                        "level": []
-                    }
-
-                    child_data = extract_sections_recursive(
-                        [child_entry],
-                        path_md_file=download_dir,
-                        categories=categories,
-                        processed_files=processed_files,
-                        download_dir=download_dir
-                    )
-                    result_data_table.extend(child_data)
-
-    return result_data_table
+def _finish_chunk(pool, roots, root_paths, futures, download_dir, categories, processed_files, analysis_cache,
+                  crawler):
+    """
+    Completa un blocco inviato al pool: sezioni dei README, crawl dei figli e gruppi [README, figli...].
+    """
+    for file_data, sections in zip(roots, pool.results(root_paths, futures)):
+        add_sections(file_data, sections if sections is not None else [])  # Interrotta: senza sezioni
+    return _split_groups(roots, crawler.crawl(roots, download_dir, categories, processed_files, analysis_cache))
+
+
+def _split_groups(chunk, table):
+    """
+    Divide la tabella di un blocco in gruppi [README, figli...].
+    """
+    roots = {id(file_data) for file_data in chunk}
+    group = None
+    for file_data in table:
+        if id(file_data) in roots:
+            if group is not None:
+                yield group
+            group = [file_data]
+        else:
+            group.append(file_data)
+    if group is not None:
+        yield group
+
+
+def iter_data_groups(num_file_md, link_list, path_md_file, categories_json, crawler=None, processes=None,
+                     analysis_cache=None):
+    """
+    Versione a stream di get_data_tables: un gruppo [README, figli...] per file remoto.
+
+    Ritorna:
+    - generator: Gruppi di FileRecord, da passare a ioc.get_csv_tabs.
+    """
+    data_table = (new_file_data(f"{i}.md", link_list[i]) for i in range(num_file_md))
+    return iter_file_groups(data_table, path_md_file, categories_json, analysis_cache=analysis_cache,
+                            crawler=crawler, processes=processes)
+
+
+def iter_data_groups2(num_file_md, path_md_file, categories_json, crawler=None, processes=None,
+                      analysis_cache=None):
+    """
+    Variante di iter_data_groups per file locali senza link remoti.
+
+    Ritorna:
+    - generator: Gruppi di FileRecord, da passare a ioc.get_csv_tabs.
+    """
+    data_table = (new_file_data(f"{i}.md") for i in range(num_file_md))
+    return iter_file_groups(data_table, path_md_file, categories_json, analysis_cache=analysis_cache,
+                            crawler=crawler, processes=processes)
+
+
+def iter_indexed_groups(entries, path_md_file, categories_json, crawler=None, processes=None, analysis_cache=None,
+                        download_dir=None):
+    """
+    Variante di iter_data_groups2 per i README di un indice (vedi utils/md_index.py).
+
+    I file vengono letti sul posto, con il loro nome originale; nei CSV
+    compaiono come "ID.md", con l'ID stabile assegnato dall'indice.
+
+    Parametri:
+    - entries (iterable): Coppie (ID, nome del file nella cartella).
+    - path_md_file (str): Cartella dei file Markdown.
+    - categories_json (dict): Mappa delle categorie.
+    - download_dir (str | None): Cartella dei file figli scaricati (default: path_md_file).
+
+    Ritorna:
+    - generator: Gruppi di FileRecord, da passare a ioc.get_csv_tabs.
+    """
+    data_table = (new_file_data(f"{file_id}.md", source=os.path.join(path_md_file, name)) for file_id, name in entries)
+    return iter_file_groups(data_table, path_md_file, categories_json, download_dir=download_dir,
+                            analysis_cache=analysis_cache, crawler=crawler, processes=processes)
+
+
+def iter_data_table(num_file_md, link_list, path_md_file, categories_json, crawler=None, processes=None,
+                    analysis_cache=None):
+    """
+    Versione a stream di get_data_table: restituisce i record dei file uno alla volta.
+
+    Ritorna:
+    - generator: FileRecord nello stesso ordine di get_data_table (README seguiti dai figli).
+    """
+    for group in iter_data_groups(num_file_md, link_list, path_md_file, categories_json, crawler, processes,
+                                  analysis_cache):
+        yield from group
+
+
+def iter_data_table2(num_file_md, path_md_file, categories_json, crawler=None, processes=None,
+                     analysis_cache=None):
+    """
+    Versione a stream di get_data_table2.
+
+    Ritorna:
+    - generator: FileRecord nello stesso ordine di get_data_table2.
+    """
+    for group in iter_data_groups2(num_file_md, path_md_file, categories_json, crawler, processes,
+                                   analysis_cache):
+        yield from group
 
 
 # ── INTERFACCE PRINCIPALI ─────────────────────────────────────────
 
-def get_data_table(num_file_md, link_list, path_md_file, categories_json):
+def get_data_table(num_file_md, link_list, path_md_file, categories_json, crawler=None, processes=None,
+                   analysis_cache=None):
     """
     Wrapper per elaborazione remota con categorie.
 
@@ -394,10 +1444,12 @@ def get_data_table(num_file_md, link_list, path_md_file, categories_json):
     - list: Struttura dati analizzata.
     """
     data_table = initialize_data_table(num_file_md, link_list)
-    return extract_sections_recursive(data_table, path_md_file, categories_json)
+    return extract_sections_recursive(data_table, path_md_file, categories_json, crawler=crawler,
+                                      processes=processes, analysis_cache=analysis_cache)
 
 
-def get_data_table2(num_file_md, path_md_file, categories_json):
+def get_data_table2(num_file_md, path_md_file, categories_json, crawler=None, processes=None,
+                    analysis_cache=None):
     """
     Wrapper per elaborazione di file locali.
 
@@ -405,7 +1457,46 @@ def get_data_table2(num_file_md, path_md_file, categories_json):
     - list: Tabella dati estratti.
     """
     data_table = initialize_data_table2(num_file_md)
-    return extract_sections_recursive(data_table, path_md_file, categories_json)
+    return extract_sections_recursive(data_table, path_md_file, categories_json, crawler=crawler,
+                                      processes=processes, analysis_cache=analysis_cache)
+
+
+def get_data_tables(num_file_md, link_list, path_md_file, categories_json, crawler=None, processes=None,
+                    analysis_cache=None):
+    """
+    Costruisce la tabella delle sezioni e quella degli URL con un solo parsing per README.
+
+    La tabella degli URL contiene le stesse strutture dati dei README (non dei
+    file figli): i link di ogni sezione sono già stati estratti dall'analisi.
+
+    Parametri:
+    - num_file_md (int): Numero di file.
+    - link_list (list): Lista dei link corrispondenti.
+    - path_md_file (str): Directory dei file Markdown.
+    - categories_json (dict): Mappa delle categorie.
+    - crawler (ChildCrawler | None): Crawler dei file figli.
+    - processes (int | None): Processi per l'analisi parallela dei README (None o 1: seriale).
+    - analysis_cache (dict | ParseCache | None): Analisi già calcolate (es. cache su disco).
+
+    Ritorna:
+    - tuple: (tabella delle sezioni, tabella degli URL).
+    """
+    url_table = initialize_data_table(num_file_md, link_list)
+    return extract_sections_recursive(url_table, path_md_file, categories_json, crawler=crawler,
+                                      processes=processes, analysis_cache=analysis_cache), url_table
+
+
+def get_data_tables2(num_file_md, path_md_file, categories_json, crawler=None, processes=None,
+                     analysis_cache=None):
+    """
+    Variante di get_data_tables per file locali senza link remoti.
+
+    Ritorna:
+    - tuple: (tabella delle sezioni, tabella degli URL).
+    """
+    url_table = initialize_data_table2(num_file_md)
+    return extract_sections_recursive(url_table, path_md_file, categories_json, crawler=crawler,
+                                      processes=processes, analysis_cache=analysis_cache), url_table
 
 
 def extract_sections_url(data_table, path_md_file, categories):
@@ -416,9 +1507,8 @@ def extract_sections_url(data_table, path_md_file, categories):
     - list: Tabella aggiornata con link trovati.
     """
     for file_data in data_table:
-        md_text = download_md_text(os.path.join(path_md_file, file_data["file_name"]))
-        _, _, _, cur_links, _, _ = find_titles_md(md_text, categories)
-        file_data["current_links"] = cur_links
+        md_text = download_md_text(file_data.source or os.path.join(path_md_file, file_data.file_name))
+        file_data.sections = find_titles_md(md_text, categories)
     return data_table
 
 
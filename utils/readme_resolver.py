@@ -0,0 +1,181 @@
+import json
+import os
+import threading
+import time
+
+import requests
+
+# Branch e nomi di file provati, nell'ordine in cui vengono tentati.
+# "HEAD" su raw.githubusercontent.com punta al branch predefinito del repository.
+BRANCHES = ("master", "main", "HEAD")
+FILENAMES = ("README.md", "readme.md", "Readme.md", "README.markdown", "README.rst", "README.txt", "README")
+
+# Nome predefinito della cache, salvata nella cartella dei file Markdown
+RESOLVER_FILE_NAME = "readme_locations.json"
+
+# Dopo quanti giorni un 404 in cache viene verificato di nuovo
+NEGATIVE_TTL_DAYS = 30
+
+
+class ReadmeNotFoundError(requests.HTTPError):
+    """Nessuna combinazione di branch e nome file esiste per il repository."""
+
+
+def repo_base_url(link):
+    """
+    Ricava l'URL raw del repository da un link a un README.
+
+    Esempio: http://raw.githubusercontent.com/a/b/master/README.md -> http://raw.githubusercontent.com/a/b
+
+    Parametri:
+    - link (str): URL raw di un README (come prodotto da rename_urls).
+
+    Ritorna:
+    - str: URL raw del repository, senza branch e nome del file.
+    """
+    return link.rsplit('/', 2)[0]
+
+
+def candidate_urls(link):
+    """
+    Elenca tutte le posizioni possibili del README di un repository.
+
+    Per ogni nome di file vengono provati tutti i branch, così i casi più
+    comuni (README.md su master o main) costano al massimo due richieste.
+
+    Parametri:
+    - link (str): URL raw di un README (come prodotto da rename_urls).
+
+    Ritorna:
+    - list[str]: URL candidati, in ordine di tentativo.
+    """
+    base = repo_base_url(link)
+    return [f"{base}/{branch}/{filename}" for filename in FILENAMES for branch in BRANCHES]
+
+
+class ReadmeResolver:
+    """
+    Risolve la posizione reale del README di ogni repository.
+
+    Ricorda per ciascun repository la combinazione che ha funzionato (cache
+    positiva) e tiene una cache negativa dei 404, entrambe salvate su disco:
+    le esecuzioni successive vanno direttamente all'URL giusto senza
+    ripetere i tentativi falliti. I metodi sono sicuri fra più thread.
+    """
+
+    def __init__(self, path, resolved=None, missing=None, negative_ttl=NEGATIVE_TTL_DAYS * 86400):
+        self.path = path
+        self.resolved = resolved if resolved is not None else {}
+        self.missing = missing if missing is not None else {}
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        """
+        Carica la cache da file JSON (vuota se il file non esiste).
+
+        Parametri:
+        - path (str): Percorso del file di cache.
+
+        Ritorna:
+        - ReadmeResolver: Resolver con la cache caricata.
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            return cls(path, data.get("resolved", {}), data.get("missing", {}))
+        except FileNotFoundError:
+            return cls(path)
+
+    def save(self):
+        """
+        Salva la cache su disco in modo atomico, scartando i 404 scaduti.
+        """
+        now = time.time()
+        with self._lock:
+            data = {
+                "resolved": dict(self.resolved),
+                "missing": {url: t for url, t in self.missing.items() if now - t < self.negative_ttl}
+            }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def candidates(self, link):
+        """
+        URL da provare per un repository, escludendo i 404 ancora validi.
+
+        La combinazione che ha funzionato l'ultima volta viene provata per prima.
+
+        Parametri:
+        - link (str): URL raw di un README (come prodotto da rename_urls).
+
+        Ritorna:
+        - list[str]: URL da tentare, in ordine.
+        """
+        now = time.time()
+        urls = candidate_urls(link)
+        with self._lock:
+            known = self.resolved.get(repo_base_url(link))
+            if known in urls:
+                urls.remove(known)
+                urls.insert(0, known)
+            return [url for url in urls if now - self.missing.get(url, 0) >= self.negative_ttl]
+
+    def record_hit(self, link, url):
+        """
+        Registra l'URL a cui è stato trovato il README del repository.
+        """
+        with self._lock:
+            self.resolved[repo_base_url(link)] = url
+            self.missing.pop(url, None)
+
+    def record_miss(self, link, url):
+        """
+        Registra un 404 nella cache negativa.
+        """
+        with self._lock:
+            self.missing[url] = time.time()
+            if self.resolved.get(repo_base_url(link)) == url:
+                del self.resolved[repo_base_url(link)]
+
+    def resolve(self, link):
+        """
+        URL effettivo del README di un repository.
+
+        Parametri:
+        - link (str): URL raw di un README (come prodotto da rename_urls).
+
+        Ritorna:
+        - str: URL risolto, oppure il link stesso se non è ancora noto.
+        """
+        with self._lock:
+            return self.resolved.get(repo_base_url(link), link)
+
+    def fetch(self, session, link, headers_for=None):
+        """
+        Scarica il README di un repository provando le posizioni candidate.
+
+        Parametri:
+        - session (requests.Session): Sessione HTTP da usare.
+        - link (str): URL raw di un README (come prodotto da rename_urls).
+        - headers_for (callable | None): Funzione url -> header da inviare (es. condizionali).
+
+        Ritorna:
+        - tuple: (url, risposta) della prima posizione che non ha dato 404.
+
+        Solleva:
+        - ReadmeNotFoundError: Se nessuna posizione esiste.
+        """
+        response = None
+        for url in self.candidates(link):
+            response = session.get(url, headers=headers_for(url) if headers_for else None)
+            if response.status_code == 404:
+                self.record_miss(link, url)
+                continue
+            if response.ok:
+                self.record_hit(link, url)
+            return url, response
+        raise ReadmeNotFoundError(f"Nessun README trovato per {repo_base_url(link)}", response=response)
@@ -0,0 +1,105 @@
+import hashlib
+import os
+import shutil
+
+# Nome predefinito della cartella dei blob, dentro la cartella dei file Markdown
+STORE_DIR_NAME = "blobs"
+
+
+def content_hash(content):
+    """
+    Calcola l'hash SHA-256 del contenuto di un file.
+
+    Parametri:
+    - content (bytes): Contenuto del file.
+
+    Ritorna:
+    - str: Hash esadecimale.
+    """
+    return hashlib.sha256(content).hexdigest()
+
+
+class ReadmeStore:
+    """
+    Archivio dei README indirizzato per contenuto.
+
+    Ogni contenuto distinto è salvato una sola volta come blob <hash>.md; i
+    file delle righe (0.md, 1.md, ...) sono hard link ai blob (o copie, se il
+    filesystem non li supporta), così README identici occupano spazio una
+    volta sola e il resto della pipeline continua a leggere i file per riga.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def blob_path(self, digest):
+        """
+        Percorso del blob con un certo hash.
+        """
+        return os.path.join(self.root, digest[:2], digest + ".md")
+
+    def has(self, digest):
+        """
+        Verifica se un blob è presente nell'archivio.
+        """
+        return os.path.isfile(self.blob_path(digest))
+
+    def put(self, content):
+        """
+        Salva un contenuto nell'archivio (se non è già presente).
+
+        Parametri:
+        - content (bytes): Contenuto del README.
+
+        Ritorna:
+        - str: Hash del contenuto, cioè la chiave del blob.
+        """
+        digest = content_hash(content)
+        blob_path = self.blob_path(digest)
+        if not os.path.isfile(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            tmp_path = f"{blob_path}.{os.getpid()}.{id(content)}.part"
+            with open(tmp_path, "wb") as file:
+                file.write(content)
+            os.replace(tmp_path, blob_path)
+        return digest
+
+    def link(self, digest, dest_path):
+        """
+        Fa puntare un file di riga al blob indicato.
+
+        Parametri:
+        - digest (str): Hash del blob.
+        - dest_path (str): Percorso del file di riga (es. md_file/3.md).
+        """
+        blob_path = self.blob_path(digest)
+        if os.path.isfile(dest_path) and os.path.samefile(blob_path, dest_path):
+            return
+        tmp_path = dest_path + ".part"
+        try:
+            os.link(blob_path, tmp_path)
+        except OSError:
+            shutil.copyfile(blob_path, tmp_path)
+        os.replace(tmp_path, dest_path)
+
+    def prune(self, keep):
+        """
+        Elimina i blob non più referenziati da nessuna riga.
+
+        Parametri:
+        - keep (Collection[str]): Hash dei blob da conservare.
+
+        Ritorna:
+        - int: Numero di blob eliminati.
+        """
+        removed = 0
+        for sub_dir in os.listdir(self.root):
+            sub_path = os.path.join(self.root, sub_dir)
+            if not os.path.isdir(sub_path):
+                continue
+            for file in os.listdir(sub_path):
+                if file.endswith(".md") and file[:-3] not in keep:
+                    os.remove(os.path.join(sub_path, file))
+                    removed += 1
+        return removed
@@ -0,0 +1,260 @@
+import contextlib
+import csv
+import heapq
+import itertools
+import json
+import math
+import os
+import threading
+import time
+from array import array
+from collections import Counter
+
+# Stadi misurati durante un'esecuzione
+STAGES = ("read", "tokenize", "scan", "clean_text", "categorize_title", "section_length", "csv_write")
+
+# File più lenti conservati nel report
+DEFAULT_SLOWEST = 20
+
+# Percentili dei tempi per file riportati nel report
+PERCENTILES = (50, 90, 99)
+
+_NO_OP = contextlib.nullcontext()
+
+
+class NullProfiler:
+    """
+    Profiler disattivato: stage e file non misurano nulla (costo trascurabile).
+    """
+
+    enabled = False
+
+    def stage(self, name):
+        return _NO_OP
+
+    def file(self, path):
+        return _NO_OP
+
+
+class RunProfiler:
+    """
+    Tempi di un'esecuzione per stadio e per file.
+
+    stage(nome) misura uno stadio; i tempi sono esclusivi: mentre è aperto
+    uno stadio annidato (es. clean_text dentro section_length) il tempo va
+    solo a quello interno. file(percorso) raccoglie gli stadi di un file e
+    il suo tempo totale; gli stadi fuori da un file (es. la scrittura dei
+    CSV) contano solo nei totali. Dei file si conservano i tempi (per i
+    percentili) e i dettagli dei più lenti. Può essere usato da più thread.
+    """
+
+    enabled = True
+
+    def __init__(self, slowest=DEFAULT_SLOWEST):
+        """
+        Parametri:
+        - slowest (int): Numero di file più lenti da conservare.
+        """
+        self.slowest = slowest
+        self.stage_seconds = Counter()
+        self.stage_calls = Counter()
+        self.file_seconds = array('d')  # Tempo totale di ogni file
+        self.total_bytes = 0
+        self.started = time.perf_counter()
+        self._slowest = []  # Heap (secondi, n, record) dei file più lenti
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._local = threading.local()  # Stadi aperti e file in corso, per thread
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """
+        Misura il blocco come stadio name (tempo esclusivo).
+        """
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        now = time.perf_counter()
+        if stack:
+            stack[-1][0] += now - stack[-1][1]  # Lo stadio esterno si ferma
+        entry = [0.0, now]
+        stack.append(entry)
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            stack.pop()
+            if stack:
+                stack[-1][1] = now  # Lo stadio esterno riparte
+            self._add_stage(name, entry[0] + now - entry[1])
+
+    def _add_stage(self, name, seconds):
+        record = getattr(self._local, "record", None)
+        if record is not None:
+            record["stages"][name] += seconds
+            record["calls"][name] += 1
+            return
+        with self._lock:
+            self.stage_seconds[name] += seconds
+            self.stage_calls[name] += 1
+
+    @contextlib.contextmanager
+    def file(self, path):
+        """
+        Misura lettura e analisi di un file.
+
+        Restituisce (con as) il record del file, completo all'uscita dal blocco:
+        "file", "bytes", "seconds", "stages" (secondi per stadio) e "calls".
+        """
+        record = {"file": path, "bytes": 0, "seconds": 0.0, "stages": Counter(), "calls": Counter()}
+        previous = getattr(self._local, "record", None)
+        self._local.record = record
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            self._local.record = previous
+            try:
+                record["bytes"] = os.path.getsize(path)
+            except OSError:
+                pass
+            self.add_file(record)
+
+    def add_file(self, record):
+        """
+        Aggiunge ai totali il record di un file (anche misurato in un worker del pool).
+        """
+        with self._lock:
+            self.file_seconds.append(record["seconds"])
+            self.total_bytes += record["bytes"]
+            self.stage_seconds.update(record["stages"])
+            self.stage_calls.update(record["calls"])
+            item = (record["seconds"], next(self._order), record)
+            if len(self._slowest) < self.slowest:
+                heapq.heappush(self._slowest, item)
+            elif item[0] > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, item)
+
+    def slowest_files(self):
+        """
+        Ritorna:
+        - list: Record dei file più lenti, dal più lento.
+        """
+        with self._lock:
+            return [record for _, _, record in sorted(self._slowest, key=lambda item: item[:2], reverse=True)]
+
+    def report(self):
+        """
+        Report dell'esecuzione: totali per stadio, percentili dei tempi per file e throughput.
+
+        Ritorna:
+        - dict: Report serializzabile in JSON.
+        """
+        elapsed = time.perf_counter() - self.started
+        with self._lock:
+            times = sorted(self.file_seconds)
+            stage_seconds, stage_calls = Counter(self.stage_seconds), Counter(self.stage_calls)
+            total_bytes = self.total_bytes
+        measured = sum(stage_seconds.values())
+        stages = {name: {"seconds": round(stage_seconds[name], 6), "calls": stage_calls[name],
+                         "share": round(stage_seconds[name] / measured, 4) if measured else 0.0}
+                  for name in sorted(stage_seconds, key=stage_seconds.get, reverse=True)}
+        file_seconds = {"total": round(sum(times), 6), "mean": round(sum(times) / len(times), 6) if times else 0.0,
+                        "max": round(times[-1], 6) if times else 0.0}
+        for p in PERCENTILES:
+            file_seconds[f"p{p}"] = round(percentile(times, p), 6)
+        return {
+            "elapsed_seconds": round(elapsed, 6),
+            "files": len(times),
+            "bytes": total_bytes,
+            "throughput": {"files_per_second": round(len(times) / elapsed, 3) if elapsed else 0.0,
+                           "mb_per_second": round(total_bytes / 1e6 / elapsed, 3) if elapsed else 0.0},
+            "file_seconds": file_seconds,
+            "stages": stages,
+            "slowest_files": [{"file": record["file"], "bytes": record["bytes"], "seconds": round(record["seconds"], 6),
+                               "stages": {name: round(seconds, 6) for name, seconds in record["stages"].items()}}
+                              for record in self.slowest_files()],
+        }
+
+    def save_json(self, path):
+        """
+        Salva il report completo in JSON.
+
+        Parametri:
+        - path (str): Percorso del file.
+
+        Ritorna:
+        - dict: Il report salvato.
+        """
+        report = self.report()
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+        return report
+
+    def save_csv(self, path):
+        """
+        Salva in CSV i file più lenti, con il tempo di ogni stadio.
+
+        Parametri:
+        - path (str): Percorso del file.
+        """
+        with open(path, mode='w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(["File", "Bytes", "Seconds"] + list(STAGES))
+            for record in self.slowest_files():
+                writer.writerow([record["file"], record["bytes"], f"{record['seconds']:.6f}"] +
+                                [f"{record['stages'].get(name, 0.0):.6f}" for name in STAGES])
+
+    def summary(self, report=None):
+        """
+        Riepilogo in una riga (file, throughput, percentili e stadi più pesanti).
+
+        Parametri:
+        - report (dict | None): Report già calcolato con report().
+
+        Ritorna:
+        - str: Testo del riepilogo.
+        """
+        report = report or self.report()
+        file_seconds = report["file_seconds"]
+        stages = ", ".join(f"{name} {data['share']:.0%}" for name, data in list(report["stages"].items())[:4])
+        return (f"{report['files']} file in {report['elapsed_seconds']:.2f} s "
+                f"({report['throughput']['files_per_second']:.1f} file/s, "
+                f"{report['throughput']['mb_per_second']:.2f} MB/s), "
+                f"p50 {file_seconds['p50'] * 1000:.1f} ms, p99 {file_seconds['p99'] * 1000:.1f} ms; "
+                f"stadi: {stages or 'nessuno'}")
+
+
+def percentile(sorted_values, p):
+    """
+    Percentile p (metodo del rango più vicino) di valori già ordinati (0 se vuoti).
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+# Profiler usato dall'analisi (disattivato se non richiesto con enable)
+current = NullProfiler()
+
+
+def enable(slowest=DEFAULT_SLOWEST):
+    """
+    Attiva la misura dei tempi per questo processo.
+
+    Ritorna:
+    - RunProfiler: Il profiler attivo.
+    """
+    global current
+    current = RunProfiler(slowest)
+    return current
+
+
+def disable():
+    """
+    Disattiva la misura dei tempi.
+    """
+    global current
+    current = NullProfiler()
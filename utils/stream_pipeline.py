@@ -0,0 +1,163 @@
+import csv
+import queue
+import threading
+
+import utils.download_from_url as dfu
+import utils.in_out_csv as ioc
+import utils.parse_markdown_column as pmc
+
+# Gruppi di righe scaricate in attesa di analisi (oltre, il download si ferma)
+DEFAULT_QUEUE_SIZE = 32
+
+# Segnale di fine stream nella coda
+_END = object()
+
+
+class PipelineCancelled(Exception):
+    """
+    L'analisi si è interrotta con un errore: il thread di download non consegna altri README.
+    """
+
+
+class OrderedCsvWriter:
+    """
+    Scrive i CSV delle sezioni e degli URL man mano che i file vengono analizzati.
+
+    I file possono arrivare in qualsiasi ordine: quelli che anticipano una riga
+    ancora in download restano in un piccolo buffer, così l'output segue
+    sempre l'ordine di input (0.md, 1.md, ...) come nel flusso non a stream.
+    """
+
+    def __init__(self, csv_out, csv_out_url, on_group=None):
+        self._files = [open(path, mode='w', newline='', encoding='utf-8') for path in (csv_out, csv_out_url)]
+        self.writer = csv.writer(self._files[0])
+        self.writer_url = csv.writer(self._files[1])
+        self.writer.writerow(ioc.HEADER_TAB)
+        self.writer_url.writerow(ioc.HEADER_TAB_URL)
+        self.next_row = 0
+        self.buffer = {}
+        self.files_written = 0
+        self.on_group = on_group  # Chiamata con ogni gruppo scritto, nell'ordine dei CSV
+
+    def add(self, row, tables):
+        """
+        Consegna il risultato dell'analisi di una riga.
+
+        Parametri:
+        - row (int): Riga di input.
+        - tables (list | None): File analizzati (il README e i suoi figli), None se la riga non ha file.
+        """
+        self.buffer[row] = tables
+        while self.next_row in self.buffer:
+            tables = self.buffer.pop(self.next_row)
+            if tables:
+                ioc.write_group_rows(self.writer, self.writer_url, tables)
+                if self.on_group is not None:
+                    self.on_group(tables)
+                self.files_written += 1
+            self.next_row += 1
+
+    def close(self):
+        for file in self._files:
+            file.close()
+
+
+def run_download_pipeline(link_list, path_md_file, categories, csv_out, csv_out_url,
+                          max_workers=dfu.DEFAULT_WORKERS, manifest=None, resolver=None, scheduler=None,
+                          queue_size=DEFAULT_QUEUE_SIZE, crawler=None, analysis_cache=None, on_group=None):
+    """
+    Scarica, analizza ed esporta i README in un'unica pipeline a stadi.
+
+    I thread di download consegnano ogni README appena arriva a una coda
+    limitata; il thread chiamante lo elabora subito e ne scrive le righe nei
+    CSV. L'analisi resta nel thread chiamante (di solito il principale)
+    perché solo lì il timer di pmc.parse_deadline può interrompere il
+    parsing di markdown-it oltre --max_parse_seconds. Rete e CPU lavorano in parallelo e, se l'analisi è più lenta, la
+    coda piena ferma i nuovi download (backpressure). Anche il buffer di
+    riordino è limitato: se una riga resta indietro, oltre queue_size file
+    in attesa non partono nuovi download finché non arriva. Le analisi
+    riusate fra README identici sono solo le più recenti (pmc.RecentAnalyses)
+    se non viene passata una cache, così la memoria resta costante e il
+    tempo totale si avvicina al maggiore fra i due stadi.
+
+    Parametri:
+    - link_list (list): Lista di URL dei file Markdown da scaricare.
+    - path_md_file (str): Cartella dei file Markdown.
+    - categories (dict): Categorie per classificare i titoli.
+    - csv_out (str): Percorso del CSV delle sezioni.
+    - csv_out_url (str): Percorso del CSV degli URL.
+    - max_workers (int): Numero massimo di download contemporanei.
+    - manifest (DownloadManifest | None): Manifest per il download incrementale.
+    - resolver (ReadmeResolver | None): Resolver delle posizioni del README.
+    - scheduler (FetchScheduler | None): Scheduler delle richieste.
+    - queue_size (int): Capienza della coda fra download e analisi e dei file in attesa di riordino.
+    - crawler (ChildCrawler | None): Crawler dei file figli, condiviso da tutte le righe.
+    - analysis_cache (dict | ParseCache | None): Analisi già calcolate (es. cache su disco).
+    - on_group (callable | None): Chiamata con ogni gruppo [README, figli...] scritto nei CSV.
+
+    Ritorna:
+    - tuple: (righe scaricate, numero di README esportati).
+    """
+    ready = queue.Queue(maxsize=queue_size)
+    if crawler is None:
+        crawler = pmc.ChildCrawler()
+    if analysis_cache is None:
+        analysis_cache = pmc.RecentAnalyses()
+    output = OrderedCsvWriter(csv_out, csv_out_url, on_group)
+    errors = []
+
+    def link_for(row):
+        # URL effettivo del README (branch e nome del file risolti)
+        return resolver.resolve(link_list[row]) if resolver is not None else link_list[row]
+
+    cancelled = threading.Event()
+    downloaded = []
+
+    def deliver(rows, available):
+        if cancelled.is_set():
+            raise PipelineCancelled()
+        ready.put((rows, set(available)))
+
+    def download():
+        try:
+            downloaded.extend(dfu.download_md_files(link_list, path_md_file, max_workers, manifest, resolver,
+                                                    scheduler, on_done=deliver,
+                                                    hold=lambda: len(output.buffer) > queue_size))
+        except PipelineCancelled:
+            pass
+        except Exception as e:
+            errors.append(e)
+        finally:
+            ready.put(_END)
+
+    producer = threading.Thread(target=download, name="readme-download")
+    producer.start()
+    processed_files = set()
+    finished = False
+    try:
+        while not finished:
+            item = ready.get()
+            if item is _END:
+                finished = True
+                continue
+            rows, available = item
+            for row in sorted(rows):
+                tables = None
+                if row in available:
+                    file_data = pmc.new_file_data(f"{row}.md", link_for(row))
+                    tables = pmc.extract_sections_recursive([file_data], path_md_file, categories,
+                                                            processed_files, analysis_cache=analysis_cache,
+                                                            crawler=crawler)
+                output.add(row, tables)
+    finally:
+        if not finished:
+            # Analisi interrotta: niente più consegne, si svuota la coda finché i download in corso finiscono
+            cancelled.set()
+            while ready.get() is not _END:
+                pass
+        producer.join()
+        output.close()
+
+    if errors:
+        raise errors[0]
+    return downloaded, output.files_written
@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+from collections import Counter, OrderedDict
+
+# Nome predefinito del memo salvato su disco
+TITLE_MEMO_FILE_NAME = "title_memo.json"
+
+# Titoli memorizzati al massimo (oltre, si eliminano quelli usati meno di recente)
+DEFAULT_MAX_TITLES = 20000
+
+
+class TitleMemo:
+    """
+    Memo limitato dei titoli: testo del titolo -> (titolo pulito, categoria).
+
+    Gli stessi titoli ("Installation", "Usage", "License", ...) si ripetono
+    in quasi tutti i README: con il memo ogni titolo viene pulito e
+    classificato una volta sola. Le voci valgono solo per l'impronta con cui
+    sono state calcolate (categorie e versione dell'analisi): un memo salvato
+    con un'impronta diversa viene ignorato al caricamento. Oltre max_entries
+    si eliminano i titoli usati meno di recente. Può essere usato da più thread.
+    """
+
+    def __init__(self, fingerprint, max_entries=DEFAULT_MAX_TITLES, path=None):
+        """
+        Parametri:
+        - fingerprint (str): Impronta di categorie e versione dell'analisi.
+        - max_entries (int): Numero massimo di titoli memorizzati.
+        - path (str | None): File in cui salvare il memo.
+        """
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries
+        self.path = path
+        self.stats = Counter()
+        self._entries = OrderedDict()  # Dal titolo usato meno di recente al più recente
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path, fingerprint, max_entries=DEFAULT_MAX_TITLES):
+        """
+        Carica il memo da file JSON (vuoto se il file non esiste o l'impronta è cambiata).
+
+        Parametri:
+        - path (str): Percorso del file.
+        - fingerprint (str): Impronta attuale di categorie e analisi.
+        - max_entries (int): Numero massimo di titoli memorizzati.
+
+        Ritorna:
+        - TitleMemo: Memo con i titoli ancora validi.
+        """
+        memo = cls(fingerprint, max_entries, path)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return memo
+        titles = data.get("titles", {})
+        if data.get("fingerprint") != fingerprint:
+            memo.stats["invalidated"] = len(titles)
+            return memo
+        for heading, (title, category) in list(titles.items())[-max_entries:]:
+            memo._entries[heading] = (title, category)
+        return memo
+
+    def get(self, heading, compute):
+        """
+        Titolo pulito e categoria di un titolo, calcolati con compute se non sono nel memo.
+
+        Parametri:
+        - heading (str): Testo del titolo nel Markdown.
+        - compute (callable): Funzione heading -> (titolo pulito, categoria).
+
+        Ritorna:
+        - tuple: (titolo pulito, categoria o None).
+        """
+        with self._lock:
+            value = self._entries.get(heading)
+            if value is not None:
+                self._entries.move_to_end(heading)
+                self.stats["hit"] += 1
+                return value
+            self.stats["miss"] += 1
+        value = compute(heading)
+        with self._lock:
+            self._entries[heading] = value
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evicted"] += 1
+        return value
+
+    def __len__(self):
+        return len(self._entries)
+
+    def save(self, path=None):
+        """
+        Salva il memo su disco in modo atomico.
+
+        Parametri:
+        - path (str | None): Percorso del file (default: quello di caricamento).
+        """
+        path = path or self.path
+        with self._lock:
+            data = {"fingerprint": self.fingerprint,
+                    "titles": {heading: list(value) for heading, value in self._entries.items()}}
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def summary(self):
+        """
+        Riepilogo delle statistiche del memo.
+
+        Ritorna:
+        - str: Testo con hit, miss e titoli eliminati.
+        """
+        lookups = self.stats["hit"] + self.stats["miss"]
+        rate = 100 * self.stats["hit"] / lookups if lookups else 0
+        text = (f"{self.stats['hit']} hit, {self.stats['miss']} miss ({rate:.0f}% hit), "
+                f"{self.stats['evicted']} titoli eliminati")
+        if self.stats["invalidated"]:
+            text += f", {self.stats['invalidated']} titoli scartati (categorie cambiate)"
+        return text